@@ -0,0 +1,85 @@
+"""Throughput of AsyncIMDbScraper against the threaded get_many API.
+
+Run from the project root:
+    python -m benchmarks.bench_async --lookups 200 --concurrency 50 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from imdb_scraper import AsyncIMDbScraper, IMDbScraper
+from imdb_scraper.history import SearchHistory
+from imdb_scraper.ratelimit import TokenBucket
+
+from .stub_server import StubIMDbServer, make_catalog
+
+
+def unlimited() -> TokenBucket:
+    """Rate limiter that never waits, so the benchmark measures the engine."""
+    return TokenBucket(rate=1e9, burst=10 ** 9)
+
+
+async def run_async(base_url: str, queries, concurrency: int, history: SearchHistory) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+    async with AsyncIMDbScraper(use_cache=False, rate_limiter=unlimited(), history=history,
+                                base_url=base_url, pool_size=concurrency) as scraper:
+        async def lookup(query):
+            async with semaphore:
+                return await scraper.search_and_get_movie(query)
+
+        start = time.perf_counter()
+        movies = await asyncio.gather(*(lookup(q) for q in queries))
+        elapsed = time.perf_counter() - start
+
+    assert all(movies), "stub lookups should all succeed"
+    return elapsed
+
+
+def run_threads(base_url: str, queries, workers: int, history: SearchHistory) -> float:
+    scraper = IMDbScraper(use_cache=False, rate_limiter=unlimited(), history=history, base_url=base_url)
+    start = time.perf_counter()
+    results = list(scraper.get_many(queries, max_workers=workers))
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == len(queries)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark async vs threaded lookups")
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4, help="Thread pool size for get_many")
+    parser.add_argument("--latency", type=float, default=0.05, help="Simulated server latency (s)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    catalog = make_catalog(args.lookups)
+    queries = [movie["title"] for movie in catalog.values()]
+
+    with StubIMDbServer(catalog, latency=args.latency) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        # Each phase gets its own history (snapshot and event log), so neither
+        # reuses the other's query resolutions and both make every request
+        async_history = SearchHistory(str(Path(tmp) / "async.json"))
+        async_time = asyncio.run(run_async(server.base_url, queries, args.concurrency, async_history))
+        async_requests = server.requests
+        thread_history = SearchHistory(str(Path(tmp) / "threads.json"))
+        thread_time = run_threads(server.base_url, queries, args.workers, thread_history)
+        thread_requests = server.requests - async_requests
+        async_history.close()
+        thread_history.close()
+
+    print(f"{args.lookups} lookups, {args.latency * 1000:.0f} ms simulated latency")
+    print(f"async ({args.concurrency} in flight): {async_time:.2f}s  "
+          f"{args.lookups / async_time:.1f} lookups/s  {async_requests} requests")
+    print(f"threads ({args.workers} workers):   {thread_time:.2f}s  "
+          f"{args.lookups / thread_time:.1f} lookups/s  {thread_requests} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""SearchHistory index performance on a large history.
+
+Writes a synthetic snapshot, then compares the indexed popular/recent/total
+queries against the previous full sort of the history dict per call, and
+checks both return the same entries.
+
+Run from the project root:
+    python -m benchmarks.bench_history --entries 1000000
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from imdb_scraper.history import SearchHistory
+
+
+def make_history(entries: int, seed: int = 0):
+    """Build a history dict with a long-tailed count distribution."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    history = {}
+    for i in range(entries):
+        searched = start + timedelta(microseconds=rng.randrange(365 * 24 * 60 * 60 * 10**6))
+        history[f"query {i}"] = {
+            "count": int(rng.paretovariate(1.2)),
+            "last_searched": searched.isoformat(),
+            "last_result": "success" if i % 5 else "failed",
+        }
+    return history
+
+
+def sorted_popular(history, limit):
+    """The pre-index approach: sort every entry by (count, last searched)."""
+    ranked = sorted(history.items(), key=lambda x: (x[1]["count"], x[1]["last_searched"] or ""),
+                    reverse=True)
+    return [query for query, _ in ranked[:limit]]
+
+
+def sorted_recent(history, limit):
+    """The pre-index approach: sort every entry by last searched."""
+    ranked = sorted(history.items(), key=lambda x: x[1]["last_searched"] or "", reverse=True)
+    return [query for query, _ in ranked[:limit]]
+
+
+def per_call(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark search history queries")
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "history.json"
+        history = make_history(args.entries)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(history, f)
+
+        start = time.perf_counter()
+        search_history = SearchHistory(str(path), compact_every=10**9)  # compaction timed separately
+        load = time.perf_counter() - start
+        print(f"{args.entries} entries, load + index build {load:.2f}s")
+
+        assert [e["query"] for e in search_history.get_popular_searches(args.limit)] == \
+            sorted_popular(search_history.history, args.limit)
+        assert [e["query"] for e in search_history.get_recent_searches(args.limit)] == \
+            sorted_recent(search_history.history, args.limit)
+
+        rows = [
+            ("popular (indexed)", per_call(lambda: search_history.get_popular_searches(args.limit),
+                                           args.repeat)),
+            ("popular (full sort)", per_call(lambda: sorted_popular(search_history.history,
+                                                                    args.limit), 1)),
+            ("recent (indexed)", per_call(lambda: search_history.get_recent_searches(args.limit),
+                                          args.repeat)),
+            ("recent (full sort)", per_call(lambda: sorted_recent(search_history.history,
+                                                                  args.limit), 1)),
+            ("total (running)", per_call(search_history.get_total_searches, args.repeat)),
+            ("total (sum)", per_call(lambda: sum(d["count"] for d in search_history.history.values()),
+                                     1)),
+            ("record_search", per_call(lambda: search_history.record_search("query 42"),
+                                       args.repeat)),
+        ]
+        rows.append(("compact", per_call(search_history.compact, 1)))
+        for label, seconds in rows:
+            print(f"{label:<22} {seconds * 1000:10.3f} ms/call")
+
+        assert [e["query"] for e in search_history.get_popular_searches(args.limit)] == \
+            sorted_popular(search_history.history, args.limit)
+        search_history.close()
+
+
+if __name__ == "__main__":
+    main()
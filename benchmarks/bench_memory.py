@@ -0,0 +1,76 @@
+"""Memory per movie for Movie, CompactMovie and MovieBatch.
+
+Decodes the same synthetic MovieCache-style JSON rows into each
+representation and reports the traced allocation size (including the decoded
+strings) and build time. Titles and plots are unique per movie; genres,
+directors and cast names repeat the way they do across a real catalog.
+
+Run from the project root:
+    python -m benchmarks.bench_memory --movies 200000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from imdb_scraper.compact import CompactMovie, MovieBatch
+from imdb_scraper.models import Movie
+
+from .stub_server import make_catalog
+
+
+def movie_rows(count):
+    """Build Movie.to_dict() JSON rows as stored by MovieCache."""
+    return [
+        json.dumps(Movie(
+            imdb_id=imdb_id,
+            url=f"https://www.imdb.com/title/{imdb_id}/",
+            cast=movie["cast"][:5],
+            **{k: v for k, v in movie.items() if k != "cast"}
+        ).to_dict())
+        for imdb_id, movie in make_catalog(count).items()
+    ]
+
+
+def measure(build, rows):
+    """Return (bytes allocated by the built container, build seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    container = build(rows)
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del container
+    return size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark in-memory movie representations")
+    parser.add_argument("--movies", type=int, default=200_000)
+    args = parser.parse_args()
+
+    rows = movie_rows(args.movies)
+    builders = [
+        ("Movie (dataclass)", lambda data: [Movie.from_dict(json.loads(row)) for row in data]),
+        ("CompactMovie", lambda data: [CompactMovie.from_dict(json.loads(row)) for row in data]),
+        ("MovieBatch", lambda data: MovieBatch(CompactMovie.from_dict(json.loads(row))
+                                               for row in data)),
+    ]
+
+    print(f"{args.movies} movies")
+    baseline = None
+    for label, build in builders:
+        size, elapsed = measure(build, rows)
+        baseline = baseline or size
+        print(f"{label:<20} {size / args.movies:8.0f} B/movie  {size / baseline:6.1%}  "
+              f"build {elapsed:.2f}s")
+
+    batch = MovieBatch(Movie.from_dict(json.loads(row)) for row in rows[:1000])
+    assert [row.to_dict() for row in batch] == [json.loads(row) for row in rows[:1000]]
+
+
+if __name__ == "__main__":
+    main()
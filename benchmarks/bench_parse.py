@@ -0,0 +1,86 @@
+"""Parse CPU and peak memory per page.
+
+Compares byte-level JSON extraction with a full BeautifulSoup tree, then times
+each installed HTML backend on the CSS-selector fallback path and checks that
+they all produce identical Movie objects.
+
+Run from the project root:
+    python -m benchmarks.bench_parse --pages 50
+"""
+
+import argparse
+import json
+import logging
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from imdb_scraper.backends import available_backends, get_backend
+from imdb_scraper.parsing import find_page_props, movie_from_props, parse_title_page
+
+from .stub_server import make_catalog, render_html_title_page, render_page, title_page_props
+
+
+def soup_page_props(content: bytes):
+    """The pre-fast-path approach: build a DOM, then decode every JSON script."""
+    soup = BeautifulSoup(content, 'html.parser')
+    for script in soup.find_all('script', type='application/json'):
+        if script.string:
+            page_props = json.loads(script.string).get('props', {}).get('pageProps', {})
+            if page_props:
+                return page_props
+    return None
+
+
+def measure(extract, pages):
+    """Return (seconds per page, peak bytes for one page)."""
+    start = time.perf_counter()
+    for imdb_id, content in pages:
+        movie_from_props(extract(content), imdb_id, "")
+    per_page = (time.perf_counter() - start) / len(pages)
+
+    tracemalloc.start()
+    extract(pages[0][1])
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return per_page, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark title page parsing")
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--padding", type=int, default=2000, help="Markup blocks per page")
+    args = parser.parse_args()
+
+    catalog = make_catalog(args.pages)
+    pages = [(imdb_id, render_page(title_page_props(imdb_id, movie), args.padding))
+             for imdb_id, movie in catalog.items()]
+    size_kb = sum(len(content) for _, content in pages) / len(pages) / 1024
+
+    print(f"JSON extraction: {args.pages} pages, {size_kb:.0f} KB average")
+    for name, extract in (("beautifulsoup", soup_page_props), ("fast-path", find_page_props)):
+        per_page, peak = measure(extract, pages)
+        print(f"{name:>14}: {per_page * 1000:8.2f} ms/page  peak {peak / 1024:8.0f} KB")
+
+    # Selector fallback path, one pass per installed backend
+    logging.disable(logging.WARNING)
+    html_pages = [(imdb_id, render_html_title_page(imdb_id, movie, args.padding))
+                  for imdb_id, movie in catalog.items()]
+    print(f"\nSelector fallback: {len(html_pages)} pages")
+    baseline = None
+    for name in available_backends():
+        backend = get_backend(name)
+        start = time.perf_counter()
+        movies = [parse_title_page(content, imdb_id, "", backend) for imdb_id, content in html_pages]
+        per_page = (time.perf_counter() - start) / len(html_pages)
+
+        rows = [{k: v for k, v in movie.to_dict().items() if k != "scraped_at"} for movie in movies]
+        if baseline is None:
+            baseline = rows
+        identical = "identical" if rows == baseline else "MISMATCH"
+        print(f"{name:>14}: {per_page * 1000:8.2f} ms/page  {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""End-to-end benchmark suite over a recorded page corpus, with JSON results.
+
+Replays the corpus from a local server and measures:
+
+- throughput: search_and_get_movie lookups/s with cold and warm caches
+- parse: per-page latency of the JSON fast path and of each installed HTML
+  backend on the selector fallback path
+- memory: peak bytes allocated while parsing one title page
+- cache: hit ratios, requests saved and 304 revalidations
+
+Run from the project root:
+    python -m benchmarks.bench_suite --output bench-results.json
+    python -m benchmarks.bench_suite --baseline bench-results.json  # flag regressions
+"""
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from imdb_scraper import IMDbScraper, Movie, __version__
+from imdb_scraper.backends import available_backends, get_backend
+from imdb_scraper.cache import MovieCache, ResponseCache
+from imdb_scraper.history import SearchHistory
+from imdb_scraper.metrics import metrics
+from imdb_scraper.parsing import parse_movie_details_html, parse_title_page
+from imdb_scraper.ratelimit import TokenBucket
+
+from .corpus import Corpus
+from .replay_server import ReplayServer
+
+SUITE_VERSION = 1  # bump when result keys change meaning
+
+# Result paths compared against a baseline, and whether higher values are better
+TRACKED = {
+    "throughput.cold.lookups_per_s": True,
+    "throughput.warm.lookups_per_s": True,
+    "parse.json.median_ms": False,
+    "memory.peak_bytes_mean": False,
+}
+
+
+def unlimited() -> TokenBucket:
+    """Rate limiter that never waits, so the benchmark measures the engine."""
+    return TokenBucket(rate=1e9, burst=10 ** 9)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Median / p90 / mean of per-page seconds, in milliseconds."""
+    ordered = sorted(samples)
+    return {
+        "pages": len(samples),
+        "median_ms": statistics.median(ordered) * 1000,
+        "p90_ms": ordered[int(0.9 * (len(ordered) - 1))] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+    }
+
+
+def time_pages(parse: Callable[[str, bytes], Any], pages, repeat: int) -> List[float]:
+    """Best-of-repeat seconds per page."""
+    samples = []
+    for imdb_id, content in pages:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parse(imdb_id, content)
+            best = min(best, time.perf_counter() - start)
+        samples.append(best)
+    return samples
+
+
+def bench_parse(pages, repeat: int) -> Dict[str, Any]:
+    results = {"json": summarize(time_pages(
+        lambda imdb_id, content: parse_title_page(content, imdb_id, ""), pages, repeat))}
+    for name in available_backends():
+        backend = get_backend(name)
+        # Force the selector path even though recorded pages carry embedded JSON
+        results[f"html:{name}"] = summarize(time_pages(
+            lambda imdb_id, content: parse_movie_details_html(backend.parse(content), imdb_id, "",
+                                                              backend),
+            pages, repeat))
+    return results
+
+
+def bench_memory(pages) -> Dict[str, Any]:
+    peaks = []
+    for imdb_id, content in pages:
+        tracemalloc.start()
+        parse_title_page(content, imdb_id, "")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peaks.append(peak)
+    return {
+        "page_bytes_mean": statistics.fmean(len(content) for _, content in pages),
+        "peak_bytes_mean": statistics.fmean(peaks),
+        "peak_bytes_max": max(peaks),
+    }
+
+
+def bench_lookups(corpus: Corpus, workers: int, latency: float) -> Dict[str, Any]:
+    """Cold, warm and revalidating lookup runs against the replay server."""
+    queries = corpus.queries
+    results: Dict[str, Any] = {}
+    with ReplayServer(corpus, latency=latency) as server, tempfile.TemporaryDirectory() as tmp:
+        cache_file = str(Path(tmp) / "cache.sqlite3")
+
+        def run(label: str, **cache_ttls) -> None:
+            scraper = IMDbScraper(use_cache=False, rate_limiter=unlimited(), base_url=server.base_url,
+                                  history=SearchHistory(str(Path(tmp) / f"{label}.json")))
+            scraper.cache = ResponseCache(cache_file, **cache_ttls)
+            scraper.movie_cache = MovieCache(cache_file, **({"ttl": -1} if cache_ttls else {}))
+            metrics.reset()
+            requests_before = server.requests
+            start = time.perf_counter()
+            found = sum(isinstance(result, Movie)
+                        for _, result in scraper.get_many(queries, max_workers=workers))
+            elapsed = time.perf_counter() - start
+            counters = metrics.stats()["counters"]
+            results[label] = {
+                "lookups": len(queries),
+                "found": found,
+                "seconds": elapsed,
+                "lookups_per_s": len(queries) / elapsed,
+                "requests": server.requests - requests_before,
+                "bytes_downloaded": counters.get("bytes_downloaded", 0),
+                "not_modified": counters.get("not_modified", 0),
+                "response_cache": scraper.cache.stats(),
+                "movie_cache": scraper.movie_cache.stats(),
+                "stages": metrics.stats()["stages"],
+            }
+            scraper.cache.close()
+            scraper.movie_cache.close()
+            scraper.history.close()
+
+        metrics.enable()
+        run("cold")
+        run("warm")
+        # Every entry expired: pages revalidate with conditional GETs instead of downloading
+        run("revalidate", search_ttl=-1, title_ttl=-1)
+        metrics.enable(False)
+        results["unrecorded_requests"] = server.unrecorded
+    return results
+
+
+def lookup_path(results: Dict[str, Any], path: str) -> Any:
+    value: Any = results
+    for key in path.split("."):
+        value = value.get(key) if isinstance(value, dict) else None
+    return value
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """List tracked metrics that got worse than the baseline by more than tolerance."""
+    regressions = []
+    for path, higher_is_better in TRACKED.items():
+        new, old = lookup_path(results, path), lookup_path(baseline, path)
+        if not isinstance(new, (int, float)) or not isinstance(old, (int, float)) or not old:
+            continue
+        change = (new - old) / old
+        if (change < -tolerance) if higher_is_better else (change > tolerance):
+            regressions.append(f"{path}: {old:.4g} -> {new:.4g} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper on a recorded corpus")
+    parser.add_argument("--corpus", type=Path, help="Corpus directory (default: latest)")
+    parser.add_argument("--workers", type=int, default=4, help="Thread pool size for get_many")
+    parser.add_argument("--latency", type=float, default=0.0, help="Simulated server latency (s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Parse timing repetitions per page")
+    parser.add_argument("--output", type=Path, help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="Earlier results to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Relative slowdown tolerated before flagging a regression")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    corpus = Corpus.load(args.corpus) if args.corpus else Corpus.latest()
+    pages = list(corpus.title_pages())
+
+    results = {
+        "suite_version": SUITE_VERSION,
+        "run_at": datetime.now(timezone.utc).isoformat(),
+        "scraper_version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {"name": corpus.name, "recorded_at": corpus.manifest["recorded_at"],
+                   "pages": len(corpus.pages), "title_pages": len(pages)},
+        "settings": {"workers": args.workers, "latency": args.latency, "repeat": args.repeat},
+        "throughput": bench_lookups(corpus, args.workers, args.latency),
+        "parse": bench_parse(pages, args.repeat),
+        "memory": bench_memory(pages),
+    }
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text("utf-8"))
+        if baseline.get("suite_version") != SUITE_VERSION:
+            print(f"Baseline is suite version {baseline.get('suite_version')}, not comparable",
+                  file=sys.stderr)
+            sys.exit(2)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
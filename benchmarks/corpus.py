@@ -0,0 +1,197 @@
+"""Versioned corpus of recorded IMDb pages for offline benchmarks.
+
+A corpus is a directory holding a manifest.json and one gzipped body per
+recorded response under pages/. Pages are recorded by running real
+search_and_get_movie lookups and capturing every response the scraper gets,
+so replaying the corpus reproduces exactly the requests a lookup makes.
+
+Record from IMDb (or any compatible server), then commit the directory:
+    python -m benchmarks.corpus record --queries queries.txt --name imdb-2026-10
+    python -m benchmarks.corpus record --stub --name stub-v1
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+from urllib.parse import urlsplit
+
+from imdb_scraper import IMDbScraper, FuzzyTitleIndex, __version__
+from imdb_scraper.history import SearchHistory
+from imdb_scraper.ratelimit import TokenBucket
+
+CORPUS_FORMAT = 1  # bump when the manifest layout changes
+CORPUS_ROOT = Path(__file__).parent / "corpus"
+
+
+def request_target(url: str) -> str:
+    """Get the path and query of a URL, the key pages are recorded and served under."""
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+class Corpus:
+    """Recorded responses keyed by request target (path and query)."""
+
+    def __init__(self, directory: Path, manifest: Dict[str, Any]):
+        self.directory = Path(directory)
+        self.manifest = manifest
+        self.pages: Dict[str, Dict[str, Any]] = {page["target"]: page for page in manifest["pages"]}
+
+    @property
+    def name(self) -> str:
+        return self.manifest["name"]
+
+    @property
+    def queries(self) -> List[str]:
+        """Queries the corpus was recorded with, in recording order."""
+        return self.manifest["queries"]
+
+    def body(self, target: str) -> Optional[bytes]:
+        """Get the recorded body for a request target."""
+        page = self.pages.get(target)
+        if page is None:
+            return None
+        with gzip.open(self.directory / "pages" / page["file"], "rb") as f:
+            return f.read()
+
+    def title_pages(self) -> Iterable[tuple]:
+        """Yield (imdb_id, body) for every recorded /title/ page."""
+        for target, page in self.pages.items():
+            if page.get("imdb_id") and page["status"] == 200:
+                yield page["imdb_id"], self.body(target)
+
+    @classmethod
+    def load(cls, directory: Path) -> "Corpus":
+        """Load a corpus directory, checking its format version."""
+        directory = Path(directory)
+        with open(directory / "manifest.json", "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format") != CORPUS_FORMAT:
+            raise ValueError(f"{directory} has corpus format {manifest.get('format')}, "
+                             f"expected {CORPUS_FORMAT}; re-record it")
+        return cls(directory, manifest)
+
+    @classmethod
+    def latest(cls, root: Path = CORPUS_ROOT) -> "Corpus":
+        """Load the most recently recorded corpus under root."""
+        manifests = sorted(root.glob("*/manifest.json"),
+                           key=lambda path: json.loads(path.read_text("utf-8"))["recorded_at"])
+        if not manifests:
+            raise FileNotFoundError(f"No corpus under {root}; record one with "
+                                    f"python -m benchmarks.corpus record")
+        return cls.load(manifests[-1].parent)
+
+
+def record(queries: List[str], name: str, base_url: str, root: Path = CORPUS_ROOT,
+           rate_limiter: Optional[TokenBucket] = None) -> Corpus:
+    """Record the pages fetched by search_and_get_movie for each query.
+
+    Lookups go through the normal scraper, rate limiter included, with caches
+    disabled and a throwaway history so every page is actually requested.
+
+    Args:
+        queries: Movie titles to look up
+        name: Corpus directory name, e.g. "imdb-2026-10"
+        base_url: Site to record from
+        root: Directory holding corpora
+        rate_limiter: Limiter to record with (defaults to the shared limiter)
+
+    Returns:
+        The recorded corpus
+    """
+    directory = root / name
+    if (directory / "manifest.json").exists():
+        raise FileExistsError(f"Corpus {directory} already exists; corpora are immutable, "
+                              f"record under a new name")
+    (directory / "pages").mkdir(parents=True, exist_ok=True)
+
+    pages: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = IMDbScraper(use_cache=False, base_url=base_url, rate_limiter=rate_limiter,
+                              history=SearchHistory(str(Path(tmp) / "history.json")),
+                              fuzzy_index=FuzzyTitleIndex(base_url))
+        session_get = scraper.session.get
+
+        def recording_get(url, **kwargs):
+            response = session_get(url, **kwargs)
+            body = response.content
+            digest = hashlib.sha256(body).hexdigest()
+            target = request_target(url)
+            title = target.startswith("/title/")
+            pages[target] = {
+                "target": target,
+                "file": f"{digest[:16]}.html.gz",
+                "status": response.status_code,
+                "content_type": response.headers.get("Content-Type", ""),
+                "size": len(body),
+                "sha256": digest,
+                "imdb_id": target.split("/")[2] if title else None,
+            }
+            with gzip.open(directory / "pages" / pages[target]["file"], "wb") as f:
+                f.write(body)
+            return response
+
+        scraper.session.get = recording_get
+        found = 0
+        for query in queries:
+            # Fresh fuzzy index, so no query is answered from an earlier one's title
+            scraper.fuzzy_index = FuzzyTitleIndex(base_url)
+            movie = scraper.search_and_get_movie(query)
+            found += movie is not None
+            print(f"{'ok ' if movie else 'MISS'} {query}", file=sys.stderr)
+        scraper.history.close()
+
+    manifest = {
+        "format": CORPUS_FORMAT,
+        "name": name,
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "source": base_url,
+        "scraper_version": __version__,
+        "queries": queries,
+        "found": found,
+        "pages": sorted(pages.values(), key=lambda page: page["target"]),
+    }
+    with open(directory / "manifest.json", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    return Corpus(directory, manifest)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record a benchmark page corpus")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="Record pages for a list of queries")
+    rec.add_argument("--name", required=True, help="Corpus directory name under benchmarks/corpus")
+    rec.add_argument("--queries", metavar="FILE", help="One movie title per line")
+    rec.add_argument("--base-url", default="https://www.imdb.com")
+    rec.add_argument("--stub", type=int, nargs="?", const=20, metavar="N",
+                     help="Record N titles from a local stub server instead (synthetic corpus)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    if args.stub:
+        from .stub_server import StubIMDbServer, make_catalog
+
+        catalog = make_catalog(args.stub)
+        with StubIMDbServer(catalog) as server:
+            corpus = record([movie["title"] for movie in catalog.values()], args.name,
+                            server.base_url, rate_limiter=TokenBucket(rate=1e9, burst=10 ** 9))
+    else:
+        if not args.queries:
+            parser.error("--queries is required unless --stub is given")
+        with open(args.queries, "r", encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+        corpus = record(queries, args.name, args.base_url)
+
+    print(f"Recorded {len(corpus.pages)} pages for {len(corpus.queries)} queries "
+          f"into {corpus.directory}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
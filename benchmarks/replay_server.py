@@ -0,0 +1,61 @@
+"""Local HTTP server replaying a recorded page corpus.
+
+Run from the project root:
+    python -m benchmarks.replay_server --corpus benchmarks/corpus/stub-v1 --port 8766
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from .corpus import Corpus
+from .stub_server import StubIMDbServer
+
+
+class ReplayServer(StubIMDbServer):
+    """Serves recorded responses by request target; anything unrecorded is a 404."""
+
+    def __init__(self, corpus: Corpus, latency: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        """Initialize the replay server.
+
+        Args:
+            corpus: Recorded pages to serve
+            latency: Seconds to sleep before answering, to simulate network delay
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        super().__init__(catalog={}, latency=latency, host=host, port=port)
+        self.corpus = corpus
+        self.unrecorded = 0
+
+    def respond(self, path: str) -> Tuple[int, bytes]:
+        page = self.corpus.pages.get(path)
+        if page is None:
+            with self._lock:
+                self.unrecorded += 1
+            return 404, b"<html><body>Not recorded</body></html>"
+        return page["status"], self.corpus.body(path)
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="Replay a recorded IMDb page corpus")
+    parser.add_argument("--corpus", type=Path, help="Corpus directory (default: latest)")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of simulated latency")
+    args = parser.parse_args(argv)
+
+    corpus = Corpus.load(args.corpus) if args.corpus else Corpus.latest()
+    server = ReplayServer(corpus, latency=args.latency, port=args.port)
+    print(f"Replaying {corpus.name} ({len(corpus.pages)} pages) at {server.base_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""Local stub of the IMDb /find/ and /title/ endpoints for offline benchmarking.
+
+Pages mimic IMDb's Next.js layout: a __NEXT_DATA__ JSON script surrounded by
+enough markup to reach a realistic page size.
+"""
+
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+PADDING_BLOCK = '<div class="ipc-page-section"><span>' + "lorem ipsum " * 16 + "</span></div>"
+
+
+def make_catalog(size: int = 1000) -> Dict[str, Dict[str, Any]]:
+    """Build a synthetic catalog of movies keyed by IMDb ID."""
+    catalog = {}
+    for i in range(1, size + 1):
+        imdb_id = f"tt{i:07d}"
+        catalog[imdb_id] = {
+            "title": f"Stub Movie {i:04d}",
+            "year": 1950 + i % 70,
+            "rating": round(5.0 + (i % 50) / 10, 1),
+            "runtime": f"{1 + i % 2}h {i % 60}m",
+            "genres": ["Drama", "Comedy", "Action"][: 1 + i % 3],
+            "director": f"Director {i % 97}",
+            "cast": [f"Actor {(i + k) % 501}" for k in range(8)],
+            "plot": f"The plot of stub movie number {i}.",
+        }
+    return catalog
+
+
+def title_page_props(imdb_id: str, movie: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the pageProps of a /title/ page."""
+    return {
+        "tconst": imdb_id,
+        "aboveTheFoldData": {
+            "titleText": {"text": movie["title"]},
+            "releaseYear": {"year": movie["year"]},
+            "ratingsSummary": {"aggregateRating": movie["rating"]},
+            "runtime": {"displayableProperty": {"value": {"plainText": movie["runtime"]}}},
+            "genres": {"genres": [{"text": g} for g in movie["genres"]]},
+            "principalCredits": [
+                {"category": {"text": "Director"},
+                 "credits": [{"name": {"nameText": {"text": movie["director"]}}}]},
+            ],
+            "castPageTitle": {
+                "edges": [{"node": {"name": {"nameText": {"text": c}}}} for c in movie["cast"]]
+            },
+            "plot": {"plotText": {"plainText": movie["plot"]}},
+            "primaryImage": {"url": f"https://m.media-amazon.com/images/{imdb_id}.jpg"},
+        },
+        "mainColumnData": {
+            "crewV2": [
+                {"grouping": {"text": "Director"},
+                 "credits": [{"name": {"nameText": {"text": movie["director"]}}}]},
+                {"grouping": {"text": "Writers"},
+                 "credits": [{"name": {"nameText": {"text": f"Writer of {movie['title']}"}}}]},
+            ],
+        },
+    }
+
+
+def search_page_props(query: str, catalog: Dict[str, Dict[str, Any]], limit: int = 25) -> Dict[str, Any]:
+    """Build the pageProps of a /find/ page."""
+    query = query.lower()
+    results = []
+    for imdb_id, movie in catalog.items():
+        if query in movie["title"].lower():
+            results.append({
+                "id": imdb_id,
+                "titleNameText": movie["title"],
+                "titleReleaseText": str(movie["year"]),
+            })
+            if len(results) >= limit:
+                break
+    return {"titleResults": {"results": results}}
+
+
+def render_html_title_page(imdb_id: str, movie: Dict[str, Any], padding_blocks: int = 600) -> bytes:
+    """Render a /title/ page without embedded JSON, matching MOVIE_SELECTORS."""
+    genres = "".join(f'<a href="/search/?genres={g}"><span>{g}</span></a>' for g in movie["genres"])
+    cast = "".join(
+        f'<div data-testid="title-cast-item"><a data-testid="title-cast-item__actor" '
+        f'href="/name/nm{k:07d}/">{name}</a></div>'
+        for k, name in enumerate(movie["cast"])
+    )
+    body = (
+        f'<h1 data-testid="hero__pageTitle"><span class="hero__primary-text">{movie["title"]}</span></h1>'
+        f'<ul><li><a href="/title/{imdb_id}/releaseinfo"><span>{movie["year"]}</span></a></li></ul>'
+        f'<div data-testid="hero-rating-bar__aggregate-rating"><span>{movie["rating"]}/10</span></div>'
+        f'<div data-testid="title-pc-principal-credit"><ul><li>'
+        f'<a href="/name/nm9000001/">{movie["director"]}</a></li></ul></div>'
+        f'<div data-testid="genres">{genres}</div>'
+        f'<p data-testid="plot"><span data-testid="plot-xl">{movie["plot"]}</span></p>'
+        f'{cast}'
+        f'<ul><li data-testid="title-techspec_runtime"><span>Runtime</span>'
+        f'<div>{movie["runtime"]}</div></li></ul>'
+    )
+    return _wrap_html(body, padding_blocks)
+
+
+def render_html_search_page(query: str, catalog: Dict[str, Dict[str, Any]],
+                            padding_blocks: int = 600) -> bytes:
+    """Render a /find/ page without embedded JSON, matching SEARCH_SELECTORS."""
+    items = "".join(
+        f'<li><a href="/title/{result["id"]}/">{result["titleNameText"]}</a>'
+        f'<span data-testid="find-result-year">{result["titleReleaseText"]}</span></li>'
+        for result in search_page_props(query, catalog)["titleResults"]["results"]
+    )
+    return _wrap_html(f'<section data-testid="find-results-section"><ul>{items}</ul></section>',
+                      padding_blocks)
+
+
+def _wrap_html(body: str, padding_blocks: int) -> bytes:
+    head = PADDING_BLOCK * (padding_blocks // 4)
+    tail = PADDING_BLOCK * (padding_blocks - padding_blocks // 4)
+    return (
+        "<!DOCTYPE html><html><head><title>IMDb</title></head><body>"
+        + head + body + tail + "</body></html>"
+    ).encode("utf-8")
+
+
+def render_page(page_props: Dict[str, Any], padding_blocks: int = 600) -> bytes:
+    """Wrap pageProps in an IMDb-like HTML page."""
+    data = json.dumps({"props": {"pageProps": page_props}})
+    return _wrap_html('<script id="__NEXT_DATA__" type="application/json">' + data + "</script>",
+                      padding_blocks)
+
+
+class StubIMDbServer:
+    """Threaded HTTP server answering IMDb-style requests from a synthetic catalog."""
+
+    def __init__(self, catalog: Optional[Dict[str, Dict[str, Any]]] = None,
+                 latency: float = 0.0, padding_blocks: int = 600, html_only: bool = False,
+                 host: str = "127.0.0.1", port: int = 0):
+        """Initialize the stub server.
+
+        Args:
+            catalog: Movies keyed by IMDb ID (defaults to make_catalog())
+            latency: Seconds to sleep before answering, to simulate network delay
+            padding_blocks: Markup blocks per page, controls page size
+            html_only: If True, serve pages without embedded JSON so scrapers
+                exercise the CSS-selector fallback path
+            host: Interface to bind
+            port: Port to bind (0 picks a free port)
+        """
+        self.catalog = catalog if catalog is not None else make_catalog()
+        self.latency = latency
+        self.padding_blocks = padding_blocks
+        self.html_only = html_only
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):  # noqa: A002 - silence request logging
+                pass
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                status, body = stub.respond(self.path)
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 200:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
+
+    def respond(self, path: str) -> Tuple[int, bytes]:
+        """Build the status and body for a request path."""
+        parsed = urlparse(path)
+        if parsed.path.startswith("/find"):
+            query = parse_qs(parsed.query).get("q", [""])[0]
+            if self.html_only:
+                return 200, render_html_search_page(query, self.catalog, self.padding_blocks)
+            return 200, render_page(search_page_props(query, self.catalog), self.padding_blocks)
+
+        match = re.match(r"^/title/(tt\d+)/?$", parsed.path)
+        if match and match.group(1) in self.catalog:
+            imdb_id = match.group(1)
+            if self.html_only:
+                return 200, render_html_title_page(imdb_id, self.catalog[imdb_id], self.padding_blocks)
+            return 200, render_page(title_page_props(imdb_id, self.catalog[imdb_id]), self.padding_blocks)
+        return 404, b"<html><body>Not Found</body></html>"
+
+    def start(self) -> "StubIMDbServer":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Shut the server down."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "StubIMDbServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve a local IMDb stub")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds of simulated latency")
+    args = parser.parse_args()
+
+    server = StubIMDbServer(latency=args.latency, port=args.port)
+    print(f"Serving IMDb stub at {server.base_url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
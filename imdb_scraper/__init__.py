@@ -1,7 +1,19 @@
 """IMDb Scraper Package."""
 
 from .scraper import IMDbScraper
-from .models import Movie, SearchResult, ScraperError
+from .models import Movie, LazyMovie, SearchResult, ScraperError
+from .cache import ResponseCache, MovieCache
+from .async_scraper import AsyncIMDbScraper
+from .title_index import TitleIndex
+from .catalog import MovieCatalog
+from .fuzzy import FuzzyTitleIndex
+from .compact import CompactMovie, CompactSearchResult, MovieBatch
+from .singleflight import SingleFlight
+from .warmer import CacheWarmer
 
 __version__ = "0.1.0"
-__all__ = ["IMDbScraper", "Movie", "SearchResult", "ScraperError"]
\ No newline at end of file
+__all__ = [
+    "IMDbScraper", "AsyncIMDbScraper", "Movie", "LazyMovie", "SearchResult", "ScraperError",
+    "ResponseCache", "MovieCache", "MovieCatalog", "TitleIndex", "FuzzyTitleIndex",
+    "CompactMovie", "CompactSearchResult", "MovieBatch", "SingleFlight", "CacheWarmer",
+]
\ No newline at end of file
@@ -1,9 +1,79 @@
 #!/usr/bin/env python3
 """Streamlit web interface for IMDb scraper."""
 
+import threading
+from typing import Optional
+
 import streamlit as st
 from .scraper import IMDbScraper
 from .models import Movie
+from .history import SearchHistory
+from .singleflight import query_key
+from .warmer import CacheWarmer
+from .config import APP_MEMO_TTL, APP_MEMO_ENTRIES, WARM_ENABLED
+
+
+class _NoMovie(Exception):
+    """Raised inside the memoized lookup so misses are not memoized (st.cache_data skips errors)."""
+
+
+_lookup_state = threading.local()
+
+
+@st.cache_resource
+def get_history() -> SearchHistory:
+    """Get the search history shared by every session of this server process."""
+    return SearchHistory()
+
+
+@st.cache_resource
+def get_scraper(test_mode: bool = False) -> IMDbScraper:
+    """Get the scraper shared by every session of this server process.
+
+    One scraper means one connection pool, one rate limiter and one set of
+    caches across sessions; IMDbScraper is safe to use from the concurrent
+    script threads Streamlit runs sessions on.
+    """
+    return IMDbScraper(test_mode=test_mode, history=get_history(), stale_while_revalidate=True)
+
+
+@st.cache_resource
+def get_warmer(test_mode: bool = False) -> Optional[CacheWarmer]:
+    """Start the cache warmer for the shared scraper, once per server process.
+
+    It keeps the movies behind popular and recent searches cached, so hot
+    titles are answered from the cache instead of taking the cold path.
+    Test mode has no caches to warm.
+    """
+    if test_mode or not WARM_ENABLED:
+        return None
+    return CacheWarmer(get_scraper(test_mode), get_history()).start()
+
+
+@st.cache_data(ttl=APP_MEMO_TTL, max_entries=APP_MEMO_ENTRIES, show_spinner=False)
+def _memoized_movie(key: str, test_mode: bool) -> Movie:
+    _lookup_state.computed = True
+    movie = get_scraper(test_mode).search_and_get_movie(key)
+    if movie is None:
+        raise _NoMovie(key)
+    return movie
+
+
+def search_movie(query: str, test_mode: bool = False) -> Optional[Movie]:
+    """Look up a query through the shared scraper, memoized per normalized query.
+
+    Found movies are memoized for APP_MEMO_TTL; misses are not, so a failed
+    fetch is retried on the next search. Searches answered from the memo are
+    still recorded in the search history.
+    """
+    _lookup_state.computed = False
+    try:
+        movie = _memoized_movie(query_key(query), test_mode)
+    except _NoMovie:
+        return None
+    if not _lookup_state.computed:
+        get_history().record_search(query, success=True, store_resolution=False)
+    return movie
 
 
 def display_movie(movie: Movie):
@@ -24,6 +94,8 @@ def display_movie(movie: Movie):
             st.write(f"**🎭 Genres:** {', '.join(movie.genres)}")
         if movie.director:
             st.write(f"**🎬 Director:** {movie.director}")
+        if movie.writers:
+            st.write(f"**✍️ Writers:** {', '.join(movie.writers)}")
         if movie.cast:
             st.write(f"**🎭 Cast:** {', '.join(movie.cast)}")
 
@@ -33,6 +105,8 @@ def display_movie(movie: Movie):
                 st.write(movie.plot)
 
     with col2:
+        if movie.poster_url:
+            st.image(movie.poster_url, width=200)
         # IMDb link
         if movie.url:
             st.markdown(f"[🔗 View on IMDb]({movie.url})")
@@ -50,10 +124,7 @@ def main():
 
     st.title("🎬 IMDb Movie Search")
     st.markdown("Search for movies and get detailed information from IMDb.")
-
-    # Initialize scraper
-    if 'scraper' not in st.session_state:
-        st.session_state.scraper = IMDbScraper()
+    get_warmer()
 
     # Search input
     movie_query = st.text_input(
@@ -65,7 +136,7 @@ def main():
     if st.button("🔍 Search Movie", type="primary") and movie_query:
         with st.spinner("Searching IMDb..."):
             try:
-                movie = st.session_state.scraper.search_and_get_movie(movie_query)
+                movie = search_movie(movie_query)
 
                 if movie:
                     display_movie(movie)
@@ -0,0 +1,377 @@
+"""Asyncio IMDb scraper sharing parsing, caching and rate limiting with IMDbScraper."""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - optional dependency
+    aiohttp = None
+
+from .config import (
+    REQUEST_HEADERS, REQUEST_TIMEOUT, MAX_RETRIES, THROTTLE_STATUSES,
+    MAX_RESPONSE_BYTES, STREAM_CHUNK_SIZE,
+    IMDB_BASE_URL, HTML_PARSER, ASYNC_POOL_SIZE, ASYNC_BLOCKING_WORKERS, FUZZY_MIN_SCORE
+)
+from .models import Movie, SearchResult, SEARCH_RESULT_FIELDS, movie_fields
+from .history import SearchHistory
+from .fuzzy import FuzzyTitleIndex, title_similarity
+from .cache import ResponseCache, MovieCache
+from .catalog import MovieCatalog
+from .parsing import (
+    PageReader, parse_search_page, parse_title_page, parse_title_lazy, movie_from_search_result
+)
+from .backends import get_backend
+from .ratelimit import TokenBucket, default_limiter, backoff_delay, parse_retry_after
+from .singleflight import SingleFlight, default_flight, query_key
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncIMDbScraper:
+    """Asyncio counterpart to IMDbScraper for running many lookups on one event loop.
+
+    Cache, catalog and history calls (SQLite and file I/O) and page parsing
+    run on a small thread pool so they never stall the other lookups on the
+    loop.
+    """
+
+    def __init__(self, use_cache: bool = True, rate_limiter: Optional[TokenBucket] = None,
+                 history: Optional[SearchHistory] = None, base_url: str = IMDB_BASE_URL,
+                 pool_size: int = ASYNC_POOL_SIZE, parser: str = HTML_PARSER,
+                 fuzzy_index: Optional[FuzzyTitleIndex] = None,
+                 single_flight: Optional[SingleFlight] = None,
+                 catalog: Optional[MovieCatalog] = None):
+        """Initialize scraper settings; the HTTP session is opened lazily.
+
+        Args:
+            use_cache: If True, serve repeat requests from the on-disk response
+                and movie caches
+            rate_limiter: Token bucket to draw requests from (defaults to the
+                process-wide limiter shared with IMDbScraper)
+            history: Search history to record to (defaults to search_history.json)
+            base_url: IMDb site root, overridable to point at a local stub server
+            pool_size: Maximum number of pooled connections
+            parser: HTML parser backend for the selector fallback path
+            fuzzy_index: Fuzzy index of known titles (defaults to one built
+                from the movie cache and resolved queries in history)
+            single_flight: Coalesces concurrent identical lookups on the event
+                loop (defaults to the process-wide instance)
+            catalog: Catalog every fetched movie is recorded to (defaults to
+                movie_catalog.sqlite3 when use_cache is True)
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncIMDbScraper requires aiohttp: pip install aiohttp")
+
+        self.base_url = base_url.rstrip('/')
+        self.search_url = f"{self.base_url}/find/"
+        self.title_url = f"{self.base_url}/title/"
+        self.pool_size = pool_size
+        self.backend = get_backend(parser)
+        self.rate_limiter = rate_limiter or default_limiter
+        self.cache: Optional[ResponseCache] = ResponseCache() if use_cache else None
+        self.movie_cache: Optional[MovieCache] = MovieCache() if use_cache else None
+        if catalog is None and use_cache:
+            catalog = MovieCatalog()
+        self.catalog = catalog
+        self.history = history or SearchHistory()
+        if fuzzy_index is None:
+            movies = self.movie_cache.titles() if self.movie_cache is not None else ()
+            fuzzy_index = FuzzyTitleIndex.build(movies, self.history.resolved_queries(), self.base_url)
+        self.fuzzy_index = fuzzy_index
+        self.single_flight = single_flight or default_flight
+        self.session: Optional["aiohttp.ClientSession"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    async def __aenter__(self) -> "AsyncIMDbScraper":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """Get the pooled HTTP session, creating it on the running loop."""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size)
+            self.session = aiohttp.ClientSession(
+                headers=REQUEST_HEADERS,
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            )
+        return self.session
+
+    async def close(self) -> None:
+        """Close the pooled HTTP session and the blocking-call thread pool."""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run_blocking(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking call (SQLite, file I/O, parsing) off the event loop."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=ASYNC_BLOCKING_WORKERS,
+                                                thread_name_prefix="imdb-async-io")
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    async def _fetch(self, url: str, max_retries: int = MAX_RETRIES) -> Optional[bytes]:
+        """Get a response body from the cache or via HTTP with retry logic."""
+        return (await self._fetch_page(url, max_retries))[0]
+
+    async def _fetch_page(self, url: str,
+                          max_retries: int = MAX_RETRIES) -> Tuple[Optional[bytes], bool]:
+        """Get a response body, revalidating an expired cache entry with a conditional GET.
+
+        Returns:
+            (body or None, True if the server answered 304 Not Modified)
+        """
+        cached = await self._run_blocking(self.cache.lookup, url) if self.cache is not None else None
+        if cached is not None and cached.fresh:
+            logger.debug(f"Cache hit for: {url}")
+            metrics.inc("response_cache_hits")
+            return cached.body, False
+        if self.cache is not None:
+            metrics.inc("response_cache_misses")
+        headers = cached.validators() if cached is not None else {}
+
+        session = self._get_session()
+        for attempt in range(max_retries):
+            try:
+                metrics.observe("rate_limit_wait", await self.rate_limiter.acquire_async())
+                logger.info(f"Making request to: {url} (attempt {attempt + 1})")
+                metrics.inc("requests")
+                if attempt:
+                    metrics.inc("retries")
+
+                start = time.perf_counter()
+                async with session.get(url, headers=headers) as response:
+                    metrics.observe("http", time.perf_counter() - start)
+                    throttled = response.status in THROTTLE_STATUSES
+                    if throttled:
+                        metrics.inc("throttled")
+                    self.rate_limiter.on_response(
+                        throttled, parse_retry_after(response.headers.get('Retry-After')) if throttled else None
+                    )
+                    if 400 <= response.status < 500 and not throttled:
+                        logger.warning(f"HTTP {response.status} for {url}, not retrying")
+                        return None, False
+                    response.raise_for_status()
+
+                    if response.status == 304 and cached is not None:
+                        logger.debug(f"Not modified: {url}")
+                        metrics.inc("not_modified")
+                        await self._run_blocking(self.cache.revalidated, url)
+                        return cached.body, True
+
+                    # Check if we got a valid HTML response before downloading it
+                    if 'text/html' not in response.headers.get('content-type', ''):
+                        logger.warning(f"Non-HTML response from {url}")
+                        return None, False
+                    if (response.content_length or 0) > MAX_RESPONSE_BYTES:
+                        logger.warning(f"Response from {url} too large: "
+                                       f"{response.content_length} bytes")
+                        return None, False
+
+                    # Stream the body, stopping once the page data is in (see PageReader)
+                    start = time.perf_counter()
+                    reader = PageReader()
+                    async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                        if reader.feed(chunk):
+                            break
+                    metrics.observe("download", time.perf_counter() - start)
+                    metrics.inc("bytes_downloaded", len(reader.body))
+                    if reader.too_large:
+                        logger.warning(f"Response from {url} exceeded {reader.max_bytes} bytes, discarded")
+                        return None, False
+                    if reader.exited_early:
+                        metrics.inc("early_exits")
+                    content = reader.body
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+
+                if self.cache is not None:
+                    await self._run_blocking(self.cache.set, url, content, etag, last_modified,
+                                             not reader.exited_early)
+                return content, False
+
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
+                metrics.inc("request_errors")
+                if attempt < max_retries - 1:
+                    # Jittered exponential backoff; a Retry-After pause is applied by the limiter
+                    await asyncio.sleep(backoff_delay(attempt))
+                else:
+                    logger.error(f"Failed to fetch {url} after {max_retries} attempts")
+                    return None, False
+            except Exception as e:
+                logger.error(f"Unexpected error fetching {url}: {e}")
+                return None, False
+
+        return None, False
+
+    async def search_movies(self, query: str, max_results: int = 5) -> List[SearchResult]:
+        """Search for movies by title and return search results."""
+        if not query or not query.strip():
+            return []
+        return await self._search(query, max_results) or []
+
+    async def _search(self, query: str, max_results: int) -> Optional[List[SearchResult]]:
+        """Search IMDb, returning None (rather than no results) if the page could not be fetched."""
+        encoded_query = quote(query.strip())
+        search_url = f"{self.search_url}?q={encoded_query}&s=tt&ttype=ft&ref_=fn_ft"
+
+        content = await self._fetch(search_url)
+        if not content:
+            return None
+
+        return await self._run_blocking(parse_search_page, content, query, max_results,
+                                        self.base_url, self.backend)
+
+    async def get_movie_details(self, imdb_id: str,
+                                fields: Optional[Iterable[str]] = None) -> Optional[Movie]:
+        """Get detailed movie information by IMDb ID.
+
+        Args:
+            imdb_id: IMDb title ID (e.g. tt0133093)
+            fields: Movie fields the caller needs; see IMDbScraper.get_movie_details
+        """
+        if not imdb_id or not imdb_id.startswith('tt'):
+            return None
+        if fields is not None:
+            fields = movie_fields(fields)
+
+        if self.movie_cache is not None:
+            cached = await self._run_blocking(self.movie_cache.get, imdb_id)
+            if cached is not None:
+                logger.debug(f"Movie cache hit for: {imdb_id}")
+                metrics.inc("movie_cache_hits")
+                return cached
+            metrics.inc("movie_cache_misses")
+
+        movie, _ = await self.single_flight.do_async(("movie", self.base_url, imdb_id, fields),
+                                                     lambda: self._load_movie(imdb_id, fields))
+        return movie
+
+    async def _load_movie(self, imdb_id: str,
+                          fields: Optional[Tuple[str, ...]] = None) -> Optional[Movie]:
+        """Fetch, parse and cache the title page for an IMDb ID.
+
+        With fields, only those are extracted up front and the LazyMovie
+        returned is not cached.
+        """
+        movie_url = f"{self.title_url}{imdb_id}/"
+        content, not_modified = await self._fetch_page(movie_url)
+        if not content:
+            return None
+
+        return await self._run_blocking(self._store_movie, content, not_modified,
+                                        imdb_id, movie_url, fields)
+
+    def _store_movie(self, content: bytes, not_modified: bool, imdb_id: str, movie_url: str,
+                     fields: Optional[Tuple[str, ...]]) -> Optional[Movie]:
+        """Parse a fetched title page and record the movie. Runs on the blocking-call pool."""
+        movie = None
+        if not_modified and self.movie_cache is not None:
+            # Title page unchanged: reuse the movie parsed from it last time
+            movie = self.movie_cache.get_stale(imdb_id)
+        if movie is None and fields is not None:
+            movie = parse_title_lazy(content, fields, imdb_id, movie_url, self.backend)
+        elif movie is None:
+            movie = parse_title_page(content, imdb_id, movie_url, self.backend)
+        if movie and fields is None and self.movie_cache is not None:
+            self.movie_cache.set(movie)
+        if movie and fields is None and self.catalog is not None:
+            self.catalog.upsert(movie)
+        if movie:
+            self.fuzzy_index.add(imdb_id, movie.title, movie.year)
+        return movie
+
+    async def search_and_get_movie(self, query: str,
+                                   fields: Optional[Iterable[str]] = None) -> Optional[Movie]:
+        """Search for a movie and return the best match with full details.
+
+        Concurrent calls with the same query (ignoring case and spacing) share
+        a single lookup.
+
+        Args:
+            query: Movie title
+            fields: Movie fields the caller needs (see get_movie_details). If
+                the search result already carries them all, no title page is
+                fetched; attribute access cannot await, so the other fields of
+                the returned LazyMovie then keep their defaults.
+        """
+        if fields is not None:
+            fields = movie_fields(fields)
+        movie, shared = await self.single_flight.do_async(
+            ("query", self.base_url, query_key(query), fields),
+            lambda: self._search_and_get_movie(query, fields)
+        )
+        if shared:
+            # The leading call recorded its own search; count this one as well
+            await self._run_blocking(self.history.record_search, query, success=movie is not None,
+                                     store_resolution=False)
+        return movie
+
+    async def _search_and_get_movie(self, query: str,
+                                    fields: Optional[Tuple[str, ...]] = None) -> Optional[Movie]:
+        if await self._run_blocking(self.history.is_known_failure, query):
+            logger.info(f"Skipping recently failed query: {query}")
+            await self._run_blocking(self.history.record_search, query, success=False,
+                                     store_resolution=False)
+            return None
+
+        imdb_id = self.fuzzy_index.resolve(query)
+        if imdb_id:
+            movie = await self.get_movie_details(imdb_id, fields)
+            if movie:
+                logger.debug(f"Fuzzy index match for {query}: {imdb_id}")
+                await self._run_blocking(self.history.record_search, query, success=True, imdb_id=imdb_id)
+                return movie
+
+        imdb_id = await self._run_blocking(self.history.get_resolved_id, query)
+        if imdb_id:
+            movie = await self.get_movie_details(imdb_id, fields)
+            if movie:
+                await self._run_blocking(self.history.record_search, query, success=True,
+                                         store_resolution=False)
+                return movie
+
+        results = await self._search(query, max_results=1) if query.strip() else []
+        if results is None:
+            # Fetch failed (network, throttling): count it but don't cache it as a miss
+            await self._run_blocking(self.history.record_search, query, success=False,
+                                     store_resolution=False)
+            return None
+        if not results:
+            await self._run_blocking(self.history.record_search, query, success=False)
+            return None
+
+        best_result = results[0]
+        if not best_result.imdb_id:
+            await self._run_blocking(self.history.record_search, query, success=False)
+            return None
+
+        movie = None
+        if fields is not None and set(fields) <= set(SEARCH_RESULT_FIELDS):
+            movie = movie_from_search_result(best_result, f"{self.title_url}{best_result.imdb_id}/")
+        if movie is None:
+            movie = await self.get_movie_details(best_result.imdb_id, fields)
+        if movie and title_similarity(query, movie.title, movie.year) < FUZZY_MIN_SCORE:
+            # Movie title doesn't match query, treat as not found
+            await self._run_blocking(self.history.record_search, query, success=False)
+            return None
+        # A failed title fetch is transient: don't store it as a resolution
+        await self._run_blocking(self.history.record_search, query, success=movie is not None,
+                                 imdb_id=best_result.imdb_id, store_resolution=movie is not None)
+        if movie:
+            self.fuzzy_index.add(movie.imdb_id, query, alias=True)
+        return movie
@@ -0,0 +1,151 @@
+"""Pluggable HTML parser backends for the CSS-selector fallback path."""
+
+import importlib
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from .config import HTML_PARSER
+
+logger = logging.getLogger(__name__)
+
+
+class HTMLBackend:
+    """Parse HTML and run CSS selectors; subclasses wrap a concrete parser."""
+
+    name = "base"
+
+    def parse(self, content: bytes) -> Any:
+        """Parse a raw page into a document node."""
+        raise NotImplementedError
+
+    def select(self, node: Any, selector: str, limit: Optional[int] = None) -> List[Any]:
+        """Get up to limit descendants of node matching a CSS selector."""
+        raise NotImplementedError
+
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        """Get the first descendant of node matching a CSS selector."""
+        raise NotImplementedError
+
+    def text(self, node: Any) -> str:
+        """Get the stripped text content of a node."""
+        raise NotImplementedError
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        """Get an attribute value of a node."""
+        raise NotImplementedError
+
+
+class BeautifulSoupBackend(HTMLBackend):
+    """BeautifulSoup with html.parser or lxml, using precompiled soupsieve selectors."""
+
+    def __init__(self, features: str = "html.parser"):
+        """Initialize the backend.
+
+        Args:
+            features: BeautifulSoup tree builder ("html.parser" or "lxml")
+        """
+        from bs4 import BeautifulSoup
+        import soupsieve
+
+        self.name = features
+        self._features = features
+        self._beautiful_soup = BeautifulSoup
+        self._compile = lru_cache(maxsize=None)(soupsieve.compile)
+
+    def parse(self, content: bytes) -> Any:
+        return self._beautiful_soup(content, self._features)
+
+    def select(self, node: Any, selector: str, limit: Optional[int] = None) -> List[Any]:
+        return self._compile(selector).select(node, limit=limit or 0)
+
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        return self._compile(selector).select_one(node)
+
+    def text(self, node: Any) -> str:
+        return node.get_text(strip=True)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        value = node.get(name)
+        if isinstance(value, list):
+            value = value[0] if value else None
+        return value
+
+
+class SelectolaxBackend(HTMLBackend):
+    """selectolax (Lexbor engine), a C HTML5 parser with native CSS matching."""
+
+    name = "selectolax"
+
+    def __init__(self):
+        try:
+            from selectolax.lexbor import LexborHTMLParser as parser_class
+        except ImportError:
+            from selectolax.parser import HTMLParser as parser_class
+        self._parser_class = parser_class
+
+    def parse(self, content: bytes) -> Any:
+        return self._parser_class(content)
+
+    def select(self, node: Any, selector: str, limit: Optional[int] = None) -> List[Any]:
+        matches = node.css(selector)
+        return matches[:limit] if limit else matches
+
+    def select_one(self, node: Any, selector: str) -> Optional[Any]:
+        return node.css_first(selector)
+
+    def text(self, node: Any) -> str:
+        return node.text(strip=True)
+
+    def attr(self, node: Any, name: str) -> Optional[str]:
+        return node.attributes.get(name)
+
+
+def _make_lxml() -> HTMLBackend:
+    importlib.import_module("lxml")  # BeautifulSoup only fails at parse time otherwise
+    return BeautifulSoupBackend("lxml")
+
+
+_BACKENDS = {
+    "html.parser": lambda: BeautifulSoupBackend("html.parser"),
+    "lxml": _make_lxml,
+    "selectolax": SelectolaxBackend,
+}
+_instances: Dict[str, HTMLBackend] = {}
+
+
+def available_backends() -> List[str]:
+    """Get the names of backends whose dependencies are installed."""
+    names = []
+    for name in _BACKENDS:
+        try:
+            get_backend(name, fallback=False)
+            names.append(name)
+        except ImportError:
+            continue
+    return names
+
+
+def get_backend(name: str = HTML_PARSER, fallback: bool = True) -> HTMLBackend:
+    """Get a shared parser backend by name.
+
+    Args:
+        name: "html.parser", "lxml" or "selectolax"
+        fallback: If True, use html.parser when the requested backend's
+            dependency is not installed
+
+    Returns:
+        The backend instance
+    """
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend: {name}")
+
+    if name not in _instances:
+        try:
+            _instances[name] = _BACKENDS[name]()
+        except ImportError:
+            if not fallback:
+                raise
+            logger.warning(f"HTML parser backend '{name}' is not installed, using html.parser")
+            return get_backend("html.parser")
+    return _instances[name]
@@ -0,0 +1,173 @@
+"""Resumable batch lookups with progress reporting."""
+
+import json
+import sys
+import time
+from pathlib import Path
+from typing import IO, Iterable, Optional, Set, Tuple
+
+from .config import BATCH_MAX_WORKERS, BATCH_PROGRESS_INTERVAL
+from .export import MovieWriter
+from .models import Movie, ScraperError
+
+
+def count_lines(path: str) -> int:
+    """Count non-empty lines of an input file without holding it in memory."""
+    with open(path, "r", encoding="utf-8") as f:
+        return sum(1 for line in f if line.strip())
+
+
+class Checkpoint:
+    """Append-only JSONL log of batch items, so a killed run can resume.
+
+    An item is logged only after its result (or failure) has been flushed to
+    the outputs, so on resume every finished item is already written; an
+    item in flight when the run died is looked up again. Items whose lookup
+    failed transiently (network errors, throttling) are logged as retryable:
+    they are looked up again on the next run until they finish.
+    """
+
+    def __init__(self, path: str):
+        """Load logged items and open the log for appending.
+
+        Args:
+            path: Checkpoint file
+        """
+        self.path = Path(path)
+        self.done: Set[str] = set()
+        self.retry: Set[str] = set()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.endswith("\n"):  # A torn last line was never acknowledged
+                        entry = json.loads(line)
+                        self._apply(entry["item"], entry["retry"])
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def __contains__(self, item: str) -> bool:
+        return item in self.done
+
+    def _apply(self, item: str, retry: bool) -> None:
+        if retry:
+            self.retry.add(item)
+        else:
+            self.done.add(item)
+            self.retry.discard(item)
+
+    def add(self, item: str, retry: bool = False) -> None:
+        """Log an item as finished, or as failed transiently if retry is True."""
+        self._apply(item, retry)
+        self._file.write(json.dumps({"item": item, "retry": retry}, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self, completed: bool = False) -> None:
+        """Close the log, deleting it if the whole batch completed with nothing left to retry."""
+        self._file.close()
+        if completed and not self.retry:
+            self.path.unlink()
+
+
+class Progress:
+    """Throughput and ETA line, rewritten in place at most once per interval."""
+
+    def __init__(self, total: Optional[int] = None, stream: IO = sys.stderr,
+                 interval: float = BATCH_PROGRESS_INTERVAL):
+        """Initialize the progress display.
+
+        Args:
+            total: Items to process, if known (enables ETA)
+            stream: Where to draw the progress line
+            interval: Minimum seconds between redraws
+        """
+        self.total = total
+        self.stream = stream
+        self.interval = interval
+        self.succeeded = 0
+        self.failed = 0
+        self._start = time.monotonic()
+        self._last_draw = 0.0
+
+    @property
+    def done(self) -> int:
+        return self.succeeded + self.failed
+
+    def update(self, success: bool) -> None:
+        """Count one finished item and redraw if the interval has passed."""
+        if success:
+            self.succeeded += 1
+        else:
+            self.failed += 1
+        now = time.monotonic()
+        if now - self._last_draw >= self.interval:
+            self._last_draw = now
+            self._draw(now)
+
+    def _draw(self, now: float, end: str = "\r") -> None:
+        elapsed = now - self._start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        line = f"{self.done}"
+        if self.total is not None:
+            line += f"/{self.total}"
+        line += f" done ({self.failed} failed), {rate:.1f}/s"
+        if self.total is not None and rate > 0:
+            remaining = max(self.total - self.done, 0) / rate
+            line += f", ETA {int(remaining) // 60}:{int(remaining) % 60:02d}"
+        self.stream.write(line.ljust(60) + end)
+        self.stream.flush()
+
+    def finish(self) -> None:
+        """Draw the final line."""
+        self._draw(time.monotonic(), end="\n")
+
+
+def run_batch(scraper, items: Iterable[str], writer: MovieWriter,
+              failures: Optional[IO] = None, checkpoint: Optional[Checkpoint] = None,
+              max_workers: int = BATCH_MAX_WORKERS,
+              progress: Optional[Progress] = None,
+              fields: Optional[Iterable[str]] = None) -> Tuple[int, int, int]:
+    """Look up items concurrently, writing movies and failures to separate outputs.
+
+    Failures are written with a "retryable" flag, true for transient errors
+    (see IMDbScraper._lookup); those are logged to the checkpoint as
+    retryable rather than finished, so the next run looks them up again.
+
+    Args:
+        scraper: IMDbScraper to look items up with
+        items: Titles or IMDb IDs
+        writer: Destination for movies found
+        failures: Text stream for failures, one JSON object per line
+        checkpoint: Finished items to skip, extended as items finish or fail
+        max_workers: Concurrent lookups
+        progress: Progress display to update
+        fields: Movie fields needed from each lookup (see IMDbScraper.get_movie_details)
+
+    Returns:
+        (movies written, failures, failures that are retryable)
+    """
+    if checkpoint is not None:
+        items = (item for item in items if item not in checkpoint)
+
+    succeeded = failed = retryable = 0
+    for item, result in scraper.get_many(items, max_workers=max_workers, fields=fields):
+        retry = False
+        if isinstance(result, Movie):
+            writer.write(result)
+            writer.flush()
+            succeeded += 1
+        else:
+            retry = _is_retryable(result)
+            if failures is not None:
+                failures.write(json.dumps({"item": item, **result.to_dict(), "retryable": retry}) + "\n")
+                failures.flush()
+            failed += 1
+            retryable += retry
+
+        if checkpoint is not None:
+            checkpoint.add(item, retry=retry)
+        if progress is not None:
+            progress.update(isinstance(result, Movie))
+    return succeeded, failed, retryable
+
+
+def _is_retryable(error: ScraperError) -> bool:
+    return error.error_type != "not_found"
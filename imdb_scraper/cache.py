@@ -0,0 +1,352 @@
+"""Persistent response caching for IMDb scraper."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Tuple
+from urllib.parse import urlparse
+
+from .config import (
+    CACHE_FILE, CACHE_MAX_BYTES, SEARCH_CACHE_TTL, TITLE_CACHE_TTL, MOVIE_CACHE_TTL
+)
+from .models import Movie
+
+
+class CachedResponse(NamedTuple):
+    """A cached response body with the validators needed to revalidate it."""
+
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fresh: bool
+    complete: bool = True  # False if the download stopped after the page data script
+
+    def validators(self) -> Dict[str, str]:
+        """Get the conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """SQLite-backed cache of raw response bodies with TTL and LRU eviction.
+
+    Bodies are stored with their ETag / Last-Modified validators, so an
+    expired entry can be revalidated with a conditional GET instead of being
+    downloaded again, and flagged if they were cut short by an early exit
+    (see PageReader) so callers needing the whole page can skip them.
+    """
+
+    def __init__(self, cache_file: str = CACHE_FILE, max_bytes: int = CACHE_MAX_BYTES,
+                 search_ttl: float = SEARCH_CACHE_TTL, title_ttl: float = TITLE_CACHE_TTL):
+        """Initialize the response cache.
+
+        Args:
+            cache_file: Path to the SQLite file (relative to project root)
+            max_bytes: Maximum total size of stored bodies before eviction
+            search_ttl: Seconds a cached /find/ page stays fresh
+            title_ttl: Seconds a cached /title/ page stays fresh
+        """
+        self.cache_file = Path(__file__).parent.parent / cache_file
+        self.max_bytes = max_bytes
+        self.search_ttl = search_ttl
+        self.title_ttl = title_ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.revalidations = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_file), check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, body BLOB NOT NULL, "
+            "size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL, "
+            "etag TEXT, last_modified TEXT, complete INTEGER NOT NULL DEFAULT 0)"
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        for column in ("etag", "last_modified"):
+            if column not in columns:  # Cache file created before validators were stored
+                self._conn.execute(f"ALTER TABLE responses ADD COLUMN {column} TEXT")
+        if "complete" not in columns:  # Older rows may hold early-exit bodies: assume incomplete
+            self._conn.execute("ALTER TABLE responses ADD COLUMN complete INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)"
+        )
+
+    @staticmethod
+    def _key(url: str) -> str:
+        """Content address for a URL."""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def ttl_for(self, url: str) -> float:
+        """Get the freshness window for a URL based on its endpoint."""
+        path = urlparse(url).path
+        if path.startswith('/title/'):
+            return self.title_ttl
+        return self.search_ttl
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Get a fresh cached body for a URL.
+
+        Args:
+            url: The requested URL
+
+        Returns:
+            The cached response body, or None on a miss or expired entry
+        """
+        entry = self.lookup(url)
+        return entry.body if entry is not None and entry.fresh else None
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """Get the cached entry for a URL, fresh or expired.
+
+        Only fresh entries count as hits; an expired entry is a miss that can
+        still be revalidated.
+
+        Args:
+            url: The requested URL
+
+        Returns:
+            The cached entry, or None if the URL was never stored (or evicted)
+        """
+        key = self._key(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, stored_at, etag, last_modified, complete FROM responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            fresh = now - row[1] <= self.ttl_for(url)
+            if fresh:
+                self._conn.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                self.hits += 1
+            else:
+                self.misses += 1
+        return CachedResponse(zlib.decompress(row[0]), row[2], row[3], fresh, bool(row[4]))
+
+    def set(self, url: str, body: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, complete: bool = True) -> None:
+        """Store a response body and evict least recently used entries if needed.
+
+        Args:
+            url: The requested URL
+            body: Raw response body
+            etag: The response's ETag header, if any
+            last_modified: The response's Last-Modified header, if any
+            complete: False if the body was truncated after the page data script
+        """
+        data = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, body, size, stored_at, accessed_at, etag, last_modified, complete) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._key(url), url, data, len(data), now, now, etag, last_modified, int(complete))
+            )
+            self._evict()
+
+    def revalidated(self, url: str) -> None:
+        """Mark a stored body fresh again after a 304 Not Modified response.
+
+        Args:
+            url: The requested URL
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, self._key(url))
+            )
+            self.revalidations += 1
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        to_remove = []
+        for key, size in self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed_at"):
+            to_remove.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", to_remove)
+        self.evictions += len(to_remove)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Hit/miss counters, hit ratio, 304 revalidations, entry count and
+            stored size
+        """
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "revalidations": self.revalidations,
+            "entries": entries,
+            "size_bytes": size,
+        }
+
+    def clear(self) -> None:
+        """Remove all cached responses."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class MovieCache:
+    """SQLite-backed cache of parsed Movie objects keyed by IMDb ID."""
+
+    def __init__(self, cache_file: str = CACHE_FILE, ttl: float = MOVIE_CACHE_TTL):
+        """Initialize the movie cache.
+
+        Args:
+            cache_file: Path to the SQLite file (relative to project root)
+            ttl: Seconds a cached Movie stays fresh
+        """
+        self.cache_file = Path(__file__).parent.parent / cache_file
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.cache_file), check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS movies ("
+            "imdb_id TEXT PRIMARY KEY, data TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+
+    def get(self, imdb_id: str) -> Optional[Movie]:
+        """Get a fresh cached Movie.
+
+        Args:
+            imdb_id: IMDb title ID (e.g. tt0133093)
+
+        Returns:
+            The cached Movie, or None on a miss or expired entry
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data, stored_at FROM movies WHERE imdb_id = ?", (imdb_id,)
+            ).fetchone()
+            if row is None or time.time() - row[1] > self.ttl:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return Movie.from_dict(json.loads(row[0]))
+
+    def get_stale(self, imdb_id: str) -> Optional[Movie]:
+        """Get a cached Movie whether or not it has expired, without counting a lookup.
+
+        Used when the title page is known to be unchanged (a 304 response) or
+        when serving stale data while it is refreshed in the background.
+
+        Args:
+            imdb_id: IMDb title ID (e.g. tt0133093)
+
+        Returns:
+            The cached Movie, or None if none was stored
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM movies WHERE imdb_id = ?", (imdb_id,)
+            ).fetchone()
+        return Movie.from_dict(json.loads(row[0])) if row is not None else None
+
+    def expires_in(self, imdb_id: str) -> Optional[float]:
+        """Get the seconds until a cached movie expires, without counting a lookup.
+
+        Returns:
+            Seconds left (negative once expired), or None if the movie is not cached
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at FROM movies WHERE imdb_id = ?", (imdb_id,)
+            ).fetchone()
+        return row[0] + self.ttl - time.time() if row is not None else None
+
+    def set(self, movie: Movie) -> None:
+        """Store a parsed Movie.
+
+        Args:
+            movie: Movie with an imdb_id
+        """
+        if not movie.imdb_id:
+            return
+        data = json.dumps(movie.to_dict(), separators=(',', ':'), ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO movies (imdb_id, data, stored_at) VALUES (?, ?, ?)",
+                (movie.imdb_id, data, time.time())
+            )
+
+    def titles(self) -> Iterator[Tuple[str, str, Optional[int]]]:
+        """Iterate over the title and year of every cached movie, fresh or not.
+
+        Yields:
+            (imdb_id, title, year) tuples
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT imdb_id, data FROM movies").fetchall()
+        for imdb_id, data in rows:
+            movie = json.loads(data)
+            yield imdb_id, movie["title"], movie.get("year")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Hit/miss counters, hit ratio, parses saved and entry count
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "parses_saved": self.hits,
+            "entries": entries,
+        }
+
+    def clear(self) -> None:
+        """Remove all cached movies."""
+        with self._lock:
+            self._conn.execute("DELETE FROM movies")
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
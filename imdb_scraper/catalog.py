@@ -0,0 +1,228 @@
+"""Persistent catalog of scraped movies with secondary indexes for local queries."""
+
+import json
+import sqlite3
+import threading
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config import CATALOG_FILE, CATALOG_UPSERT_CHUNK, CATALOG_QUERY_LIMIT
+from .models import Movie
+from .title_index import title_key
+
+
+class MovieCatalog:
+    """SQLite (WAL) catalog of every movie fetched, indexed for local queries.
+
+    Movies are stored whole as JSON next to the columns they are queried by:
+    the normalized title, year, rating and director on the movies table, and
+    one row per genre and per cast member in their own tables, so "movies by
+    director X" or "top rated in genre Y between years" are index lookups.
+    Names, titles and genres match case and punctuation insensitively.
+    """
+
+    def __init__(self, catalog_file: str = CATALOG_FILE):
+        """Open (or create) the catalog.
+
+        Args:
+            catalog_file: Path to the SQLite file (relative to project root)
+        """
+        self.catalog_file = Path(__file__).parent.parent / catalog_file
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.catalog_file), check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # WAL stays consistent; no fsync per upsert
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS movies ("
+            "imdb_id TEXT PRIMARY KEY, title TEXT NOT NULL, title_key TEXT NOT NULL, "
+            "year INTEGER, rating REAL, director TEXT, director_key TEXT, "
+            "data TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS movie_genres ("
+            "genre TEXT NOT NULL, imdb_id TEXT NOT NULL, PRIMARY KEY (genre, imdb_id)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS movie_cast ("
+            "name_key TEXT NOT NULL, imdb_id TEXT NOT NULL, position INTEGER NOT NULL, "
+            "PRIMARY KEY (name_key, imdb_id)) WITHOUT ROWID"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_movies_title ON movies(title_key)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_movies_year ON movies(year, rating)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_movies_rating ON movies(rating)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_movies_director ON movies(director_key)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_genres_movie ON movie_genres(imdb_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cast_movie ON movie_cast(imdb_id)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0]
+
+    def upsert(self, movie: Movie) -> None:
+        """Add a movie, or replace the catalogued version of it."""
+        self.upsert_many((movie,))
+
+    def upsert_many(self, movies: Iterable[Movie], chunk_size: int = CATALOG_UPSERT_CHUNK) -> int:
+        """Add or replace many movies, one transaction per chunk.
+
+        Args:
+            movies: Movies to store; ones without an imdb_id are skipped
+            chunk_size: Movies per transaction
+
+        Returns:
+            Number of movies written
+        """
+        written = 0
+        movies = iter(movies)
+        while True:
+            batch = list(islice(movies, chunk_size))
+            if not batch:
+                return written
+            chunk = [movie for movie in batch if movie.imdb_id]
+            if not chunk:
+                continue
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    self._write(chunk)
+                    self._conn.execute("COMMIT")
+                except Exception:
+                    self._conn.execute("ROLLBACK")
+                    raise
+            written += len(chunk)
+
+    def _write(self, movies: List[Movie]) -> None:
+        """Write movies and their index rows. Caller holds the lock inside a transaction."""
+        now = time.time()
+        ids = [(movie.imdb_id,) for movie in movies]
+        self._conn.executemany(
+            "INSERT INTO movies (imdb_id, title, title_key, year, rating, director, director_key, "
+            "data, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(imdb_id) DO UPDATE SET "
+            "title = excluded.title, title_key = excluded.title_key, year = excluded.year, "
+            "rating = excluded.rating, director = excluded.director, "
+            "director_key = excluded.director_key, data = excluded.data, "
+            "updated_at = excluded.updated_at",
+            [(movie.imdb_id, movie.title, title_key(movie.title), movie.year, movie.rating,
+              movie.director, title_key(movie.director) if movie.director else None,
+              json.dumps(movie.to_dict(), separators=(',', ':'), ensure_ascii=False), now)
+             for movie in movies]
+        )
+        self._conn.executemany("DELETE FROM movie_genres WHERE imdb_id = ?", ids)
+        self._conn.executemany("DELETE FROM movie_cast WHERE imdb_id = ?", ids)
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO movie_genres (genre, imdb_id) VALUES (?, ?)",
+            [(title_key(genre), movie.imdb_id) for movie in movies for genre in movie.genres]
+        )
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO movie_cast (name_key, imdb_id, position) VALUES (?, ?, ?)",
+            [(title_key(name), movie.imdb_id, position)
+             for movie in movies for position, name in enumerate(movie.cast)]
+        )
+
+    def get(self, imdb_id: str) -> Optional[Movie]:
+        """Get a catalogued movie by IMDb ID."""
+        movies = self._query("SELECT data FROM movies WHERE imdb_id = ?", (imdb_id,))
+        return movies[0] if movies else None
+
+    def find_title(self, title: str, year: Optional[int] = None,
+                   limit: int = CATALOG_QUERY_LIMIT) -> List[Movie]:
+        """Find movies with exactly this title (case and punctuation insensitive).
+
+        Args:
+            title: Movie title
+            year: Release year to restrict the match to
+            limit: Most movies returned
+
+        Returns:
+            Matching movies, best rated first
+        """
+        sql = "SELECT data FROM movies WHERE title_key = ?"
+        params: List[Any] = [title_key(title)]
+        if year is not None:
+            sql += " AND year = ?"
+            params.append(year)
+        return self._query(sql + " ORDER BY rating IS NULL, rating DESC LIMIT ?", (*params, limit))
+
+    def by_director(self, name: str, limit: int = CATALOG_QUERY_LIMIT) -> List[Movie]:
+        """Get movies directed by someone, newest first.
+
+        Args:
+            name: Director name (case and punctuation insensitive)
+            limit: Most movies returned
+        """
+        return self._query(
+            "SELECT data FROM movies WHERE director_key = ? "
+            "ORDER BY year IS NULL, year DESC LIMIT ?", (title_key(name), limit)
+        )
+
+    def by_cast(self, name: str, limit: int = CATALOG_QUERY_LIMIT) -> List[Movie]:
+        """Get movies a cast member appears in, newest first.
+
+        Args:
+            name: Actor name (case and punctuation insensitive)
+            limit: Most movies returned
+        """
+        return self._query(
+            "SELECT m.data FROM movie_cast c JOIN movies m ON m.imdb_id = c.imdb_id "
+            "WHERE c.name_key = ? ORDER BY m.year IS NULL, m.year DESC LIMIT ?",
+            (title_key(name), limit)
+        )
+
+    def top_rated(self, genre: Optional[str] = None, year_from: Optional[int] = None,
+                  year_to: Optional[int] = None, min_rating: Optional[float] = None,
+                  limit: int = CATALOG_QUERY_LIMIT) -> List[Movie]:
+        """Get the best rated movies, optionally within a genre and a range of years.
+
+        Args:
+            genre: Only movies in this genre (case insensitive)
+            year_from: Earliest release year, inclusive
+            year_to: Latest release year, inclusive
+            min_rating: Lowest rating included
+            limit: Most movies returned
+
+        Returns:
+            Rated movies, best first (newest first among equal ratings)
+        """
+        sql = "SELECT m.data FROM movies m"
+        params: List[Any] = []
+        if genre:
+            sql += " JOIN movie_genres g ON g.imdb_id = m.imdb_id AND g.genre = ?"
+            params.append(title_key(genre))
+        sql += " WHERE m.rating IS NOT NULL"
+        for clause, value in (("m.year >= ?", year_from), ("m.year <= ?", year_to),
+                              ("m.rating >= ?", min_rating)):
+            if value is not None:
+                sql += f" AND {clause}"
+                params.append(value)
+        sql += " ORDER BY m.rating DESC, m.year DESC LIMIT ?"
+        return self._query(sql, (*params, limit))
+
+    def _query(self, sql: str, params: tuple) -> List[Movie]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [Movie.from_dict(json.loads(row[0])) for row in rows]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get catalog size.
+
+        Returns:
+            Numbers of movies, genres, directors and cast members catalogued
+        """
+        with self._lock:
+            return {
+                "movies": self._conn.execute("SELECT COUNT(*) FROM movies").fetchone()[0],
+                "genres": self._conn.execute(
+                    "SELECT COUNT(DISTINCT genre) FROM movie_genres").fetchone()[0],
+                "directors": self._conn.execute(
+                    "SELECT COUNT(DISTINCT director_key) FROM movies").fetchone()[0],
+                "cast_members": self._conn.execute(
+                    "SELECT COUNT(DISTINCT name_key) FROM movie_cast").fetchone()[0],
+            }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -2,10 +2,18 @@
 """Command-line interface for IMDb scraper."""
 
 import argparse
+import atexit
 import json
 import sys
 
+from .batch import Checkpoint, Progress, count_lines, run_batch
+from .catalog import MovieCatalog
+from .config import EXPORT_ROW_GROUP_SIZE, IMDB_BASE_URL, BATCH_MAX_WORKERS, CATALOG_QUERY_LIMIT
+from .export import EXPORT_FORMATS, format_for_path, iter_input, open_writer
+from .metrics import metrics, start_metrics_server
+from .models import Movie, movie_fields
 from .scraper import IMDbScraper
+from .title_index import TitleIndex
 
 
 def print_movie(movie):
@@ -23,6 +31,8 @@ def print_movie(movie):
         print(f"🎭 Genres: {', '.join(movie.genres)}")
     if movie.director:
         print(f"🎬 Director: {movie.director}")
+    if movie.writers:
+        print(f"✍️  Writers: {', '.join(movie.writers)}")
     if movie.cast:
         print(f"🎭 Cast: {', '.join(movie.cast[:3])}{'...' if len(movie.cast) > 3 else ''}")
     if movie.plot:
@@ -35,10 +45,92 @@ def print_movie(movie):
         print(f"🌐 URL: {movie.url}")
 
 
+def run_catalog(args):
+    """Bulk load exported movies into the local catalog and/or query it."""
+    catalog = MovieCatalog()
+    try:
+        if args.catalog_import:
+            count = catalog.upsert_many(Movie.from_dict(json.loads(line))
+                                        for line in iter_input(args.catalog_import))
+            print(f"Catalogued {count} movies ({len(catalog)} in {catalog.catalog_file})",
+                  file=sys.stderr)
+
+        if args.by_director:
+            movies = catalog.by_director(args.by_director, args.limit)
+        elif args.top_rated is not None:
+            year_from, _, year_to = (args.years or "").partition("-")
+            movies = catalog.top_rated(args.top_rated or None, int(year_from) if year_from else None,
+                                       int(year_to) if year_to else None, limit=args.limit)
+        else:
+            return
+
+        if args.json:
+            print(json.dumps([movie.to_dict() for movie in movies], indent=2))
+        else:
+            for movie in movies:
+                rating = f"  ⭐ {movie.rating}" if movie.rating is not None else ""
+                print(f"{movie.imdb_id}  {movie.title} ({movie.year or '?'}){rating}")
+    finally:
+        catalog.close()
+
+
+def run_export(scraper, args):
+    """Look up every input line, streaming movies and failures to separate outputs.
+
+    Runs writing JSONL or CSV to a file keep a checkpoint next to the output
+    and resume from it when restarted; the checkpoint is removed once the
+    whole input has been processed with no transient failures left to retry.
+    """
+    fmt = args.format or format_for_path(args.output)
+    fields = movie_fields(name.strip() for name in args.fields.split(",")) if args.fields else None
+    to_file = args.output not in (None, "-")
+    resumable = fmt in ("jsonl", "csv")
+    if args.checkpoint and not resumable:
+        raise ValueError(f"{fmt} output cannot be resumed, --checkpoint needs jsonl or csv")
+
+    checkpoint_path = args.checkpoint or (f"{args.output}.checkpoint" if to_file and resumable else None)
+    checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+    resuming = checkpoint is not None and bool(checkpoint.done or checkpoint.retry)
+    if resuming:
+        print(f"Resuming: {len(checkpoint.done)} items already done, "
+              f"{len(checkpoint.retry)} to retry after transient failures", file=sys.stderr)
+
+    total = None
+    if args.input != "-":
+        total = max(count_lines(args.input) - (len(checkpoint.done) if checkpoint else 0), 0)
+    progress = Progress(total)
+
+    failures_path = args.failures or (f"{args.output}.failures.jsonl" if to_file else None)
+    failures = open(failures_path, "a" if resuming else "w", encoding="utf-8") \
+        if failures_path else sys.stderr
+
+    completed = False
+    try:
+        with open_writer(args.output, fmt, args.row_group_size, append=resuming,
+                         fields=fields) as writer:
+            succeeded, failed, retryable = run_batch(scraper, iter_input(args.input), writer,
+                                                     failures, checkpoint, args.workers,
+                                                     progress, fields)
+        completed = True
+    finally:
+        progress.finish()
+        if failures is not sys.stderr:
+            failures.close()
+        if checkpoint is not None:
+            checkpoint.close(completed=completed)
+
+    print(f"Exported {succeeded} movies, {failed} failed"
+          + (f" (see {failures_path})" if failures_path and failed else ""), file=sys.stderr)
+    if retryable:
+        print(f"{retryable} failed transiently"
+              + (", rerun the same command to retry them" if checkpoint is not None else ""),
+              file=sys.stderr)
+
+
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(description="IMDb Movie Scraper")
-    parser.add_argument("movie", help="Movie title to search for")
+    parser.add_argument("movie", nargs="?", help="Movie title to search for")
     parser.add_argument(
         "--json",
         action="store_true",
@@ -49,14 +141,151 @@ def main():
         action="store_true",
         help="Only show search results, don't fetch full movie details"
     )
+    parser.add_argument(
+        "--fields",
+        metavar="NAMES",
+        help="Comma-separated movie fields to fetch and show (or export with --input), "
+             "e.g. title,year (the title page is skipped when the search result has them all)"
+    )
+    parser.add_argument(
+        "--ingest",
+        metavar="DIR",
+        help="Build the local title index from IMDb TSV datasets (*.tsv.gz) in DIR"
+    )
+    parser.add_argument(
+        "--local-first",
+        action="store_true",
+        help="Answer from the local title index and scrape only plot and cast"
+    )
+
+    parser.add_argument(
+        "--input",
+        metavar="FILE",
+        help="Look up every line (title or IMDb ID) of FILE, or stdin for '-', and export the results"
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        help="Export destination (default: stdout)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        help="Export format (default: from the --output extension, else jsonl)"
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=EXPORT_ROW_GROUP_SIZE,
+        help="Movies per Parquet row group / Arrow record batch"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=BATCH_MAX_WORKERS,
+        help="Concurrent lookups for --input"
+    )
+    parser.add_argument(
+        "--failures",
+        metavar="FILE",
+        help="Where --input failures go as JSON lines (default: OUTPUT.failures.jsonl, else stderr)"
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="FILE",
+        help="Progress file for resuming an interrupted --input run (default: OUTPUT.checkpoint)"
+    )
+    parser.add_argument(
+        "--catalog-import",
+        metavar="FILE",
+        help="Bulk load movies from a JSONL export (or stdin for '-') into the local catalog"
+    )
+    parser.add_argument(
+        "--by-director",
+        metavar="NAME",
+        help="List catalogued movies by a director, newest first"
+    )
+    parser.add_argument(
+        "--top-rated",
+        nargs="?",
+        const="",
+        metavar="GENRE",
+        help="List the best rated catalogued movies, optionally in GENRE"
+    )
+    parser.add_argument(
+        "--years",
+        metavar="FROM-TO",
+        help="Release years for --top-rated, e.g. 1990-1999, 2000- or -1980"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=CATALOG_QUERY_LIMIT,
+        help="Most movies listed by catalog queries"
+    )
+    parser.add_argument(
+        "--base-url",
+        default=IMDB_BASE_URL,
+        help="IMDb site root, e.g. a local stub server for testing"
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Record per-stage timings and counters and print them to stderr as JSON on exit"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        metavar="PORT",
+        help="Record metrics and serve them in Prometheus text format on PORT while running"
+    )
 
     args = parser.parse_args()
 
-    if not args.movie or not args.movie.strip():
+    if args.stats or args.metrics_port is not None:
+        metrics.enable()
+    if args.metrics_port is not None:
+        start_metrics_server(args.metrics_port)
+
+    if args.ingest:
+        index = TitleIndex()
+        counts = index.ingest(args.ingest)
+        for name, rows in counts.items():
+            skipped = f" ({index.skipped[name]} malformed, skipped)" if index.skipped.get(name) else ""
+            print(f"{name}: {rows} rows{skipped}")
+        print(f"Indexed {len(index)} titles in {index.index_file}")
+        index.close()
+        if not args.movie and not args.input:
+            return
+
+    if args.catalog_import or args.by_director or args.top_rated is not None:
+        try:
+            run_catalog(args)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        if not args.movie and not args.input:
+            return
+
+    if not args.input and (not args.movie or not args.movie.strip()):
         print("Error: Please provide a movie title to search for.")
         sys.exit(1)
 
-    scraper = IMDbScraper()
+    scraper = IMDbScraper(base_url=args.base_url,
+                          title_index=TitleIndex(base_url=args.base_url) if args.local_first else None)
+    if args.stats:
+        atexit.register(lambda: print(json.dumps(scraper.stats(), indent=2), file=sys.stderr))
+
+    if args.input:
+        try:
+            run_export(scraper, args)
+        except KeyboardInterrupt:
+            print("\nOperation cancelled by user.", file=sys.stderr)
+            sys.exit(1)
+        except (ImportError, OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
 
     try:
         if args.search_only:
@@ -82,13 +311,21 @@ def main():
 
         else:
             # Get full movie details
-            movie = scraper.search_and_get_movie(args.movie)
+            fields = [name.strip() for name in args.fields.split(",")] if args.fields else None
+            movie = scraper.search_and_get_movie(args.movie, fields)
             if not movie:
                 print(f"No movie found for: {args.movie}")
                 print("Try using --search-only to see available search results.")
                 sys.exit(1)
 
-            if args.json:
+            if fields:
+                values = {name: getattr(movie, name) for name in fields}
+                if args.json:
+                    print(json.dumps(values, indent=2, default=str))
+                else:
+                    for name, value in values.items():
+                        print(f"{name}: {', '.join(value) if isinstance(value, list) else value}")
+            elif args.json:
                 print(json.dumps(movie.to_dict(), indent=2))
             else:
                 print_movie(movie)
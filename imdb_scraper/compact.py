@@ -0,0 +1,340 @@
+"""Memory-compact Movie and SearchResult representations for large batches.
+
+Movie and SearchResult are validated dataclasses with a __dict__, list fields
+and a datetime per instance. The classes here hold the same data for movies
+that were already validated once (parsed pages, cache entries):
+
+- CompactMovie / CompactSearchResult use __slots__, tuples of interned
+  strings and a float timestamp instead of a datetime.
+- MovieBatch stores movies column by column, with years, ratings, IDs and
+  timestamps in typed arrays, and hands out zero-copy row views.
+"""
+
+import math
+import sys
+from array import array
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .config import IMDB_BASE_URL
+from .models import Movie, SearchResult
+
+_TITLE_URL = f"{IMDB_BASE_URL}/title/"
+
+# One shared tuple per distinct genre combination; credits are mostly unique per movie
+_tuples: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+def intern_tuple(values: Iterable[str], share: bool = False) -> Tuple[str, ...]:
+    """Get a tuple of interned strings.
+
+    Args:
+        values: Strings such as a movie's genres or cast
+        share: If True, return one process-wide tuple per distinct combination
+    """
+    key = tuple(sys.intern(value) for value in values)
+    return _tuples.setdefault(key, key) if share else key
+
+
+def _url_or_none(url: Optional[str], imdb_id: Optional[str]) -> Optional[str]:
+    """Drop URLs that can be rebuilt from the IMDb ID."""
+    return None if imdb_id and url == f"{_TITLE_URL}{imdb_id}/" else url
+
+
+def _url_for(url: Optional[str], imdb_id: Optional[str]) -> Optional[str]:
+    return url if url is not None or not imdb_id else f"{_TITLE_URL}{imdb_id}/"
+
+
+class CompactMovie:
+    """Slotted, unvalidated Movie with interned strings and tuple fields."""
+
+    __slots__ = ("title", "year", "rating", "runtime", "genres", "director", "cast", "plot",
+                 "imdb_id", "_url", "writers", "poster_url", "_scraped_at")
+
+    def __init__(self, title: str, year: Optional[int] = None, rating: Optional[float] = None,
+                 runtime: Optional[str] = None, genres: Sequence[str] = (),
+                 director: Optional[str] = None, cast: Sequence[str] = (),
+                 plot: Optional[str] = None, imdb_id: Optional[str] = None,
+                 url: Optional[str] = None, writers: Sequence[str] = (),
+                 poster_url: Optional[str] = None, scraped_at: Optional[datetime] = None):
+        self.title = title
+        self.year = year
+        self.rating = rating
+        self.runtime = _intern(runtime)
+        self.genres = intern_tuple(genres, share=True)
+        self.director = _intern(director)
+        self.cast = intern_tuple(cast)
+        self.plot = plot
+        self.imdb_id = imdb_id
+        self._url = _url_or_none(url, imdb_id)
+        self.writers = intern_tuple(writers)
+        self.poster_url = poster_url
+        self._scraped_at = (scraped_at or datetime.now()).timestamp()
+
+    @property
+    def url(self) -> Optional[str]:
+        return _url_for(self._url, self.imdb_id)
+
+    @property
+    def scraped_at(self) -> datetime:
+        return datetime.fromtimestamp(self._scraped_at)
+
+    @classmethod
+    def from_movie(cls, movie: Movie) -> "CompactMovie":
+        """Convert a validated Movie."""
+        return cls(movie.title, movie.year, movie.rating, movie.runtime, movie.genres,
+                   movie.director, movie.cast, movie.plot, movie.imdb_id, movie.url,
+                   movie.writers, movie.poster_url, movie.scraped_at)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CompactMovie":
+        """Create from a Movie.to_dict() dictionary without re-validating it."""
+        data = dict(data)
+        if isinstance(data.get("scraped_at"), str):
+            data["scraped_at"] = datetime.fromisoformat(data["scraped_at"])
+        return cls(**data)
+
+    def to_movie(self) -> Movie:
+        """Convert back to a (validated) Movie."""
+        return Movie(**self._fields())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the same dictionary as Movie.to_dict()."""
+        data = self._fields()
+        data["scraped_at"] = data["scraped_at"].isoformat()
+        return data
+
+    def _fields(self) -> Dict[str, Any]:
+        return {
+            "title": self.title,
+            "year": self.year,
+            "rating": self.rating,
+            "runtime": self.runtime,
+            "genres": list(self.genres),
+            "director": self.director,
+            "cast": list(self.cast),
+            "plot": self.plot,
+            "imdb_id": self.imdb_id,
+            "url": self.url,
+            "writers": list(self.writers),
+            "poster_url": self.poster_url,
+            "scraped_at": self.scraped_at,
+        }
+
+    def __repr__(self) -> str:
+        return f"CompactMovie(title={self.title!r}, year={self.year!r}, imdb_id={self.imdb_id!r})"
+
+
+class CompactSearchResult:
+    """Slotted SearchResult."""
+
+    __slots__ = ("title", "year", "imdb_id", "_url", "relevance_score")
+
+    def __init__(self, title: str, year: Optional[int] = None, imdb_id: Optional[str] = None,
+                 url: Optional[str] = None, relevance_score: float = 0.0):
+        self.title = title
+        self.year = year
+        self.imdb_id = imdb_id
+        self._url = _url_or_none(url, imdb_id)
+        self.relevance_score = relevance_score
+
+    @property
+    def url(self) -> Optional[str]:
+        return _url_for(self._url, self.imdb_id)
+
+    @classmethod
+    def from_result(cls, result: SearchResult) -> "CompactSearchResult":
+        """Convert a SearchResult."""
+        return cls(result.title, result.year, result.imdb_id, result.url, result.relevance_score)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the same dictionary as SearchResult.to_dict()."""
+        return {
+            "title": self.title,
+            "year": self.year,
+            "imdb_id": self.imdb_id,
+            "url": self.url,
+            "relevance_score": self.relevance_score,
+        }
+
+    def __repr__(self) -> str:
+        return f"CompactSearchResult(title={self.title!r}, imdb_id={self.imdb_id!r})"
+
+
+def _id_number(imdb_id: Optional[str]) -> int:
+    if imdb_id and imdb_id.startswith("tt") and imdb_id[2:].isdigit():
+        return int(imdb_id[2:])
+    return 0
+
+
+class MovieRow:
+    """Zero-copy view of one row of a MovieBatch."""
+
+    __slots__ = ("_batch", "_row")
+
+    def __init__(self, batch: "MovieBatch", row: int):
+        self._batch = batch
+        self._row = row
+
+    @property
+    def imdb_id(self) -> Optional[str]:
+        number = self._batch._ids[self._row]
+        return f"tt{number:07d}" if number else None
+
+    @property
+    def title(self) -> str:
+        return self._batch._titles[self._row]
+
+    @property
+    def year(self) -> Optional[int]:
+        return self._batch._years[self._row] or None
+
+    @property
+    def rating(self) -> Optional[float]:
+        rating = self._batch._ratings[self._row]
+        return None if math.isnan(rating) else round(rating, 1)
+
+    @property
+    def runtime(self) -> Optional[str]:
+        return self._batch._runtimes[self._row]
+
+    @property
+    def genres(self) -> Tuple[str, ...]:
+        return self._batch._genres[self._row]
+
+    @property
+    def director(self) -> Optional[str]:
+        return self._batch._directors[self._row]
+
+    @property
+    def cast(self) -> Tuple[str, ...]:
+        return self._batch._cast[self._row]
+
+    @property
+    def plot(self) -> Optional[str]:
+        return self._batch._plots[self._row]
+
+    @property
+    def url(self) -> Optional[str]:
+        return _url_for(self._batch._urls[self._row], self.imdb_id)
+
+    @property
+    def writers(self) -> Tuple[str, ...]:
+        return self._batch._writers[self._row]
+
+    @property
+    def poster_url(self) -> Optional[str]:
+        return self._batch._posters[self._row]
+
+    @property
+    def scraped_at(self) -> datetime:
+        return datetime.fromtimestamp(self._batch._scraped_at[self._row])
+
+    def to_movie(self) -> Movie:
+        """Materialize the row as a Movie."""
+        return Movie(
+            title=self.title, year=self.year, rating=self.rating, runtime=self.runtime,
+            genres=list(self.genres), director=self.director, cast=list(self.cast),
+            plot=self.plot, imdb_id=self.imdb_id, url=self.url, writers=list(self.writers),
+            poster_url=self.poster_url, scraped_at=self.scraped_at,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the same dictionary as Movie.to_dict()."""
+        return self.to_movie().to_dict()
+
+    def __repr__(self) -> str:
+        return f"MovieRow({self._row}, title={self.title!r}, imdb_id={self.imdb_id!r})"
+
+
+class MovieBatch:
+    """Columnar container for many movies.
+
+    IMDb ID numbers, years, ratings and timestamps live in typed arrays
+    (4, 2, 4 and 8 bytes per movie); strings are interned and list fields are
+    shared tuples. Indexing returns a MovieRow view that reads the columns in
+    place, and numeric columns are exposed as memoryviews (or NumPy arrays
+    via as_numpy) without copying.
+    """
+
+    NUMERIC_COLUMNS = ("ids", "years", "ratings", "scraped_at")
+
+    def __init__(self, movies: Iterable[Movie] = ()):
+        """Initialize a batch.
+
+        Args:
+            movies: Movies (or CompactMovie / MovieRow objects) to append
+        """
+        self._ids = array("I")
+        self._years = array("H")  # 0 = unknown
+        self._ratings = array("f")  # NaN = unknown
+        self._scraped_at = array("d")
+        self._titles: List[str] = []
+        self._runtimes: List[Optional[str]] = []
+        self._genres: List[Tuple[str, ...]] = []
+        self._directors: List[Optional[str]] = []
+        self._cast: List[Tuple[str, ...]] = []
+        self._plots: List[Optional[str]] = []
+        self._urls: List[Optional[str]] = []
+        self._writers: List[Tuple[str, ...]] = []
+        self._posters: List[Optional[str]] = []
+        self.extend(movies)
+
+    def append(self, movie: Any) -> None:
+        """Append a Movie, CompactMovie or MovieRow."""
+        self._ids.append(_id_number(movie.imdb_id))
+        self._years.append(movie.year or 0)
+        self._ratings.append(movie.rating if movie.rating is not None else math.nan)
+        self._scraped_at.append(movie.scraped_at.timestamp())
+        self._titles.append(movie.title)
+        self._runtimes.append(_intern(movie.runtime))
+        self._genres.append(intern_tuple(movie.genres, share=True))
+        self._directors.append(_intern(movie.director))
+        self._cast.append(intern_tuple(movie.cast))
+        self._plots.append(movie.plot)
+        self._urls.append(_url_or_none(movie.url, movie.imdb_id))
+        self._writers.append(intern_tuple(movie.writers))
+        self._posters.append(movie.poster_url)
+
+    def extend(self, movies: Iterable[Any]) -> None:
+        """Append many movies."""
+        for movie in movies:
+            self.append(movie)
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def __getitem__(self, row: int) -> MovieRow:
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("MovieBatch index out of range")
+        return MovieRow(self, row)
+
+    def __iter__(self) -> Iterator[MovieRow]:
+        for row in range(len(self)):
+            yield MovieRow(self, row)
+
+    def column(self, name: str) -> memoryview:
+        """Get a zero-copy view of a numeric column.
+
+        Args:
+            name: "ids", "years", "ratings" or "scraped_at"
+        """
+        if name not in self.NUMERIC_COLUMNS:
+            raise ValueError(f"Not a numeric column: {name}")
+        return memoryview(getattr(self, f"_{name}"))
+
+    def as_numpy(self, name: str) -> Any:
+        """Get a numeric column as a NumPy array sharing the batch's memory.
+
+        While the array (or a column() view) is alive the batch cannot grow:
+        appending raises BufferError rather than reallocating shared memory.
+        """
+        import numpy as np  # Optional dependency, only needed for this method
+
+        return np.frombuffer(self.column(name), dtype=getattr(self, f"_{name}").typecode)
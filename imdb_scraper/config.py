@@ -13,8 +13,11 @@ REQUEST_HEADERS = {
 }
 
 REQUEST_TIMEOUT = 10  # seconds
+MAX_RESPONSE_BYTES = 10 * 1024 * 1024  # largest decompressed page accepted
+STREAM_CHUNK_SIZE = 64 * 1024  # bytes read per step of a streamed download
 MAX_RETRIES = 3
-RETRY_DELAY = 1  # seconds, will be multiplied by attempt number
+RETRY_DELAY = 1  # seconds, base of the jittered exponential retry backoff
+RETRY_MAX_DELAY = 30  # seconds, cap on a single retry backoff
 
 # IMDb URLs
 IMDB_BASE_URL = "https://www.imdb.com"
@@ -33,6 +36,44 @@ MOVIE_SELECTORS = {
     "plot": "p[data-testid='plot'] span[data-testid='plot-xl']",
 }
 
+# HTML parser for the selector fallback path: "html.parser", "lxml" or "selectolax"
+HTML_PARSER = "html.parser"
+
+# Embedded-JSON extraction specs (see extract.py). Each field lists fallback paths into
+# the page's pageProps, tried in order. Path steps are dict keys, list indexes, "*" for
+# every list item, or "[sub.path=Value]" for list items whose sub.path equals Value.
+MAX_CAST = 5  # cast members kept per movie, None keeps the full cast
+MAX_WRITERS = 5
+
+MOVIE_JSON_FIELDS = {
+    "title": {"paths": ["aboveTheFoldData.titleText.text"], "coerce": "str"},
+    "year": {"paths": ["aboveTheFoldData.releaseYear.year"], "coerce": "int"},
+    "rating": {"paths": ["aboveTheFoldData.ratingsSummary.aggregateRating"], "coerce": "float"},
+    "runtime": {"paths": ["aboveTheFoldData.runtime.displayableProperty.value.plainText"]},
+    "genres": {"paths": ["aboveTheFoldData.genres.genres.*.text"], "many": True},
+    "director": {"paths": [
+        "mainColumnData.crewV2.[grouping.text=Director].credits.0.name.nameText.text",
+        "aboveTheFoldData.principalCredits.[category.text=Director].credits.0.name.nameText.text",
+        "aboveTheFoldData.directorsPageTitle.0.name.nameText.text",
+    ]},
+    "writers": {"paths": [
+        "mainColumnData.crewV2.[grouping.text=Writers].credits.*.name.nameText.text",
+        "aboveTheFoldData.principalCredits.[category.text=Writers].credits.*.name.nameText.text",
+    ], "many": True, "limit": MAX_WRITERS},
+    "cast": {"paths": ["aboveTheFoldData.castPageTitle.edges.*.node.name.nameText.text"],
+             "many": True, "limit": MAX_CAST},
+    "plot": {"paths": ["aboveTheFoldData.plot.plotText.plainText"], "coerce": "str"},
+    "poster_url": {"paths": ["aboveTheFoldData.primaryImage.url"]},
+}
+
+# Applied to each item under SEARCH_JSON_ROOT of a /find/ page's pageProps
+SEARCH_JSON_ROOT = "titleResults.results.*"
+SEARCH_JSON_FIELDS = {
+    "title": {"paths": ["titleNameText"], "coerce": "str"},
+    "year": {"paths": ["titleReleaseText"], "coerce": "year"},
+    "imdb_id": {"paths": ["id"]},
+}
+
 # Search result selectors
 SEARCH_SELECTORS = {
     "results": "section[data-testid='find-results-section'] ul li",
@@ -42,8 +83,71 @@ SEARCH_SELECTORS = {
 }
 
 # Rate limiting
-MIN_REQUEST_DELAY = 0.5  # seconds between requests
-MAX_REQUEST_DELAY = 2.0  # maximum delay
+MIN_REQUEST_DELAY = 0.5  # seconds between requests at the starting rate
+MAX_REQUEST_DELAY = 2.0  # slowest pace the adaptive limiter backs off to
+RATE_LIMIT_BURST = 1  # requests that may be sent back to back after an idle period
+ADAPTIVE_MAX_RATE = 5.0  # requests/s ceiling reached while responses stay clean
+RATE_INCREASE_STEP = 0.05  # requests/s added per clean response (additive increase)
+RATE_BACKOFF_FACTOR = 0.5  # rate multiplier on a throttling response (multiplicative decrease)
+RATE_BACKOFF_COOLDOWN = 2.0  # seconds during which further throttles don't cut the rate again
+THROTTLE_STATUSES = (429, 503)
+
+# Batch lookups
+BATCH_MAX_WORKERS = 4
+ASYNC_POOL_SIZE = 100  # pooled connections for AsyncIMDbScraper
+ASYNC_BLOCKING_WORKERS = 4  # threads running AsyncIMDbScraper's cache, history and parsing calls
+
+# Response cache
+CACHE_FILE = "response_cache.sqlite3"
+CACHE_MAX_BYTES = 50 * 1024 * 1024  # compressed bytes on disk
+SEARCH_CACHE_TTL = 60 * 60  # seconds, /find/ pages change often
+TITLE_CACHE_TTL = 7 * 24 * 60 * 60  # seconds, /title/ pages rarely change
+MOVIE_CACHE_TTL = 24 * 60 * 60  # seconds a parsed Movie is served without re-parsing
+NEGATIVE_CACHE_TTL = 60 * 60  # seconds a failed query is answered without hitting IMDb
+STALE_WHILE_REVALIDATE = False  # serve expired movies at once and refresh them in the background
+
+# Local catalog of every movie fetched, queryable by director, cast, genre and year
+CATALOG_FILE = "movie_catalog.sqlite3"
+CATALOG_UPSERT_CHUNK = 1000  # movies written per transaction by bulk upserts
+CATALOG_QUERY_LIMIT = 50  # default number of movies a catalog query returns
+
+# Streamlit app
+APP_MEMO_TTL = 10 * 60  # seconds a found movie is memoized per query across sessions
+APP_MEMO_ENTRIES = 1000  # memoized queries kept per server process
+WARM_ENABLED = True  # keep the movies behind popular / recent queries cached in the app
+WARM_INTERVAL = 5 * 60  # seconds between cache warming cycles
+WARM_TOP_N = 50  # most popular queries kept warm
+WARM_RECENT_N = 20  # most recent queries kept warm
+WARM_REQUEST_BUDGET = 30  # requests a warming cycle may make
+WARM_REFRESH_AHEAD = 60 * 60  # seconds before expiry a cached movie is refreshed
+
+# Search history
+HISTORY_COMPACT_EVERY = 1000  # logged searches before the event log is folded into the snapshot
+
+# Offline title index built from the IMDb TSV datasets (https://datasets.imdbws.com/)
+TITLE_INDEX_FILE = "title_index.sqlite3"
+INGEST_CHUNK_SIZE = 50_000  # TSV rows written per transaction
+INGEST_TITLE_TYPES = ("movie",)  # title.basics titleType values kept, matches the ttype=ft search
+LOCAL_SCRAPED_FIELDS = ("plot", "cast")  # fields the datasets lack, scraped in local-first mode
+
+# Fuzzy title matching
+FUZZY_MATCH_THRESHOLD = 0.85  # minimum trigram Dice similarity to answer a query locally
+FUZZY_LENGTH_RATIO = 0.8  # local answers need trigram sets of similar size (no "alien" -> "aliens")
+FUZZY_MAX_EDITS = 2  # typos (Damerau-Levenshtein edits) a locally answered query may contain...
+FUZZY_CHARS_PER_EDIT = 5  # ...at most one per this many characters ("matrx" 1, "bing" none)
+FUZZY_MIN_SCORE = 0.5  # minimum similarity for a scraped title to be accepted as a match
+
+# Batch runs
+BATCH_PROGRESS_INTERVAL = 1.0  # seconds between progress lines
+
+# Export
+EXPORT_ROW_GROUP_SIZE = 10_000  # movies per Parquet row group / Arrow record batch
+CSV_LIST_SEPARATOR = "|"  # joins genres, writers and cast in CSV exports
+
+# Instrumentation (see metrics.py)
+METRICS_ENABLED = False  # record per-stage latencies and counters
+METRICS_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0)  # histogram bucket upper bounds, seconds
 
 # Data validation
 MAX_TITLE_LENGTH = 200
@@ -0,0 +1,281 @@
+"""Streaming export of movies to JSONL, CSV, Parquet and Arrow."""
+
+import csv
+import json
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .config import EXPORT_ROW_GROUP_SIZE, CSV_LIST_SEPARATOR
+from .models import Movie
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
+EXPORT_FORMATS = ("jsonl", "csv", "parquet", "arrow")
+EXPORT_FIELDS = ("imdb_id", "title", "year", "rating", "runtime", "genres", "director",
+                 "writers", "cast", "plot", "url", "poster_url", "scraped_at")
+LIST_FIELDS = ("genres", "writers", "cast")
+
+
+def iter_input(source: str) -> Iterator[str]:
+    """Yield non-empty lines (queries or IMDb IDs) from a file, or stdin for "-"."""
+    stream = sys.stdin if source == "-" else open(source, "r", encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if line:
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def format_for_path(path: Optional[str]) -> str:
+    """Guess the export format from an output file extension (JSONL by default)."""
+    suffix = Path(path).suffix.lower().lstrip(".") if path and path != "-" else ""
+    if suffix in ("parquet", "pq"):
+        return "parquet"
+    if suffix in ("arrow", "feather", "ipc"):
+        return "arrow"
+    if suffix == "csv":
+        return "csv"
+    return "jsonl"
+
+
+class MovieWriter(ABC):
+    """Writes movies one at a time to a file or stdout; subclasses implement _write."""
+
+    binary = False
+
+    def __init__(self, path: Optional[str] = None, append: bool = False,
+                 fields: Optional[Sequence[str]] = None):
+        """Open the output.
+
+        Args:
+            path: Output file, or None / "-" for stdout
+            append: Add to an existing file instead of truncating it
+            fields: Movie fields to write, in order (all of EXPORT_FIELDS if None)
+        """
+        self.fields = tuple(fields) if fields else None
+        self.columns = self.fields or EXPORT_FIELDS
+        self.to_stdout = path in (None, "-")
+        self.appending = append and not self.to_stdout and Path(path).exists() \
+            and Path(path).stat().st_size > 0
+        if self.to_stdout:
+            self.stream: IO = sys.stdout.buffer if self.binary else sys.stdout
+        else:
+            mode = ("a" if append else "w") + ("b" if self.binary else "")
+            self.stream = open(path, mode,
+                               **({} if self.binary else {"encoding": "utf-8", "newline": ""}))
+        self.rows = 0
+
+    def write(self, movie: Movie) -> None:
+        """Write one movie."""
+        self._write(movie)
+        self.rows += 1
+
+    def flush(self) -> None:
+        """Push written rows to the OS, so they survive the process being killed."""
+        self.stream.flush()
+
+    @abstractmethod
+    def _write(self, movie: Movie) -> None:
+        """Write one movie in the output format."""
+
+    def _row(self, movie: Movie) -> Dict[str, Any]:
+        """Get a movie's written fields as JSON-ready values.
+
+        Only these fields are read, so a LazyMovie from a fields= lookup is
+        not loaded in full.
+        """
+        if self.fields is None:
+            return movie.to_dict()
+        row = {name: getattr(movie, name) for name in self.fields}
+        if "scraped_at" in row:
+            row["scraped_at"] = row["scraped_at"].isoformat()
+        return row
+
+    def close(self) -> None:
+        """Flush buffered rows and close the output (stdout is only flushed)."""
+        if self.to_stdout:
+            self.stream.flush()
+        else:
+            self.stream.close()
+
+    def __enter__(self) -> "MovieWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class JSONLWriter(MovieWriter):
+    """One Movie.to_dict() JSON object per line."""
+
+    def _write(self, movie: Movie) -> None:
+        self.stream.write(json.dumps(self._row(movie), ensure_ascii=False) + "\n")
+
+
+class CSVWriter(MovieWriter):
+    """CSV with a header row; list fields are joined with CSV_LIST_SEPARATOR."""
+
+    def __init__(self, path: Optional[str] = None, append: bool = False,
+                 fields: Optional[Sequence[str]] = None):
+        super().__init__(path, append, fields)
+        self._writer = csv.DictWriter(self.stream, fieldnames=self.columns, extrasaction="ignore")
+        if not self.appending:
+            self._writer.writeheader()
+
+    def _write(self, movie: Movie) -> None:
+        row = self._row(movie)
+        for name in LIST_FIELDS:
+            if name in row:
+                row[name] = CSV_LIST_SEPARATOR.join(row[name])
+        self._writer.writerow(row)
+
+
+def arrow_schema() -> "pa.Schema":
+    """Get the Arrow schema of exported movies."""
+    return pa.schema([
+        ("imdb_id", pa.string()),
+        ("title", pa.string()),
+        ("year", pa.int16()),
+        ("rating", pa.float32()),
+        ("runtime", pa.string()),
+        ("genres", pa.list_(pa.string())),
+        ("director", pa.string()),
+        ("writers", pa.list_(pa.string())),
+        ("cast", pa.list_(pa.string())),
+        ("plot", pa.string()),
+        ("url", pa.string()),
+        ("poster_url", pa.string()),
+        ("scraped_at", pa.timestamp("us")),
+    ])
+
+
+class _ColumnarWriter(MovieWriter):
+    """Buffers up to row_group_size movies, then writes them as one record batch.
+
+    Subclasses implement _write_batch and _close_format for their file format.
+    """
+
+    binary = True
+
+    def __init__(self, path: Optional[str] = None, row_group_size: int = EXPORT_ROW_GROUP_SIZE,
+                 fields: Optional[Sequence[str]] = None):
+        if pa is None:
+            raise ImportError(f"{type(self).__name__} requires pyarrow: pip install pyarrow")
+        super().__init__(path, fields=fields)
+        self.row_group_size = row_group_size
+        schema = arrow_schema()
+        self.schema = pa.schema([schema.field(name) for name in self.columns])
+        self._buffer: List[Dict[str, Any]] = []
+
+    def _write(self, movie: Movie) -> None:
+        row = {name: getattr(movie, name) for name in self.columns}
+        self._buffer.append(row)
+        if len(self._buffer) >= self.row_group_size:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self._write_batch(pa.RecordBatch.from_pylist(self._buffer, schema=self.schema))
+            self._buffer = []
+
+    def flush(self) -> None:
+        pass  # Rows reach the file a row group at a time
+
+    @abstractmethod
+    def _write_batch(self, batch: "pa.RecordBatch") -> None:
+        """Write one buffered record batch."""
+
+    def close(self) -> None:
+        self._flush()
+        self._close_format()
+        super().close()
+
+    @abstractmethod
+    def _close_format(self) -> None:
+        """Finish the file (footer / end of stream) before the output is closed."""
+
+
+class ParquetWriter(_ColumnarWriter):
+    """Parquet file with one row group per row_group_size movies."""
+
+    def __init__(self, path: Optional[str] = None, row_group_size: int = EXPORT_ROW_GROUP_SIZE,
+                 fields: Optional[Sequence[str]] = None):
+        super().__init__(path, row_group_size, fields)
+        import pyarrow.parquet as pq
+
+        self._writer = pq.ParquetWriter(self.stream, self.schema)
+
+    def _write_batch(self, batch: "pa.RecordBatch") -> None:
+        self._writer.write_table(pa.Table.from_batches([batch]), row_group_size=self.row_group_size)
+
+    def _close_format(self) -> None:
+        self._writer.close()
+
+
+class ArrowWriter(_ColumnarWriter):
+    """Arrow IPC file (or IPC stream when writing to stdout)."""
+
+    def __init__(self, path: Optional[str] = None, row_group_size: int = EXPORT_ROW_GROUP_SIZE,
+                 fields: Optional[Sequence[str]] = None):
+        super().__init__(path, row_group_size, fields)
+        new_writer = pa.ipc.new_stream if self.to_stdout else pa.ipc.new_file
+        self._writer = new_writer(self.stream, self.schema)
+
+    def _write_batch(self, batch: "pa.RecordBatch") -> None:
+        self._writer.write_batch(batch)
+
+    def _close_format(self) -> None:
+        self._writer.close()
+
+
+def open_writer(path: Optional[str] = None, fmt: Optional[str] = None,
+                row_group_size: int = EXPORT_ROW_GROUP_SIZE, append: bool = False,
+                fields: Optional[Sequence[str]] = None) -> MovieWriter:
+    """Open a streaming movie writer.
+
+    Args:
+        path: Output file, or None / "-" for stdout
+        fmt: "jsonl", "csv", "parquet" or "arrow" (guessed from path if None)
+        row_group_size: Movies per Parquet row group / Arrow record batch
+        append: Add to an existing file (JSONL and CSV only)
+        fields: Movie fields to write, in order (all of EXPORT_FIELDS if None)
+
+    Returns:
+        The writer; use it as a context manager or call close()
+    """
+    fmt = fmt or format_for_path(path)
+    if fmt in ("parquet", "arrow") and append:
+        # The Parquet footer / Arrow file framing cannot be reopened
+        raise ValueError(f"Cannot append to an existing {fmt} file")
+    if fmt == "jsonl":
+        return JSONLWriter(path, append, fields)
+    if fmt == "csv":
+        return CSVWriter(path, append, fields)
+    if fmt == "parquet":
+        return ParquetWriter(path, row_group_size, fields)
+    if fmt == "arrow":
+        return ArrowWriter(path, row_group_size, fields)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def export_movies(movies: Iterable[Movie], writer: MovieWriter) -> int:
+    """Write movies as they arrive.
+
+    Args:
+        movies: Movies, e.g. streamed from IMDbScraper.get_many
+        writer: Open writer from open_writer()
+
+    Returns:
+        Number of movies written
+    """
+    for movie in movies:
+        writer.write(movie)
+    return writer.rows
@@ -0,0 +1,227 @@
+"""Declarative single-pass field extraction from IMDb's embedded JSON."""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .config import MOVIE_JSON_FIELDS, SEARCH_JSON_FIELDS, SEARCH_JSON_ROOT
+
+_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+
+
+def _to_year(value: Any) -> Optional[int]:
+    if isinstance(value, int):
+        return value
+    match = _YEAR_RE.search(str(value))
+    return int(match.group()) if match else None
+
+
+COERCIONS: Dict[str, Callable[[Any], Any]] = {
+    "str": lambda value: str(value).strip() or None,
+    "int": int,
+    "float": float,
+    "year": _to_year,
+}
+
+# A compiled path step: ("key", name), ("index", i), ("each", None) or ("filter", (path, value))
+Step = Tuple[str, Any]
+
+
+def _compile_path(path: str) -> Tuple[Step, ...]:
+    """Compile a dotted path such as "crewV2.[grouping.text=Director].credits.0"."""
+    steps: List[Step] = []
+    for part in re.findall(r'\[[^\]]*\]|[^.]+', path):
+        if part == "*":
+            steps.append(("each", None))
+        elif part.startswith("["):
+            sub_path, _, value = part[1:-1].partition("=")
+            steps.append(("filter", (tuple(sub_path.split(".")), value)))
+        elif part.isdigit():
+            steps.append(("index", int(part)))
+        else:
+            steps.append(("key", part))
+    return tuple(steps)
+
+
+def _lookup(value: Any, keys: Iterable[str]) -> Any:
+    """Follow plain dict keys, returning None if any is missing."""
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+class _Node:
+    """Trie node shared by every path passing through the same prefix."""
+
+    __slots__ = ("children", "targets", "fields")
+
+    def __init__(self):
+        self.children: Dict[Step, "_Node"] = {}
+        self.targets: List[Tuple[str, int]] = []  # (field, fallback priority)
+        self.fields: set = set()
+
+
+class _FieldSpec:
+    __slots__ = ("name", "many", "limit", "coerce")
+
+    def __init__(self, name: str, options: Dict[str, Any]):
+        self.name = name
+        self.many = options.get("many", False)
+        self.limit = options.get("limit")
+        self.coerce = COERCIONS[options["coerce"]] if options.get("coerce") else None
+
+
+class ExtractionSpec:
+    """Compiled field -> fallback-paths spec evaluated in a single JSON traversal.
+
+    All paths are merged into one trie, so shared prefixes are walked once no
+    matter how many fields hang off them, and adding a field only adds the
+    nodes unique to its paths.
+    """
+
+    def __init__(self, fields: Dict[str, Dict[str, Any]]):
+        """Compile an extraction spec.
+
+        Args:
+            fields: Field name -> {"paths": [...], "many": bool, "limit": int,
+                "coerce": "str" | "int" | "float" | "year"}
+        """
+        self.field_options = fields
+        self.fields = {name: _FieldSpec(name, options) for name, options in fields.items()}
+        self.root = _Node()
+        for name, options in fields.items():
+            for priority, path in enumerate(options["paths"]):
+                node = self.root
+                node.fields.add(name)
+                for step in _compile_path(path):
+                    node = node.children.setdefault(step, _Node())
+                    node.fields.add(name)
+                node.targets.append((name, priority))
+
+    def subset(self, names: Iterable[str]) -> "ExtractionSpec":
+        """Compile a spec restricted to some fields."""
+        return ExtractionSpec({name: self.field_options[name]
+                               for name in names if name in self.field_options})
+
+    def extract(self, data: Any) -> Dict[str, Any]:
+        """Extract every field from a JSON document.
+
+        Args:
+            data: Decoded JSON (typically a page's pageProps)
+
+        Returns:
+            Field name -> value; missing single fields are None, missing
+            list fields are []
+        """
+        found: Dict[Tuple[str, int], List[Any]] = {}
+        self._visit(data, self.root, found)
+
+        result: Dict[str, Any] = {}
+        for name, spec in self.fields.items():
+            values: List[Any] = []
+            for priority in range(len(self.field_options[name]["paths"])):
+                values = found.get((name, priority), [])
+                if values:
+                    break
+            if spec.many:
+                result[name] = values[:spec.limit] if spec.limit is not None else values
+            else:
+                result[name] = values[0] if values else None
+        return result
+
+    def extract_each(self, data: Any, root: str) -> List[Dict[str, Any]]:
+        """Extract fields from every item found under a root path.
+
+        Args:
+            data: Decoded JSON
+            root: Path to the items, e.g. "titleResults.results.*"
+
+        Returns:
+            One field dict per item
+        """
+        return [self.extract(item) for item in _iter_path(data, _compile_path(root))]
+
+    def _satisfied(self, name: str, found: Dict[Tuple[str, int], List[Any]]) -> bool:
+        """Check if a field's first-choice path already produced everything needed."""
+        values = found.get((name, 0))
+        if not values:
+            return False
+        spec = self.fields[name]
+        return not spec.many or (spec.limit is not None and len(values) >= spec.limit)
+
+    def _visit(self, value: Any, node: _Node, found: Dict[Tuple[str, int], List[Any]]) -> None:
+        if value is None:
+            return
+
+        for name, priority in node.targets:
+            result = value
+            coerce = self.fields[name].coerce
+            if coerce is not None:
+                try:
+                    result = coerce(value)
+                except (TypeError, ValueError):
+                    continue
+            if result is None or result == "" or isinstance(result, (dict, list)):
+                continue
+            found.setdefault((name, priority), []).append(result)
+
+        for step, child in node.children.items():
+            if all(self._satisfied(name, found) for name in child.fields):
+                continue
+            for item in _apply_step(value, step):
+                self._visit(item, child, found)
+
+
+def _apply_step(value: Any, step: Step) -> Iterable[Any]:
+    """Get the values one compiled path step leads to."""
+    kind, arg = step
+    if kind == "key":
+        if isinstance(value, dict) and arg in value:
+            return (value[arg],)
+    elif kind == "index":
+        if isinstance(value, list) and -len(value) <= arg < len(value):
+            return (value[arg],)
+    elif isinstance(value, list):
+        if kind == "each":
+            return value
+        sub_path, expected = arg
+        return [item for item in value if str(_lookup(item, sub_path)) == expected]
+    return ()
+
+
+def _iter_path(value: Any, steps: Tuple[Step, ...]) -> Iterable[Any]:
+    """Yield every value a compiled path leads to."""
+    if not steps:
+        yield value
+        return
+    for item in _apply_step(value, steps[0]):
+        yield from _iter_path(item, steps[1:])
+
+
+MOVIE_SPEC = ExtractionSpec(MOVIE_JSON_FIELDS)
+SEARCH_SPEC = ExtractionSpec(SEARCH_JSON_FIELDS)
+
+
+@lru_cache(maxsize=None)
+def _movie_subset_spec(names: Tuple[str, ...]) -> ExtractionSpec:
+    return MOVIE_SPEC.subset(names)
+
+
+def extract_movie_fields(page_props: Dict[str, Any],
+                         fields: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """Extract Movie fields from a /title/ page's pageProps.
+
+    Args:
+        page_props: Decoded pageProps
+        fields: Only extract these fields (all fields if None)
+    """
+    if fields is None:
+        return MOVIE_SPEC.extract(page_props)
+    return _movie_subset_spec(tuple(fields)).extract(page_props)
+
+
+def extract_search_items(page_props: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Extract one SearchResult field dict per result on a /find/ page."""
+    return SEARCH_SPEC.extract_each(page_props, SEARCH_JSON_ROOT)
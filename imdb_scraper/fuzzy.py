@@ -0,0 +1,374 @@
+"""Fuzzy title matching with a trigram inverted index."""
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from .config import (
+    IMDB_BASE_URL, FUZZY_MATCH_THRESHOLD, FUZZY_LENGTH_RATIO, FUZZY_MAX_EDITS, FUZZY_CHARS_PER_EDIT,
+    VALID_YEAR_RANGE
+)
+from .models import SearchResult
+
+_NON_WORD_RE = re.compile(r'[^0-9a-z]+')
+_LEADING_ARTICLE_RE = re.compile(r'^(the|a|an) (?=\S)')
+_YEAR_SUFFIX_RE = re.compile(r'^(.*\S)\s+\(?((?:18|19|20)\d{2})\)?$')
+
+YEAR_WEIGHT = 0.2  # share of the score decided by the release year when the query has one
+GRAMS_PER_EDIT = 4  # most word-padded trigrams one edit can change (a transposition)
+
+
+def fold_title(text: str) -> str:
+    """Fold accents, case and punctuation out of a title."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return _NON_WORD_RE.sub(' ', text.replace('&', ' and ')).strip()
+
+
+def normalize_title(text: str) -> str:
+    """Fold accents, case, punctuation and a leading article out of a title."""
+    return _LEADING_ARTICLE_RE.sub('', fold_title(text))
+
+
+def split_year(query: str) -> Tuple[str, Optional[int]]:
+    """Split a trailing release year off a query ("matrx 1999" -> ("matrx", 1999))."""
+    match = _YEAR_SUFFIX_RE.match(query.strip())
+    if match:
+        year = int(match.group(2))
+        if VALID_YEAR_RANGE[0] <= year <= VALID_YEAR_RANGE[1]:
+            return match.group(1), year
+    return query, None
+
+
+def trigrams(normalized: str) -> FrozenSet[str]:
+    """Get the word-padded trigrams of a normalized title."""
+    grams = set()
+    for word in normalized.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _text_score(shared: int, query_size: int, title_size: int) -> float:
+    """Blend query containment with Dice similarity.
+
+    Containment keeps a query that is a substring of a longer title scoring at
+    least 0.5; Dice prefers the title whose length is closest to the query.
+    """
+    if not query_size or not title_size:
+        return 0.0
+    return 0.5 * shared / query_size + shared / (query_size + title_size)
+
+
+def _min_shared(query_size: int, min_score: float, has_year: bool) -> int:
+    """Fewest shared trigrams that could still reach min_score (title size is at least shared)."""
+    for shared in range(1, query_size + 1):
+        bound = 0.5 * shared / query_size + shared / (query_size + shared)
+        if has_year:
+            bound = (1 - YEAR_WEIGHT) * bound + YEAR_WEIGHT
+        if bound >= min_score:
+            return shared
+    return query_size + 1
+
+
+def _number_penalty(query: str, title: str) -> float:
+    """Halve the score when the query names a number the title lacks ("matrix 2")."""
+    numbers = {token for token in query.split() if token.isdigit()}
+    return 0.5 if numbers - set(title.split()) else 1.0
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein distance (adjacent transpositions count once), capped at limit + 1."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, other in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char != other))
+            if i > 1 and j > 1 and char == b[j - 2] and a[i - 2] == other:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        before, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def _contained(a: str, b: str) -> bool:
+    return a in b or b in a
+
+
+def _numbers(text: str) -> FrozenSet[str]:
+    return frozenset(token for token in text.split() if token.isdigit())
+
+
+def _year_adjusted(score: float, query_year: Optional[int], year: Optional[int]) -> float:
+    if query_year is None:
+        return score
+    return (1 - YEAR_WEIGHT) * score + (YEAR_WEIGHT if year == query_year else 0.0)
+
+
+def title_similarity(query: str, title: str, year: Optional[int] = None) -> float:
+    """Score how well a title (and release year) matches a query.
+
+    Args:
+        query: User query, optionally ending in a release year
+        title: Candidate title
+        year: Candidate release year
+
+    Returns:
+        Similarity from 0.0 to 1.0
+    """
+    title = normalize_title(title)
+    title_grams = trigrams(title)
+    best = 0.0
+    for text, query_year in {(query, None), split_year(query)}:
+        text = normalize_title(text)
+        query_grams = trigrams(text)
+        score = _text_score(len(query_grams & title_grams), len(query_grams), len(title_grams))
+        score *= _number_penalty(text, title)
+        best = max(best, _year_adjusted(score, query_year, year))
+    return best
+
+
+class FuzzyTitleIndex:
+    """In-memory trigram inverted index over known titles and resolved queries.
+
+    Each entry maps a normalized title (or a past query that resolved to an
+    IMDb ID) to its trigrams. A lookup with a minimum score only needs to
+    share some trigram among the query's rarest ones with a candidate
+    (enough of them that any title reaching the score must contain one), so
+    common trigrams such as " ma" are never scanned.
+    """
+
+    def __init__(self, base_url: str = IMDB_BASE_URL):
+        """Initialize an empty index.
+
+        Args:
+            base_url: IMDb site root used to build result URLs
+        """
+        self.title_url = f"{base_url.rstrip('/')}/title/"
+        self._entries: List[Tuple[str, str, FrozenSet[str]]] = []  # (imdb_id, normalized, trigrams)
+        self._keys: Dict[Tuple[str, str], int] = {}  # (imdb_id, normalized) -> entry
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._years: Dict[str, Optional[int]] = {}
+        self._titles: Dict[str, str] = {}  # imdb_id -> canonical title
+        self._folded: Dict[str, str] = {}  # imdb_id -> canonical title folded, article kept
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, imdb_id: str, title: str, year: Optional[int] = None,
+            alias: bool = False) -> None:
+        """Index a title, or an alias (such as a past query) of a known title.
+
+        Args:
+            imdb_id: IMDb title ID
+            title: Title or alias text
+            year: Release year, if known
+            alias: If True, the text is not the canonical title
+        """
+        normalized = normalize_title(title)
+        grams = trigrams(normalized)
+        if not grams:
+            return
+        with self._lock:
+            if not alias or imdb_id not in self._titles:
+                self._titles[imdb_id] = title
+                self._folded[imdb_id] = fold_title(title)
+            if year is not None:
+                self._years[imdb_id] = year
+            if (imdb_id, normalized) in self._keys:
+                return
+            entry = len(self._entries)
+            self._keys[(imdb_id, normalized)] = entry
+            self._entries.append((imdb_id, normalized, grams))
+            for gram in grams:
+                self._postings[gram].append(entry)
+
+    def _score(self, query: str, min_score: float = 0.0) -> Dict[str, float]:
+        """Best score per IMDb ID for every candidate that can reach min_score."""
+        best: Dict[str, float] = {}
+        with self._lock:
+            for text, query_year in {(query, None), split_year(query)}:
+                text = normalize_title(text)
+                query_grams = trigrams(text)
+                needed = _min_shared(len(query_grams), min_score, query_year is not None)
+                if needed > len(query_grams):
+                    continue
+
+                rarest = sorted(query_grams, key=lambda gram: len(self._postings.get(gram, ())))
+                candidates = set()
+                for gram in rarest[:len(query_grams) - needed + 1]:
+                    candidates.update(self._postings.get(gram, ()))
+
+                for entry in candidates:
+                    imdb_id, normalized, grams = self._entries[entry]
+                    score = _text_score(len(grams & query_grams), len(query_grams), len(grams))
+                    score *= _number_penalty(text, normalized)
+                    score = _year_adjusted(score, query_year, self._years.get(imdb_id))
+                    if score > best.get(imdb_id, 0.0):
+                        best[imdb_id] = score
+        return best
+
+    def get(self, imdb_id: str) -> Optional[SearchResult]:
+        """Get the indexed title and year of an IMDb ID.
+
+        Returns:
+            A search result with relevance_score 1.0, or None if the ID is not indexed
+        """
+        with self._lock:
+            title = self._titles.get(imdb_id)
+            year = self._years.get(imdb_id)
+        if title is None:
+            return None
+        return SearchResult(title=title, year=year, imdb_id=imdb_id,
+                            url=f"{self.title_url}{imdb_id}/", relevance_score=1.0)
+
+    def search(self, query: str, limit: int = 5, min_score: float = 0.0) -> List[SearchResult]:
+        """Rank known titles by similarity to a query.
+
+        Args:
+            query: Title query, optionally ending in a release year
+            limit: Maximum number of results
+            min_score: Drop candidates scoring below this
+
+        Returns:
+            Search results sorted by relevance_score
+        """
+        scores = self._score(query, min_score)
+        ranked = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [
+            SearchResult(
+                title=self._titles[imdb_id],
+                year=self._years.get(imdb_id),
+                imdb_id=imdb_id,
+                url=f"{self.title_url}{imdb_id}/",
+                relevance_score=round(min(score, 1.0), 4),
+            )
+            for imdb_id, score in ranked
+            if score >= min_score
+        ]
+
+    def resolve(self, query: str, threshold: float = FUZZY_MATCH_THRESHOLD) -> Optional[str]:
+        """Get the IMDb ID of a near-exact match, answering the query without a search.
+
+        Unlike search(), which ranks titles that merely contain the query,
+        resolving needs a typo-level difference at most: the normalized query
+        equals an indexed title or alias, their trigram sets have a Dice
+        similarity of at least threshold and sizes within FUZZY_LENGTH_RATIO,
+        or they are within one edit per FUZZY_CHARS_PER_EDIT characters (up to
+        FUZZY_MAX_EDITS) and name the same numbers ("matrx", "teh matrix").
+        A query contained in the title or the other way round never resolves,
+        so "batman" does not resolve to Batman Begins, nor "alien" to Aliens.
+        A release year in the query must match the indexed year, if known.
+        """
+        with self._lock:
+            # Typos widen the candidate set a lot, so only look for them without a closer match
+            for typos in (False, True):
+                best = self._resolve_scores(query, threshold, typos)
+                if best:
+                    return max(best, key=best.get)
+        return None
+
+    def _resolve_scores(self, query: str, threshold: float, typos: bool) -> Dict[str, float]:
+        """Score the candidates resolve() accepts, with or without typos. Caller holds the lock."""
+        best: Dict[str, float] = {}
+        for raw, query_year in {(query, None), split_year(query)}:
+            folded = fold_title(raw)
+            text = _LEADING_ARTICLE_RE.sub('', folded)
+            query_grams = trigrams(text)
+            if not query_grams:
+                continue
+            edits = min(FUZZY_MAX_EDITS, len(text) // FUZZY_CHARS_PER_EDIT) if typos else 0
+            if typos and not edits:
+                continue
+            # Dice >= threshold needs shared >= threshold * q / (2 - threshold) even for
+            # t == shared; a typo changes at most GRAMS_PER_EDIT of the query's trigrams
+            needed = math.ceil(threshold * len(query_grams) / (2 - threshold))
+            if typos:
+                needed = min(needed, len(query_grams) - GRAMS_PER_EDIT * edits)
+            needed = max(needed, 1)
+            rarest = sorted(query_grams, key=lambda gram: len(self._postings.get(gram, ())))
+            candidates = set()
+            for gram in rarest[:len(query_grams) - needed + 1]:
+                candidates.update(self._postings.get(gram, ()))
+
+            for entry in candidates:
+                imdb_id, normalized, grams = self._entries[entry]
+                if query_year is not None and self._years.get(imdb_id) not in (None, query_year):
+                    continue
+                canonical = self._folded[imdb_id]
+                if normalized == text:
+                    score = 1.0
+                elif _contained(text, normalized) and _contained(folded, canonical):
+                    continue  # A shorter or longer title, not a typo ("batman" / Batman Begins)
+                else:
+                    score = self._near_match_score(text, folded, query_grams, edits,
+                                                   normalized, canonical, grams, threshold)
+                if score is not None and score > best.get(imdb_id, 0.0):
+                    best[imdb_id] = score
+        return best
+
+    @staticmethod
+    def _near_match_score(text: str, folded: str, query_grams: FrozenSet[str], edits: int,
+                          normalized: str, canonical: str, grams: FrozenSet[str],
+                          threshold: float) -> Optional[float]:
+        """Score a candidate that differs from the query, or None if it is more than a typo away.
+
+        Args:
+            text: Normalized query
+            folded: Query folded with its leading article kept
+            query_grams: Trigrams of text
+            edits: Typos the query may contain
+            normalized: Normalized candidate title or alias
+            canonical: Candidate's canonical title folded with its leading article kept
+            grams: Trigrams of normalized
+            threshold: Minimum trigram Dice similarity
+        """
+        shared = len(grams & query_grams)
+        smaller, larger = sorted((len(grams), len(query_grams)))
+        if smaller >= FUZZY_LENGTH_RATIO * larger:
+            score = 2 * shared / (len(grams) + len(query_grams))
+            score *= _number_penalty(text, normalized)
+            if score >= threshold:
+                return score
+        # An edit changes at most GRAMS_PER_EDIT trigrams of the title it is made to
+        if not edits or shared < len(grams) - GRAMS_PER_EDIT * edits:
+            return None
+        if _numbers(text) != _numbers(normalized):
+            return None
+        # Compare with leading articles kept too, so "teh matrix" is one edit from "the matrix"
+        distance = min(edit_distance(text, normalized, edits),
+                       edit_distance(folded, canonical, edits))
+        if distance > edits:
+            return None
+        return 1.0 - distance / max(len(text), len(normalized))
+
+    @classmethod
+    def build(cls, movies: Iterable[Tuple[str, str, Optional[int]]] = (),
+              resolved_queries: Iterable[Tuple[str, str]] = (),
+              base_url: str = IMDB_BASE_URL) -> "FuzzyTitleIndex":
+        """Build an index from known movies and past query resolutions.
+
+        Args:
+            movies: (imdb_id, title, year) tuples, e.g. from MovieCache.titles()
+            resolved_queries: (query, imdb_id) pairs, e.g. from
+                SearchHistory.resolved_queries()
+            base_url: IMDb site root used to build result URLs
+
+        Returns:
+            The populated index
+        """
+        index = cls(base_url)
+        for imdb_id, title, year in movies:
+            index.add(imdb_id, title, year)
+        for query, imdb_id in resolved_queries:
+            index.add(imdb_id, query, alias=True)
+        return index
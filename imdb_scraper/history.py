@@ -1,66 +1,309 @@
 """Search history management for IMDb scraper."""
 
 import json
+import os
+from bisect import bisect_left, insort
+from collections import OrderedDict
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Tuple, Any
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock; fall back to thread locking
+    fcntl = None
+
+from .config import NEGATIVE_CACHE_TTL, HISTORY_COMPACT_EVERY
+from .metrics import metrics
+
 
 class SearchHistory:
-    """Manages search history and basic caching functionality."""
+    """Manages search history and basic caching functionality.
+
+    History is stored as a JSON snapshot plus an append-only event log
+    (``<name>.events.jsonl``). Recording a search appends one line to the log;
+    the log is folded into the snapshot every ``HISTORY_COMPACT_EVERY`` events.
+    Writers from several processes serialize on an flock of the log file and
+    replay each other's events before appending, so no update is lost.
 
-    def __init__(self, history_file: str = "search_history.json"):
+    Popular and recent queries are served from indexes kept up to date on
+    every event: queries bucketed by count (each bucket ordered by last
+    search), a recency-ordered dict and a running search total.
+    """
+
+    def __init__(self, history_file: str = "search_history.json",
+                 compact_every: int = HISTORY_COMPACT_EVERY):
         """Initialize search history manager.
 
         Args:
-            history_file: Path to the history file (relative to project root)
+            history_file: Path to the history snapshot file (relative to project root)
+            compact_every: Number of logged events that triggers compaction
         """
         self.history_file = Path(__file__).parent.parent / history_file
+        self.log_file = self.history_file.with_name(self.history_file.stem + ".events.jsonl")
+        self.compact_every = compact_every
         self.history: Dict[str, Dict[str, Any]] = {}
-        self._load_history()
+        self._by_recency: "OrderedDict[str, None]" = OrderedDict()  # oldest first
+        self._by_count: Dict[int, "OrderedDict[str, None]"] = {}  # count -> queries, oldest first
+        self._counts: List[int] = []  # distinct counts, ascending
+        self._total_searches = 0
+        self._lock = threading.RLock()  # Scrapers may record from batch worker threads
+        self._log = open(self.log_file, 'a+b')
+        self._log_offset = 0
+        self._log_events = 0
+        self._snapshot_id: Optional[tuple] = None
+        with self._locked(), metrics.timer("history_load"):
+            self._load_history()
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the thread lock and an exclusive lock on the event log."""
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(self._log.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(self._log.fileno(), fcntl.LOCK_UN)
+
+    def _stat_snapshot(self) -> Optional[tuple]:
+        """Identify the snapshot file version; compaction always replaces the file."""
+        try:
+            stat = self.history_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
 
     def _load_history(self) -> None:
-        """Load search history from file."""
-        if self.history_file.exists():
+        """Load the snapshot and replay the event log. Caller holds the lock."""
+        self._snapshot_id = self._stat_snapshot()
+        self.history = {}
+        if self._snapshot_id is not None:
             try:
                 with open(self.history_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.history = data
+                    self.history = json.load(f)
             except (json.JSONDecodeError, FileNotFoundError):
                 self.history = {}
+        self._rebuild_indexes()
+
+        self._log_offset = 0
+        self._log_events = 0
+        self._replay_log()
+
+    def _replay_log(self) -> None:
+        """Apply events appended since the last read. Caller holds the lock."""
+        self._log.seek(self._log_offset)
+        data = self._log.read()
+        complete = data[:data.rfind(b'\n') + 1]  # Ignore a torn trailing line
+        for line in complete.splitlines():
+            try:
+                self._apply_event(json.loads(line))
+            except (ValueError, KeyError, TypeError):
+                continue
+            self._log_events += 1
+        self._log_offset += len(complete)
+
+    def _sync(self) -> None:
+        """Catch up with events and compactions from other processes. Caller holds the lock."""
+        log_size = os.fstat(self._log.fileno()).st_size
+        if self._stat_snapshot() != self._snapshot_id or log_size < self._log_offset:
+            self._load_history()
         else:
-            self.history = {}
+            self._replay_log()
+
+    def _append_event(self, event: Dict[str, Any]) -> None:
+        """Sync, apply and append one event, compacting when the log is long.
+
+        The line is flushed to the OS but not fsynced: it survives the process
+        crashing, not the machine losing power.
+        """
+        with self._locked(), metrics.timer("history_append"):
+            self._sync()
+            self._apply_event(event)
+            try:
+                line = json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n'
+                self._log.write(line.encode('utf-8'))
+                self._log.flush()
+                self._log_offset = self._log.tell()
+                self._log_events += 1
+            except Exception as e:
+                print(f"Warning: Could not save search history: {e}")
+                return
+
+            if self._log_events >= self.compact_every:
+                self._compact()
 
     def _save_history(self) -> None:
-        """Save search history to file."""
+        """Atomically write the in-memory history as the snapshot. Caller holds the lock."""
+        tmp_file = self.history_file.with_name(self.history_file.name + '.tmp')
         try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(self.history, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_file, self.history_file)
+            self._snapshot_id = self._stat_snapshot()
         except Exception as e:
             print(f"Warning: Could not save search history: {e}")
 
-    def record_search(self, query: str, success: bool = True) -> None:
+    def _compact(self) -> None:
+        """Fold the event log into the snapshot. Caller holds the lock."""
+        with metrics.timer("history_compact"):
+            self._save_history()
+        if self._snapshot_id is None:
+            return  # Keep the log if the snapshot could not be written
+        self._log.truncate(0)
+        self._log_offset = 0
+        self._log_events = 0
+
+    def compact(self) -> None:
+        """Fold the event log into the snapshot file now."""
+        with self._locked():
+            self._sync()
+            self._compact()
+
+    def refresh(self) -> None:
+        """Pick up searches recorded by other processes since the last read."""
+        with self._locked():
+            self._sync()
+
+    def close(self) -> None:
+        """Close the event log file; the history is not usable afterwards."""
+        with self._lock:
+            self._log.close()
+
+    def _rebuild_indexes(self) -> None:
+        """Build the popularity and recency indexes from scratch. Caller holds the lock."""
+        self._by_recency = OrderedDict()
+        self._by_count = {}
+        self._counts = []
+        self._total_searches = 0
+        for query in sorted(self.history, key=lambda q: self.history[q]["last_searched"] or ""):
+            self._index_add(query)
+
+    def _index_add(self, query: str) -> None:
+        """Index a query as the most recently searched at its count."""
+        count = self.history[query]["count"]
+        self._by_recency[query] = None
+        bucket = self._by_count.get(count)
+        if bucket is None:
+            bucket = self._by_count[count] = OrderedDict()
+            insort(self._counts, count)
+        bucket[query] = None
+        self._total_searches += count
+
+    def _index_remove(self, query: str) -> None:
+        """Drop a query from the indexes."""
+        count = self.history[query]["count"]
+        del self._by_recency[query]
+        bucket = self._by_count[count]
+        del bucket[query]
+        if not bucket:
+            del self._by_count[count]
+            del self._counts[bisect_left(self._counts, count)]
+        self._total_searches -= count
+
+    def _apply_event(self, event: Dict[str, Any]) -> None:
+        """Apply one logged event to the in-memory history."""
+        op = event["op"]
+        if op == "search":
+            query = event["q"]
+            if query not in self.history:
+                self.history[query] = {
+                    "count": 0,
+                    "last_searched": None,
+                    "last_result": None
+                }
+            else:
+                self._index_remove(query)
+
+            entry = self.history[query]
+            entry["count"] += 1
+            entry["last_searched"] = event["t"]
+            entry["last_result"] = "success" if event["ok"] else "failed"
+
+            # Only definitive outcomes touch the memo and the negative cache; a
+            # transient failure (res=False) leaves a good resolution in place
+            if event.get("res", True):
+                if not event["ok"]:
+                    entry["imdb_id"] = None
+                    entry["failed_at"] = event["t"]
+                elif event.get("id"):
+                    entry["imdb_id"] = event["id"]
+                    entry["resolved_at"] = event["t"]
+                    entry.pop("failed_at", None)
+            self._index_add(query)
+        elif op == "forget":
+            for query in event["queries"]:
+                if query in self.history:
+                    self._index_remove(query)
+                    del self.history[query]
+
+    def record_search(self, query: str, success: bool = True, imdb_id: Optional[str] = None,
+                      store_resolution: bool = True) -> None:
         """Record a search query.
 
         Args:
             query: The search query
             success: Whether the search was successful
+            imdb_id: IMDb ID the query resolved to, if known
+            store_resolution: Whether this search is a definitive outcome (a fresh
+                resolution, or a not-found) that should replace the stored
+                imdb_id / negative-cache entry; False for memo hits and for
+                transient failures such as network errors
         """
         query = query.strip().lower()  # Normalize for better matching
 
-        if query not in self.history:
-            self.history[query] = {
-                "count": 0,
-                "last_searched": None,
-                "last_result": None
-            }
+        event: Dict[str, Any] = {
+            "op": "search",
+            "q": query,
+            "ok": success,
+            "t": datetime.now().isoformat(),
+        }
+        if imdb_id:
+            event["id"] = imdb_id
+        if not store_resolution:
+            event["res"] = False
+        self._append_event(event)
+
+    def get_resolved_id(self, query: str) -> Optional[str]:
+        """Get the IMDb ID a query previously resolved to.
 
-        entry = self.history[query]
-        entry["count"] += 1
-        entry["last_searched"] = datetime.now().isoformat()
-        entry["last_result"] = "success" if success else "failed"
+        Args:
+            query: The search query
+
+        Returns:
+            The resolved IMDb ID or None if the query has no successful resolution
+        """
+        entry = self.history.get(query.strip().lower())
+        return entry.get("imdb_id") if entry else None
 
-        self._save_history()
+    def is_known_failure(self, query: str, max_age: float = NEGATIVE_CACHE_TTL) -> bool:
+        """Check if a query recently failed to resolve.
+
+        Args:
+            query: The search query
+            max_age: Seconds a failed resolution is trusted
+
+        Returns:
+            True if the query was definitively not found within the last max_age seconds
+        """
+        entry = self.history.get(query.strip().lower())
+        if not entry or not entry.get("failed_at"):
+            return False
+        failed_at = datetime.fromisoformat(entry["failed_at"])
+        return datetime.now() - failed_at < timedelta(seconds=max_age)
+
+    def resolved_queries(self) -> List[Tuple[str, str]]:
+        """Get every query whose last search resolved to an IMDb ID.
+
+        Returns:
+            (query, imdb_id) pairs
+        """
+        with self._lock:
+            return [(query, data["imdb_id"]) for query, data in self.history.items()
+                    if data.get("imdb_id")]
 
     def get_popular_searches(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get most popular searches.
@@ -71,22 +314,14 @@ class SearchHistory:
         Returns:
             List of search entries sorted by popularity
         """
-        # Sort by count (descending), then by last searched (descending)
-        sorted_searches = sorted(
-            self.history.items(),
-            key=lambda x: (x[1]["count"], x[1]["last_searched"] or ""),
-            reverse=True
-        )
-
+        # Highest count first, ties broken by most recent search
         results = []
-        for query, data in sorted_searches[:limit]:
-            results.append({
-                "query": query,
-                "count": data["count"],
-                "last_searched": data["last_searched"],
-                "last_result": data["last_result"]
-            })
-
+        with self._lock:
+            for count in reversed(self._counts):
+                for query in reversed(self._by_count[count]):
+                    if len(results) >= limit:
+                        return results
+                    results.append(self._summary(query))
         return results
 
     def get_recent_searches(self, limit: int = 5) -> List[Dict[str, Any]]:
@@ -98,25 +333,25 @@ class SearchHistory:
         Returns:
             List of recent search entries
         """
-        # Sort by last searched timestamp (descending)
-        sorted_searches = sorted(
-            self.history.items(),
-            key=lambda x: x[1]["last_searched"] or "",
-            reverse=True
-        )
-
         results = []
-        for query, data in sorted_searches[:limit]:
-            if data["last_searched"]:  # Only include searches that have been made
-                results.append({
-                    "query": query,
-                    "count": data["count"],
-                    "last_searched": data["last_searched"],
-                    "last_result": data["last_result"]
-                })
-
+        with self._lock:
+            for query in reversed(self._by_recency):
+                if len(results) >= limit:
+                    break
+                if self.history[query]["last_searched"]:  # Only include searches that have been made
+                    results.append(self._summary(query))
         return results
 
+    def _summary(self, query: str) -> Dict[str, Any]:
+        """Build the public entry returned by popular/recent queries."""
+        data = self.history[query]
+        return {
+            "query": query,
+            "count": data["count"],
+            "last_searched": data["last_searched"],
+            "last_result": data["last_result"]
+        }
+
     def search_exists(self, query: str) -> bool:
         """Check if a search query exists in history.
 
@@ -154,17 +389,17 @@ class SearchHistory:
         cutoff_date = datetime.now() - timedelta(days=days)
         entries_to_remove = []
 
-        for query, data in self.history.items():
-            if data["last_searched"]:
-                last_searched = datetime.fromisoformat(data["last_searched"])
-                if last_searched < cutoff_date:
-                    entries_to_remove.append(query)
-
-        for query in entries_to_remove:
-            del self.history[query]
+        with self._lock:
+            for query in self._by_recency:  # Oldest first, stop at the first recent entry
+                last_searched = self.history[query]["last_searched"]
+                if not last_searched:
+                    continue
+                if datetime.fromisoformat(last_searched) >= cutoff_date:
+                    break
+                entries_to_remove.append(query)
 
         if entries_to_remove:
-            self._save_history()
+            self._append_event({"op": "forget", "queries": entries_to_remove})
 
         return len(entries_to_remove)
 
@@ -174,7 +409,7 @@ class SearchHistory:
         Returns:
             Total search count across all queries
         """
-        return sum(data["count"] for data in self.history.values())
+        return self._total_searches
 
     def get_unique_queries(self) -> int:
         """Get number of unique search queries.
@@ -186,6 +421,12 @@ class SearchHistory:
 
     def clear_history(self) -> None:
         """Clear all search history."""
-        self.history = {}
-        if self.history_file.exists():
-            self.history_file.unlink()  # Delete the file
\ No newline at end of file
+        with self._locked():
+            self.history = {}
+            self._rebuild_indexes()
+            self._log.truncate(0)
+            self._log_offset = 0
+            self._log_events = 0
+            if self.history_file.exists():
+                self.history_file.unlink()  # Delete the file
+            self._snapshot_id = None
@@ -0,0 +1,218 @@
+"""Process-wide latency histograms and counters for the scraping hot path.
+
+Instrumentation is off by default. While disabled, timer() hands out a shared
+no-op context manager and inc() returns after one attribute check, so the
+instrumented code pays next to nothing.
+
+Stages timed:
+
+- rate_limit_wait: time spent waiting for a rate limiter token
+- http: one HTTP request, until the response headers have arrived
+- download: streaming (and decompressing) the response body
+- parse_json: locating and decoding the page's embedded JSON
+- parse_html: building an HTML tree for the selector fallback
+- extract: turning decoded JSON or an HTML tree into results
+- history_load / history_append / history_compact: SearchHistory file I/O
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence
+
+from .config import METRICS_ENABLED, METRICS_BUCKETS
+
+PREFIX = "imdb_scraper"
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets: Sequence[float] = METRICS_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket holding it."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+        }
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("_metrics", "_stage", "_start")
+
+    def __init__(self, metrics: "Metrics", stage: str):
+        self._metrics = metrics
+        self._stage = stage
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self._metrics.observe(self._stage, time.perf_counter() - self._start)
+
+
+class Metrics:
+    """Registry of per-stage latency histograms and named counters."""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED, buckets: Sequence[float] = METRICS_BUCKETS):
+        """Initialize an empty registry.
+
+        Args:
+            enabled: Record anything at all
+            buckets: Histogram bucket upper bounds in seconds
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[str, Histogram] = {}
+        self._counters: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def enable(self, enabled: bool = True) -> None:
+        """Turn recording on (or off)."""
+        self.enabled = enabled
+
+    def timer(self, stage: str):
+        """Get a context manager that records the duration of its block under stage."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, stage)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record one duration for a stage."""
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def inc(self, counter: str, amount: float = 1) -> None:
+        """Add to a counter (e.g. "requests", "bytes_downloaded")."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def reset(self) -> None:
+        """Drop everything recorded so far."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Get recorded metrics.
+
+        Returns:
+            Counters, derived cache hit ratios and a latency summary
+            (count, sum, mean and bucket-estimated p50/p90/p99) per stage
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            stages = {stage: histogram.summary() for stage, histogram in self._histograms.items()}
+        ratios = {}
+        for cache in ("response_cache", "movie_cache"):
+            hits = counters.get(f"{cache}_hits", 0)
+            lookups = hits + counters.get(f"{cache}_misses", 0)
+            if lookups:
+                ratios[f"{cache}_hit_ratio"] = hits / lookups
+        return {"counters": counters, "ratios": ratios, "stages": stages}
+
+    def prometheus(self) -> str:
+        """Render recorded metrics in the Prometheus text exposition format."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(self._histograms.items())
+
+        lines: List[str] = []
+        for name, value in counters:
+            lines.append(f"# TYPE {PREFIX}_{name}_total counter")
+            lines.append(f"{PREFIX}_{name}_total {value:g}")
+        if histograms:
+            name = f"{PREFIX}_stage_seconds"
+            lines.append(f"# HELP {name} Latency of scraper hot-path stages")
+            lines.append(f"# TYPE {name} histogram")
+        for stage, histogram in histograms:
+            cumulative = 0
+            for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1",
+                         registry: Optional[Metrics] = None) -> ThreadingHTTPServer:
+    """Serve the registry as Prometheus text on a background thread.
+
+    Args:
+        port: Port to bind (0 picks a free port)
+        host: Interface to bind
+        registry: Metrics to serve (defaults to the process-wide registry)
+
+    Returns:
+        The running server; call shutdown() to stop it
+    """
+    registry = registry or metrics
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):  # noqa: A002 - silence request logging
+            pass
+
+        def do_GET(self):
+            body = registry.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# Process-wide registry shared by every scraper
+metrics = Metrics()
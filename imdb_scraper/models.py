@@ -1,9 +1,12 @@
 """Data models for IMDb scraper."""
 
-from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+import logging
+from dataclasses import dataclass, field, fields as dataclass_fields
+from typing import Callable, Iterable, List, Optional, Dict, Any, Tuple
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class Movie:
@@ -18,6 +21,8 @@ class Movie:
     plot: Optional[str] = None
     imdb_id: Optional[str] = None
     url: Optional[str] = None
+    writers: List[str] = field(default_factory=list)
+    poster_url: Optional[str] = None
     scraped_at: datetime = field(default_factory=datetime.now)
 
     def __post_init__(self):
@@ -50,6 +55,8 @@ class Movie:
             "plot": self.plot,
             "imdb_id": self.imdb_id,
             "url": self.url,
+            "writers": self.writers,
+            "poster_url": self.poster_url,
             "scraped_at": self.scraped_at.isoformat(),
         }
 
@@ -63,6 +70,71 @@ class Movie:
         return cls(**data)
 
 
+MOVIE_FIELDS = tuple(f.name for f in dataclass_fields(Movie))
+SEARCH_RESULT_FIELDS = ("title", "year", "imdb_id", "url")  # Movie fields a search result carries
+
+
+def movie_fields(names: Iterable[str]) -> Tuple[str, ...]:
+    """Validate Movie field names, dropping duplicates (raises ValueError on unknown names)."""
+    names = tuple(dict.fromkeys(names))
+    unknown = [name for name in names if name not in MOVIE_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown Movie fields: {', '.join(unknown)}")
+    return names
+
+
+class LazyMovie(Movie):
+    """Movie holding some fields up front and loading the rest on first access.
+
+    Reading a field that was loaded up front costs nothing; reading any
+    other field (directly, or through to_dict(), dataclasses.asdict() or
+    dataclasses.replace()) runs the loader once and fills in the remaining
+    fields. If there is no loader or it fails, they keep their Movie defaults.
+    """
+
+    def __init__(self, loader: Optional[Callable[[], Optional[Movie]]] = None, **values: Any):
+        """Initialize the movie.
+
+        Args:
+            loader: Returns the complete Movie
+            **values: Movie field values known now (must include title)
+        """
+        self._pending: frozenset = frozenset()  # Validate the known values as a plain Movie
+        self._loader = loader
+        super().__init__(**values)
+        if loader is not None:
+            self._pending = frozenset(MOVIE_FIELDS) - set(values) - {"scraped_at"}
+
+    def __getattribute__(self, name: str) -> Any:
+        if name in object.__getattribute__(self, "_pending"):
+            object.__getattribute__(self, "_load")()
+        return object.__getattribute__(self, name)
+
+    @property
+    def loaded(self) -> bool:
+        """True once every field has been loaded."""
+        return not self._pending
+
+    def _load(self) -> None:
+        """Run the loader and fill in the fields not loaded up front."""
+        pending = self._pending
+        movie = self._loader() if self._loader is not None else None
+        if movie is None:
+            logger.warning(f"Could not load remaining fields for {self.imdb_id}")
+        else:
+            for name in pending:
+                setattr(self, name, getattr(movie, name))
+        self._pending = frozenset()
+        self._loader = None
+
+    def __repr__(self) -> str:
+        if self.loaded:
+            return super().__repr__()
+        known = ", ".join(f"{name}={getattr(self, name)!r}" for name in MOVIE_FIELDS
+                          if name not in self._pending and name != "scraped_at")
+        return f"LazyMovie({known}, ...)"
+
+
 @dataclass
 class SearchResult:
     """Search result data model."""
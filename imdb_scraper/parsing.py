@@ -0,0 +1,429 @@
+"""HTML and embedded-JSON parsing for IMDb pages."""
+
+import json
+import re
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urljoin
+
+from .backends import HTMLBackend, get_backend
+from .config import (
+    IMDB_BASE_URL, MOVIE_SELECTORS, SEARCH_SELECTORS, MAX_CAST, MAX_RESPONSE_BYTES
+)
+from .extract import extract_movie_fields, extract_search_items
+from .fuzzy import title_similarity
+from .metrics import metrics
+from .models import LazyMovie, Movie, SearchResult
+
+logger = logging.getLogger(__name__)
+
+# Byte-level patterns for locating embedded JSON without building a DOM
+_NEXT_DATA_RE = re.compile(rb'<script[^>]*\bid=["\']__NEXT_DATA__["\'][^>]*>')
+_JSON_SCRIPT_RE = re.compile(rb'<script[^>]*\btype=["\']application/json["\'][^>]*>')
+_SCRIPT_END = b'</script>'
+_PAGE_PROPS = b'"pageProps"'
+
+
+class PageReader:
+    """Accumulates a streamed page body, noticing when the rest is not needed.
+
+    Everything the parsers read from a Next.js page is in its __NEXT_DATA__
+    script, so once that script has been received in full (and carries
+    pageProps) the remaining markup can be abandoned. Pages without it are
+    read to the end for the HTML fallback. Bodies over max_bytes are refused.
+    """
+
+    def __init__(self, max_bytes: int = MAX_RESPONSE_BYTES, early_exit: bool = True):
+        """Initialize an empty reader.
+
+        Args:
+            max_bytes: Largest (decompressed) body accepted
+            early_exit: Stop once the page data script is complete
+        """
+        self.max_bytes = max_bytes
+        self.early_exit = early_exit
+        self.too_large = False
+        self.exited_early = False  # True once reading stopped after the page data script
+        self._buffer = bytearray()
+        self._script_start: Optional[int] = None
+        self._scanned = 0
+
+    def feed(self, chunk: bytes) -> bool:
+        """Add a chunk of the body.
+
+        Returns:
+            True when reading should stop: the page data is complete (with
+            early_exit) or the body exceeded max_bytes
+        """
+        self._buffer += chunk
+        if len(self._buffer) > self.max_bytes:
+            self.too_large = True
+            return True
+        if not self.early_exit:
+            return False
+
+        # Rescan a little before the new chunk so a tag split across chunks is found
+        if self._script_start is None:
+            match = _NEXT_DATA_RE.search(self._buffer, max(self._scanned - 256, 0))
+            self._scanned = len(self._buffer)
+            if match is None:
+                return False
+            self._script_start = self._scanned = match.end()
+        end = self._buffer.find(_SCRIPT_END, max(self._scanned - len(_SCRIPT_END), self._script_start))
+        self._scanned = len(self._buffer)
+        if end == -1:
+            return False
+        if _PAGE_PROPS not in self._buffer[self._script_start:end]:
+            self.early_exit = False  # Unexpected payload: keep the whole page for the fallback
+            return False
+        del self._buffer[end + len(_SCRIPT_END):]
+        self.exited_early = True
+        return True
+
+    @property
+    def body(self) -> bytes:
+        """The bytes read so far (truncated after the page data script on an early exit)."""
+        return bytes(self._buffer)
+
+
+def _iter_json_payloads(content: bytes) -> Iterator[bytes]:
+    """Yield raw JSON script payloads, the __NEXT_DATA__ blob first."""
+    next_data = _NEXT_DATA_RE.search(content)
+    if next_data:
+        end = content.find(_SCRIPT_END, next_data.end())
+        if end != -1:
+            yield content[next_data.end():end]
+
+    for match in _JSON_SCRIPT_RE.finditer(content):
+        if next_data and match.start() == next_data.start():
+            continue
+        end = content.find(_SCRIPT_END, match.end())
+        if end != -1:
+            yield content[match.end():end]
+
+
+def find_page_props(content: bytes) -> Optional[Dict[str, Any]]:
+    """Find and decode the Next.js pageProps embedded in a raw IMDb page.
+
+    Scans the response bytes for JSON script tags instead of parsing the page
+    into a BeautifulSoup tree, so only the JSON payload is ever decoded.
+
+    Args:
+        content: Raw response body
+
+    Returns:
+        The pageProps dict, or None if no JSON script carries it
+    """
+    with metrics.timer("parse_json"):
+        return _find_page_props(content)
+
+
+def _find_page_props(content: bytes) -> Optional[Dict[str, Any]]:
+    for payload in _iter_json_payloads(content):
+        if not payload.strip():
+            continue
+        try:
+            data = json.loads(payload)
+        except ValueError:
+            continue
+        if not isinstance(data, dict):
+            continue
+        page_props = data.get('props', {}).get('pageProps', {})
+        if page_props:
+            return page_props
+    return None
+
+
+def extract_text_safe(doc: Any, selector: str, backend: HTMLBackend) -> Optional[str]:
+    """Safely extract text from a CSS selector."""
+    try:
+        element = backend.select_one(doc, selector)
+        return backend.text(element) if element is not None else None
+    except Exception as e:
+        logger.warning(f"Failed to extract text with selector '{selector}': {e}")
+        return None
+
+
+def extract_multiple_text(doc: Any, selector: str, backend: HTMLBackend,
+                          limit: Optional[int] = 5) -> List[str]:
+    """Extract text from multiple elements matching a selector."""
+    try:
+        texts = (backend.text(elem) for elem in backend.select(doc, selector, limit))
+        return [text for text in texts if text]
+    except Exception as e:
+        logger.warning(f"Failed to extract multiple text with selector '{selector}': {e}")
+        return []
+
+
+def search_results_from_props(page_props: Dict[str, Any], query: str, max_results: int = 5,
+                              base_url: str = IMDB_BASE_URL) -> List[SearchResult]:
+    """Build search results from the pageProps of a /find/ page."""
+    title_url = f"{base_url}/title/"
+    results = []
+
+    for fields in extract_search_items(page_props)[:max_results]:
+        title = fields["title"]
+        if not title:
+            continue
+
+        imdb_id = fields["imdb_id"] or ''
+        url = f"{title_url}{imdb_id}/" if imdb_id else None
+
+        results.append(SearchResult(
+            title=title,
+            year=fields["year"],
+            imdb_id=imdb_id,
+            url=url,
+            relevance_score=round(title_similarity(query, title, fields["year"]), 4)
+        ))
+
+    return results
+
+
+def search_results_from_html(doc: Any, query: str, backend: HTMLBackend, max_results: int = 5,
+                             base_url: str = IMDB_BASE_URL) -> List[SearchResult]:
+    """Fallback HTML parsing for search results."""
+    results = []
+    result_elements = backend.select(doc, SEARCH_SELECTORS["results"], max_results)
+
+    for element in result_elements:
+        try:
+            title_link = backend.select_one(element, SEARCH_SELECTORS["title_link"])
+            if title_link is None:
+                continue
+
+            title = backend.text(title_link)
+            href = backend.attr(title_link, 'href') or ''
+            url = urljoin(base_url, href)
+
+            imdb_id_match = re.search(r'/title/(tt\d+)/', str(url))
+            imdb_id = imdb_id_match.group(1) if imdb_id_match else None
+
+            year_elem = backend.select_one(element, SEARCH_SELECTORS["year"])
+            year = None
+            if year_elem is not None:
+                year_text = backend.text(year_elem)
+                year_match = re.search(r'\b(19|20)\d{2}\b', year_text)
+                if year_match:
+                    year = int(year_match.group())
+
+            result = SearchResult(
+                title=title,
+                year=year,
+                imdb_id=imdb_id,
+                url=url,
+                relevance_score=round(title_similarity(query, title, year), 4)
+            )
+            results.append(result)
+
+        except Exception as e:
+            logger.warning(f"Failed to parse search result: {e}")
+            continue
+
+    return results
+
+
+def parse_search_page(content: bytes, query: str, max_results: int = 5,
+                      base_url: str = IMDB_BASE_URL,
+                      backend: Optional[HTMLBackend] = None) -> List[SearchResult]:
+    """Parse a raw /find/ page into search results sorted by relevance."""
+    results = []
+
+    try:
+        # IMDb now uses React/JSON embedded in script tags
+        page_props = find_page_props(content)
+        if page_props:
+            try:
+                with metrics.timer("extract"):
+                    results = search_results_from_props(page_props, query, max_results, base_url)
+            except (KeyError, AttributeError) as e:
+                logger.warning(f"Unexpected search JSON layout: {e}")
+
+        # Fallback: try to parse traditional HTML if JSON parsing failed
+        if not results:
+            logger.info("JSON parsing failed, trying HTML fallback")
+            backend = backend or get_backend()
+            with metrics.timer("parse_html"):
+                doc = backend.parse(content)
+            with metrics.timer("extract"):
+                results = search_results_from_html(doc, query, backend, max_results, base_url)
+
+    except Exception as e:
+        logger.error(f"Failed to parse search results: {e}")
+
+    # Sort by relevance score
+    results.sort(key=lambda x: x.relevance_score, reverse=True)
+    return results
+
+
+def movie_from_props(movie_data: Dict[str, Any], imdb_id: str, movie_url: str) -> Optional[Movie]:
+    """Build a Movie from the pageProps of a /title/ page."""
+    fields = extract_movie_fields(movie_data)
+    if not fields["title"]:
+        return None
+
+    return Movie(imdb_id=imdb_id, url=movie_url, **fields)
+
+
+def parse_title_page(content: bytes, imdb_id: str, movie_url: str,
+                     backend: Optional[HTMLBackend] = None) -> Optional[Movie]:
+    """Parse a raw /title/ page into a Movie."""
+    try:
+        # IMDb now uses JSON data embedded in script tags
+        movie_data = find_page_props(content)
+
+        if not movie_data:
+            # Fallback to HTML parsing if JSON fails
+            return _parse_title_html(content, imdb_id, movie_url, backend)
+
+        with metrics.timer("extract"):
+            return movie_from_props(movie_data, imdb_id, movie_url)
+
+    except Exception as e:
+        logger.error(f"Failed to parse movie details for {imdb_id}: {e}")
+        return None
+
+
+def parse_title_lazy(content: bytes, fields: Iterable[str], imdb_id: str, movie_url: str,
+                     backend: Optional[HTMLBackend] = None) -> Optional[Union[LazyMovie, Movie]]:
+    """Parse some Movie fields of a raw /title/ page now and the rest on first access.
+
+    Args:
+        content: Raw response body
+        fields: Movie field names to extract up front (title and year always are)
+        imdb_id: IMDb title ID
+        movie_url: Title page URL
+        backend: HTML parser backend for the selector fallback
+
+    Returns:
+        A LazyMovie over the page's JSON, a complete Movie if the page had to
+        go through the HTML fallback, or None if it could not be parsed
+    """
+    try:
+        movie_data = find_page_props(content)
+        if not movie_data:
+            return _parse_title_html(content, imdb_id, movie_url, backend)
+
+        with metrics.timer("extract"):
+            values = extract_movie_fields(movie_data, ("title", "year") + tuple(fields))
+        if not values["title"]:
+            return None
+        return LazyMovie(lambda: movie_from_props(movie_data, imdb_id, movie_url),
+                         **dict(values, imdb_id=imdb_id, url=movie_url))
+
+    except Exception as e:
+        logger.error(f"Failed to parse movie details for {imdb_id}: {e}")
+        return None
+
+
+def movie_from_search_result(result: SearchResult, movie_url: str,
+                              loader: Optional[Callable[[], Optional[Movie]]] = None
+                              ) -> Optional[LazyMovie]:
+    """Build a LazyMovie from the fields a search result already carries.
+
+    Args:
+        result: Search result with an IMDb ID
+        movie_url: Title page URL
+        loader: Returns the complete Movie if other fields are read
+
+    Returns:
+        The movie, or None if the result's values do not validate
+    """
+    try:
+        return LazyMovie(loader, title=result.title, year=result.year,
+                         imdb_id=result.imdb_id, url=movie_url)
+    except ValueError as e:
+        logger.warning(f"Unusable search result for {result.imdb_id}: {e}")
+        return None
+
+
+def _parse_title_html(content: bytes, imdb_id: str, movie_url: str,
+                      backend: Optional[HTMLBackend] = None) -> Optional[Movie]:
+    logger.warning(f"JSON parsing failed for {imdb_id}, using HTML fallback")
+    backend = backend or get_backend()
+    with metrics.timer("parse_html"):
+        doc = backend.parse(content)
+    with metrics.timer("extract"):
+        return parse_movie_details_html(doc, imdb_id, movie_url, backend)
+
+
+def parse_title_fields(content: bytes, fields: Iterable[str], imdb_id: str, movie_url: str,
+                       backend: Optional[HTMLBackend] = None) -> Dict[str, Any]:
+    """Parse only some Movie fields from a raw /title/ page.
+
+    Args:
+        content: Raw response body
+        fields: Movie field names to extract
+        imdb_id: IMDb title ID, for logging and the HTML fallback
+        movie_url: Title page URL, for the HTML fallback
+        backend: HTML parser backend for the selector fallback
+
+    Returns:
+        Field name -> value; empty if the page could not be parsed
+    """
+    fields = tuple(fields)
+    try:
+        movie_data = find_page_props(content)
+        if movie_data:
+            with metrics.timer("extract"):
+                return extract_movie_fields(movie_data, fields)
+
+        movie = _parse_title_html(content, imdb_id, movie_url, backend)
+        return {name: getattr(movie, name) for name in fields} if movie else {}
+
+    except Exception as e:
+        logger.error(f"Failed to parse movie details for {imdb_id}: {e}")
+        return {}
+
+
+def parse_movie_details_html(doc: Any, imdb_id: str, movie_url: str,
+                             backend: HTMLBackend) -> Optional[Movie]:
+    """Fallback HTML parsing for movie details."""
+    try:
+        # Extract basic information using old selectors
+        title = extract_text_safe(doc, MOVIE_SELECTORS["title"], backend)
+        if not title:
+            return None
+
+        # Extract year
+        year = None
+        year_text = extract_text_safe(doc, MOVIE_SELECTORS["year"], backend)
+        if year_text:
+            year_match = re.search(r'\b(19|20)\d{2}\b', year_text)
+            if year_match:
+                year = int(year_match.group())
+
+        # Extract rating
+        rating = None
+        rating_text = extract_text_safe(doc, MOVIE_SELECTORS["rating"], backend)
+        if rating_text:
+            try:
+                rating = float(rating_text.split('/')[0])
+            except (ValueError, IndexError):
+                pass
+
+        # Extract other details
+        runtime = extract_text_safe(doc, MOVIE_SELECTORS["runtime"], backend)
+        genres = extract_multiple_text(doc, MOVIE_SELECTORS["genres"], backend)
+        director = extract_text_safe(doc, MOVIE_SELECTORS["director"], backend)
+        cast = extract_multiple_text(doc, MOVIE_SELECTORS["cast"], backend, limit=MAX_CAST)
+        plot = extract_text_safe(doc, MOVIE_SELECTORS["plot"], backend)
+
+        movie = Movie(
+            title=title,
+            year=year,
+            rating=rating,
+            runtime=runtime,
+            genres=genres,
+            director=director,
+            cast=cast,
+            plot=plot,
+            imdb_id=imdb_id,
+            url=movie_url
+        )
+
+        return movie
+
+    except Exception as e:
+        logger.error(f"HTML fallback failed for {imdb_id}: {e}")
+        return None
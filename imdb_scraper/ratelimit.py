@@ -0,0 +1,206 @@
+"""Rate limiting shared across IMDb scraper instances."""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+from .config import (
+    MIN_REQUEST_DELAY, MAX_REQUEST_DELAY, RATE_LIMIT_BURST, ADAPTIVE_MAX_RATE,
+    RATE_INCREASE_STEP, RATE_BACKOFF_FACTOR, RATE_BACKOFF_COOLDOWN,
+    RETRY_DELAY, RETRY_MAX_DELAY
+)
+
+
+class TokenBucket:
+    """Thread-safe token bucket limiting requests per second."""
+
+    def __init__(self, rate: float = 1.0 / MIN_REQUEST_DELAY, burst: int = RATE_LIMIT_BURST,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second (sustained requests per second)
+            burst: Maximum number of tokens that can accumulate
+            clock: Monotonic time source in seconds
+        """
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        """Add the tokens earned since the last update. Caller holds the lock."""
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Take one token without sleeping.
+
+        Callers reserve their token up front, so waiting callers are served
+        in arrival order without polling.
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(self._updated - now, 0.0)  # Bucket held closed (Retry-After)
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def available(self) -> float:
+        """Get the tokens that could be taken right now without waiting (none are taken)."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            return self._tokens if self._updated <= now else 0.0
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    async def acquire_async(self) -> float:
+        """Take one token, yielding to the event loop until it is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def on_response(self, throttled: bool, retry_after: Optional[float] = None) -> None:
+        """Report a response outcome; a fixed bucket ignores it.
+
+        Args:
+            throttled: True if the server answered 429 / 503
+            retry_after: Seconds the server asked clients to wait, if given
+        """
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the limiter's current settings."""
+        return {"rate": self.rate, "burst": self.burst}
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """Token bucket whose rate follows server feedback (AIMD).
+
+    Every clean response raises the rate by a fixed step, up to max_rate; a
+    429 / 503 multiplies it by backoff_factor, down to min_rate, at most once
+    per cooldown so a burst of concurrent throttles counts as one signal. A
+    Retry-After header pauses all callers until it has passed.
+    """
+
+    def __init__(self, rate: float = 1.0 / MIN_REQUEST_DELAY,
+                 min_rate: float = 1.0 / MAX_REQUEST_DELAY, max_rate: float = ADAPTIVE_MAX_RATE,
+                 burst: int = RATE_LIMIT_BURST, increase_step: float = RATE_INCREASE_STEP,
+                 backoff_factor: float = RATE_BACKOFF_FACTOR,
+                 cooldown: float = RATE_BACKOFF_COOLDOWN,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialize the limiter.
+
+        Args:
+            rate: Starting requests per second
+            min_rate: Slowest rate backoff can reach
+            max_rate: Fastest rate additive increase can reach
+            burst: Maximum number of tokens that can accumulate
+            increase_step: Requests per second added per clean response
+            backoff_factor: Rate multiplier applied on throttling
+            cooldown: Seconds after a backoff during which throttles are not
+                counted again
+            clock: Monotonic time source in seconds
+        """
+        super().__init__(rate, burst, clock)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.backoff_factor = backoff_factor
+        self.cooldown = cooldown
+        self.throttled = 0
+        self.backoffs = 0
+        self._last_backoff = float("-inf")
+
+    def on_response(self, throttled: bool, retry_after: Optional[float] = None) -> None:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if not throttled:
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+                return
+
+            self.throttled += 1
+            if now - self._last_backoff >= self.cooldown:
+                self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+                self._last_backoff = now
+                self.backoffs += 1
+            self._tokens = min(self._tokens, 0.0)  # Drop any saved-up burst
+            if retry_after:
+                # Hold the bucket closed: no tokens accrue before this point
+                self._updated = max(self._updated, now + retry_after)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "min_rate": self.min_rate,
+                "max_rate": self.max_rate,
+                "throttled": self.throttled,
+                "backoffs": self.backoffs,
+                "paused_for": max(self._updated - self._clock(), 0.0),
+            }
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """Parse a Retry-After header (delay in seconds or an HTTP date) into seconds.
+
+    Args:
+        value: Header value
+        now: Current time an HTTP date is measured from (defaults to now, UTC)
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - (now or datetime.now(timezone.utc))).total_seconds(), 0.0)
+
+
+def backoff_delay(attempt: int, base: float = RETRY_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Get a jittered exponential retry delay ("equal jitter").
+
+    Args:
+        attempt: Zero-based number of the attempt that just failed
+
+    Returns:
+        Seconds between half and all of min(cap, base * 2 ** attempt)
+    """
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+# Process-wide limiter so every scraper shares one request budget
+default_limiter = AdaptiveRateLimiter()
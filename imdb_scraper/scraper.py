@@ -3,19 +3,35 @@
 import time
 import re
 import logging
-from typing import List, Optional
-from urllib.parse import quote, urljoin
+import threading
+from dataclasses import replace
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import quote
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
 from .config import (
-    REQUEST_HEADERS, REQUEST_TIMEOUT, MAX_RETRIES, RETRY_DELAY,
-    IMDB_BASE_URL, IMDB_SEARCH_URL, IMDB_TITLE_URL,
-    MOVIE_SELECTORS, SEARCH_SELECTORS, MIN_REQUEST_DELAY
+    REQUEST_HEADERS, REQUEST_TIMEOUT, MAX_RETRIES, THROTTLE_STATUSES,
+    MAX_RESPONSE_BYTES, STREAM_CHUNK_SIZE,
+    IMDB_BASE_URL, HTML_PARSER, BATCH_MAX_WORKERS, LOCAL_SCRAPED_FIELDS, FUZZY_MIN_SCORE,
+    STALE_WHILE_REVALIDATE, CATALOG_QUERY_LIMIT
 )
-from .models import Movie, SearchResult
+from .models import Movie, SearchResult, ScraperError, SEARCH_RESULT_FIELDS, movie_fields
+from .parsing import (
+    PageReader, parse_search_page, parse_title_page, parse_title_fields, parse_title_lazy,
+    movie_from_search_result
+)
+from .backends import get_backend
 from .history import SearchHistory
+from .fuzzy import FuzzyTitleIndex, title_similarity
+from .cache import ResponseCache, MovieCache
+from .catalog import MovieCatalog
+from .ratelimit import TokenBucket, default_limiter, backoff_delay, parse_retry_after
+from .title_index import TitleIndex
+from .singleflight import SingleFlight, default_flight, query_key
+from .metrics import metrics
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -25,20 +41,79 @@ logger = logging.getLogger(__name__)
 class IMDbScraper:
     """IMDb scraper with anti-bot protection and error handling."""
 
-    def __init__(self, test_mode: bool = False):
+    def __init__(self, test_mode: bool = False, use_cache: bool = True,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 history: Optional[SearchHistory] = None,
+                 base_url: str = IMDB_BASE_URL, parser: str = HTML_PARSER,
+                 title_index: Optional[TitleIndex] = None,
+                 fuzzy_index: Optional[FuzzyTitleIndex] = None,
+                 stale_while_revalidate: bool = STALE_WHILE_REVALIDATE,
+                 single_flight: Optional[SingleFlight] = None,
+                 catalog: Optional[MovieCatalog] = None):
         """Initialize scraper with session management.
 
         Args:
             test_mode: If True, use test data instead of scraping IMDb
+            use_cache: If True, serve repeat requests from the on-disk response
+                and movie caches
+            rate_limiter: Token bucket to draw requests from (defaults to the
+                process-wide limiter)
+            history: Search history to record to (defaults to search_history.json)
+            base_url: IMDb site root, overridable to point at a local stub server
+            parser: HTML parser backend for the selector fallback path
+                ("html.parser", "lxml" or "selectolax")
+            title_index: Local index of the IMDb datasets; when given, the
+                scraper runs local-first: queries resolve from the index and
+                only LOCAL_SCRAPED_FIELDS (plot, cast) are scraped
+            fuzzy_index: Fuzzy index of known titles (defaults to one built
+                from the movie cache and resolved queries in history)
+            stale_while_revalidate: If True, an expired cached movie is returned
+                immediately and refreshed on a background thread
+            single_flight: Coalesces concurrent identical lookups (defaults to
+                the process-wide instance shared by all scrapers)
+            catalog: Catalog every fetched movie is recorded to and catalog
+                queries are answered from (defaults to movie_catalog.sqlite3
+                when use_cache is True)
         """
         self.test_mode = test_mode
+        self.base_url = base_url.rstrip('/')
+        self.search_url = f"{self.base_url}/find/"
+        self.title_url = f"{self.base_url}/title/"
+        self.backend = get_backend(parser)
+        self.cache: Optional[ResponseCache] = None
+        self.movie_cache: Optional[MovieCache] = None
+        self.title_index = title_index
+        self.catalog = catalog
         if test_mode:
             self.test_data = self._load_test_data()
         else:
             self.session = requests.Session()
             self.session.headers.update(REQUEST_HEADERS)
-            self.last_request_time = 0
-        self.history = SearchHistory()
+            # Size the pool so batch workers reuse connections instead of discarding them
+            adapter = HTTPAdapter(pool_maxsize=BATCH_MAX_WORKERS)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+            self.rate_limiter = rate_limiter or default_limiter
+            if use_cache:
+                self.cache = ResponseCache()
+                self.movie_cache = MovieCache()
+                if catalog is None:
+                    self.catalog = MovieCatalog()
+        self.history = history or SearchHistory()
+        if fuzzy_index is None:
+            movies = self.movie_cache.titles() if self.movie_cache is not None else ()
+            fuzzy_index = FuzzyTitleIndex.build(movies, self.history.resolved_queries(), self.base_url)
+        self.fuzzy_index = fuzzy_index
+        self.stale_while_revalidate = stale_while_revalidate
+        self.single_flight = single_flight or default_flight
+        # Only scrapers reading the same source may share in-flight results
+        self._flight_scope = "test" if test_mode else self.base_url
+        self._refresher: Optional[ThreadPoolExecutor] = None
+        self._refreshing: Set[str] = set()
+        self._refresh_lock = threading.Lock()
+        # Per-thread fetch state: requests sent, and a flag set when a fetch gives
+        # up on an error worth retrying later
+        self._fetch_state = threading.local()
 
     def _load_test_data(self) -> dict:
         """Load test movie data from file."""
@@ -52,370 +127,409 @@ class IMDbScraper:
 
     def _rate_limit(self):
         """Implement rate limiting between requests."""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < MIN_REQUEST_DELAY:
-            delay = MIN_REQUEST_DELAY - elapsed
-            time.sleep(delay)
-        self.last_request_time = time.time()
-
-    def _make_request(self, url: str, max_retries: int = MAX_RETRIES) -> Optional[BeautifulSoup]:
-        """Make HTTP request with retry logic and error handling."""
+        metrics.observe("rate_limit_wait", self.rate_limiter.acquire())
+
+    def _fetch(self, url: str, max_retries: int = MAX_RETRIES,
+               complete: bool = False) -> Optional[bytes]:
+        """Get a response body from the cache or via HTTP with retry logic."""
+        return self._fetch_page(url, max_retries, complete)[0]
+
+    def _fetch_page(self, url: str, max_retries: int = MAX_RETRIES, complete: bool = False,
+                    revalidate: bool = False) -> Tuple[Optional[bytes], bool]:
+        """Get a response body, revalidating an expired cache entry with a conditional GET.
+
+        The body is streamed: headers are checked before any of it is read,
+        and reading stops once the page's embedded JSON has arrived (unless
+        complete is True) or the body passes MAX_RESPONSE_BYTES. A cached body
+        cut short that way is ignored when complete is True. With revalidate,
+        a cached entry is revalidated even while still fresh.
+
+        Returns:
+            (body or None, True if the server answered 304 Not Modified)
+        """
+        cached = self.cache.lookup(url) if self.cache is not None else None
+        if cached is not None and complete and not cached.complete:
+            cached = None  # Stored after an early exit; a 304 would not give us the rest either
+        if cached is not None and cached.fresh and not revalidate:
+            logger.debug(f"Cache hit for: {url}")
+            metrics.inc("response_cache_hits")
+            return cached.body, False
+        if self.cache is not None:
+            metrics.inc("response_cache_misses")
+        headers = cached.validators() if cached is not None else {}
+
         for attempt in range(max_retries):
             try:
                 self._rate_limit()
                 logger.info(f"Making request to: {url} (attempt {attempt + 1})")
-
-                response = self.session.get(url, timeout=REQUEST_TIMEOUT)
-                response.raise_for_status()
-
-                # Check if we got a valid HTML response
-                if 'text/html' not in response.headers.get('content-type', ''):
-                    logger.warning(f"Non-HTML response from {url}")
-                    return None
-
-                return BeautifulSoup(response.content, 'html.parser')
+                metrics.inc("requests")
+                self._fetch_state.requests = self.requests_sent() + 1
+                if attempt:
+                    metrics.inc("retries")
+
+                with metrics.timer("http"):
+                    response = self.session.get(url, timeout=REQUEST_TIMEOUT, headers=headers,
+                                                stream=True)
+                with response:
+                    throttled = response.status_code in THROTTLE_STATUSES
+                    if throttled:
+                        metrics.inc("throttled")
+                    self.rate_limiter.on_response(
+                        throttled, parse_retry_after(response.headers.get('Retry-After')) if throttled else None
+                    )
+                    if 400 <= response.status_code < 500 and not throttled:
+                        logger.warning(f"HTTP {response.status_code} for {url}, not retrying")
+                        return None, False
+                    response.raise_for_status()
+
+                    if response.status_code == 304 and cached is not None:
+                        logger.debug(f"Not modified: {url}")
+                        metrics.inc("not_modified")
+                        self.cache.revalidated(url)
+                        return cached.body, True
+
+                    # Check if we got a valid HTML response before downloading it
+                    if 'text/html' not in response.headers.get('content-type', ''):
+                        logger.warning(f"Non-HTML response from {url}")
+                        return None, False
+                    if int(response.headers.get('content-length') or 0) > MAX_RESPONSE_BYTES:
+                        logger.warning(f"Response from {url} too large: "
+                                       f"{response.headers['content-length']} bytes")
+                        return None, False
+
+                    with metrics.timer("download"):
+                        reader = self._read_body(response, url, complete)
+                if reader is None:
+                    return None, False
+
+                if self.cache is not None:
+                    self.cache.set(url, reader.body, response.headers.get('ETag'),
+                                   response.headers.get('Last-Modified'), not reader.exited_early)
+                return reader.body, False
 
             except requests.exceptions.RequestException as e:
                 logger.warning(f"Request failed (attempt {attempt + 1}): {e}")
+                metrics.inc("request_errors")
                 if attempt < max_retries - 1:
-                    delay = RETRY_DELAY * (attempt + 1)  # Exponential backoff
-                    time.sleep(delay)
+                    # Jittered exponential backoff; a Retry-After pause is applied by the limiter
+                    time.sleep(backoff_delay(attempt))
                 else:
                     logger.error(f"Failed to fetch {url} after {max_retries} attempts")
-                    return None
+                    self._fetch_state.failed = True
+                    return None, False
             except Exception as e:
                 logger.error(f"Unexpected error fetching {url}: {e}")
-                return None
+                self._fetch_state.failed = True
+                return None, False
 
-        return None
+        return None, False
 
-    def _extract_text_safe(self, soup: BeautifulSoup, selector: str) -> Optional[str]:
-        """Safely extract text from a CSS selector."""
-        try:
-            element = soup.select_one(selector)
-            return element.get_text(strip=True) if element else None
-        except Exception as e:
-            logger.warning(f"Failed to extract text with selector '{selector}': {e}")
-            return None
+    def requests_sent(self) -> int:
+        """Get the HTTP requests, retries included, this scraper has sent from the calling thread."""
+        return getattr(self._fetch_state, 'requests', 0)
 
-    def _extract_multiple_text(self, soup: BeautifulSoup, selector: str, limit: int = 5) -> List[str]:
-        """Extract text from multiple elements matching a selector."""
-        try:
-            elements = soup.select(selector)[:limit]
-            return [elem.get_text(strip=True) for elem in elements if elem.get_text(strip=True)]
-        except Exception as e:
-            logger.warning(f"Failed to extract multiple text with selector '{selector}': {e}")
-            return []
+    @staticmethod
+    def _read_body(response: requests.Response, url: str,
+                   complete: bool = False) -> Optional[PageReader]:
+        """Stream and decompress a response body, stopping early once the page data is in.
+
+        Abandoning the rest of the body closes the connection rather than
+        returning it to the pool, a reconnect traded for the skipped download.
+
+        Returns:
+            The reader holding the body, or None if the body was too large
+        """
+        reader = PageReader(early_exit=not complete)
+        for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+            if reader.feed(chunk):
+                break
+        raw = getattr(response.raw, 'tell', None)
+        metrics.inc("bytes_downloaded", raw() if raw is not None else len(reader.body))
+        if reader.too_large:
+            logger.warning(f"Response from {url} exceeded {reader.max_bytes} bytes, discarded")
+            return None
+        if reader.exited_early:
+            metrics.inc("early_exits")
+        return reader
+
+    def _make_request(self, url: str, max_retries: int = MAX_RETRIES) -> Optional[Any]:
+        """Make HTTP request and parse the page with the configured HTML backend."""
+        content = self._fetch(url, max_retries, complete=True)
+        if content is None:
+            return None
+        with metrics.timer("parse_html"):
+            return self.backend.parse(content)
 
     def search_movies(self, query: str, max_results: int = 5) -> List[SearchResult]:
         """Search for movies by title and return search results."""
         if not query or not query.strip():
             return []
+        return self._search(query, max_results) or []
 
+    def _search(self, query: str, max_results: int) -> Optional[List[SearchResult]]:
+        """Search IMDb, returning None (rather than no results) if the page could not be fetched."""
         # URL encode the query
         encoded_query = quote(query.strip())
-        search_url = f"{IMDB_SEARCH_URL}?q={encoded_query}&s=tt&ttype=ft&ref_=fn_ft"
+        search_url = f"{self.search_url}?q={encoded_query}&s=tt&ttype=ft&ref_=fn_ft"
 
-        soup = self._make_request(search_url)
-        if not soup:
-            return []
-
-        results = []
-
-        try:
-            # IMDb now uses React/JSON embedded in script tags
-            # Look for script tags containing JSON data
-            script_tags = soup.find_all('script', type='application/json')
-
-            for script in script_tags:
-                try:
-                    import json
-                    script_content = script.string
-                    if not script_content:
-                        continue
-                    data = json.loads(script_content)
-
-                    # Navigate to the title results
-                    title_results = data.get('props', {}).get('pageProps', {}).get('titleResults', {}).get('results', [])
-
-                    for item in title_results[:max_results]:
-                        title = item.get('titleNameText', '').strip()
-                        if not title:
-                            continue
-
-                        # Extract year from titleReleaseText
-                        year = None
-                        release_text = item.get('titleReleaseText', '')
-                        if release_text:
-                            year_match = re.search(r'\b(19|20)\d{2}\b', release_text)
-                            if year_match:
-                                year = int(year_match.group())
-
-                        # Build full URL
-                        imdb_id = item.get('id', '')
-                        url = f"{IMDB_TITLE_URL}{imdb_id}/" if imdb_id else None
-
-                        # Calculate relevance score
-                        query_lower = query.lower()
-                        title_lower = title.lower()
-                        score = 1.0 if query_lower in title_lower else 0.5
-
-                        result = SearchResult(
-                            title=title,
-                            year=year,
-                            imdb_id=imdb_id,
-                            url=url,
-                            relevance_score=score
-                        )
-                        results.append(result)
-
-                except (json.JSONDecodeError, KeyError, AttributeError):
-                    # Not the right script tag, continue
-                    continue
-
-            # Fallback: try to parse traditional HTML if JSON parsing failed
-            if not results:
-                logger.info("JSON parsing failed, trying HTML fallback")
-                result_elements = soup.select(SEARCH_SELECTORS["results"])
-
-                for element in result_elements[:max_results]:
-                    try:
-                        title_link = element.select_one(SEARCH_SELECTORS["title_link"])
-                        if not title_link:
-                            continue
-
-                        title = title_link.get_text(strip=True)
-                        href = title_link.get('href', '')
-                        if isinstance(href, list):
-                            href = href[0] if href else ''
-                        url = urljoin(IMDB_BASE_URL, href)
-
-                        imdb_id_match = re.search(r'/title/(tt\d+)/', str(url))
-                        imdb_id = imdb_id_match.group(1) if imdb_id_match else None
-
-                        year_elem = element.select_one(SEARCH_SELECTORS["year"])
-                        year = None
-                        if year_elem:
-                            year_text = year_elem.get_text(strip=True)
-                            year_match = re.search(r'\b(19|20)\d{2}\b', year_text)
-                            if year_match:
-                                year = int(year_match.group())
-
-                        query_lower = query.lower()
-                        title_lower = title.lower()
-                        score = 1.0 if query_lower in title_lower else 0.5
-
-                        result = SearchResult(
-                            title=title,
-                            year=year,
-                            imdb_id=imdb_id,
-                            url=url,
-                            relevance_score=score
-                        )
-                        results.append(result)
-
-                    except Exception as e:
-                        logger.warning(f"Failed to parse search result: {e}")
-                        continue
+        content = self._fetch(search_url)
+        if not content:
+            return None
 
-        except Exception as e:
-            logger.error(f"Failed to parse search results: {e}")
+        return parse_search_page(content, query, max_results, self.base_url, self.backend)
 
-        # Sort by relevance score
-        results.sort(key=lambda x: x.relevance_score, reverse=True)
-        return results
+    def get_movie_details(self, imdb_id: str,
+                          fields: Optional[Iterable[str]] = None) -> Optional[Movie]:
+        """Get detailed movie information by IMDb ID.
 
-    def get_movie_details(self, imdb_id: str) -> Optional[Movie]:
-        """Get detailed movie information by IMDb ID."""
+        Args:
+            imdb_id: IMDb title ID (e.g. tt0133093)
+            fields: Movie fields the caller needs. Only these (plus title and
+                year) are extracted from the title page; the result is a
+                LazyMovie that extracts the rest on first access and is not
+                stored in the movie cache. A cached Movie is returned as is.
+
+        Returns:
+            The movie, or None if it could not be found
+        """
         if not imdb_id or not imdb_id.startswith('tt'):
             return None
+        if fields is not None:
+            fields = movie_fields(fields)
+
+        if self.movie_cache is not None:
+            cached = self.movie_cache.get(imdb_id)
+            if cached is not None:
+                logger.debug(f"Movie cache hit for: {imdb_id}")
+                metrics.inc("movie_cache_hits")
+                return cached
+            metrics.inc("movie_cache_misses")
+            if self.stale_while_revalidate:
+                stale = self.movie_cache.get_stale(imdb_id)
+                if stale is not None:
+                    logger.debug(f"Serving stale movie while revalidating: {imdb_id}")
+                    self._refresh_in_background(imdb_id)
+                    return stale
+
+        if fields is not None:
+            movie, _ = self._do_once(("movie", self._flight_scope, imdb_id, fields),
+                                     lambda: self._load_partial(imdb_id, fields))
+            return movie
+        return self._load_movie_once(imdb_id)
 
-        movie_url = f"{IMDB_TITLE_URL}{imdb_id}/"
-        soup = self._make_request(movie_url)
-        if not soup:
-            return None
+    def refresh_movie(self, imdb_id: str) -> Optional[Movie]:
+        """Reload a movie bypassing the movie cache, and cache the result.
 
-        try:
-            # IMDb now uses JSON data embedded in script tags
-            script_tags = soup.find_all('script', type='application/json')
-
-            movie_data = None
-            for script in script_tags:
-                try:
-                    import json
-                    script_content = script.string
-                    if not script_content:
-                        continue
-                    data = json.loads(script_content)
-
-                    # Extract data from pageProps
-                    page_props = data.get('props', {}).get('pageProps', {})
-                    if page_props:
-                        movie_data = page_props
-                        break
-
-                except (json.JSONDecodeError, KeyError, AttributeError):
-                    continue
-
-            if not movie_data:
-                # Fallback to HTML parsing if JSON fails
-                logger.warning(f"JSON parsing failed for {imdb_id}, using HTML fallback")
-                return self._get_movie_details_html(soup, imdb_id, movie_url)
-
-            # Extract data from aboveTheFoldData
-            above_fold = movie_data.get('aboveTheFoldData', {})
-
-            title = above_fold.get('titleText', {}).get('text', '').strip()
-            if not title:
-                return None
+        A cached title page is revalidated with a conditional GET even while
+        it is still fresh (title pages outlive parsed movies, see
+        TITLE_CACHE_TTL), so a refresh costs one request, usually a 304.
+        """
+        return self._load_movie_once(imdb_id, revalidate=True)
 
-            # Extract year
-            year = above_fold.get('releaseYear', {}).get('year')
-
-            # Extract rating
-            rating = above_fold.get('ratingsSummary', {}).get('aggregateRating')
-
-            # Extract runtime
-            runtime = None
-            runtime_data = above_fold.get('runtime', {})
-            if runtime_data:
-                display_prop = runtime_data.get('displayableProperty', {}).get('value', {}).get('plainText')
-                if display_prop:
-                    runtime = display_prop
-
-            # Extract genres
-            genres = []
-            genres_data = above_fold.get('genres', {}).get('genres', [])
-            genres = [genre.get('text', '') for genre in genres_data if genre.get('text')]
-
-            # Extract director - try different sources
-            director = None
-
-            # Try mainColumnData crew first
-            main_column = movie_data.get('mainColumnData', {})
-            crew_data = main_column.get('crewV2', [])
-            for crew_item in crew_data:
-                grouping = crew_item.get('grouping', {})
-                category = grouping.get('text', '')
-                if category == 'Director':
-                    credits = crew_item.get('credits', [])
-                    if credits:
-                        director = credits[0].get('name', {}).get('nameText', {}).get('text', '')
-                        break
-
-            # Fallback: try principalCredits
-            if not director:
-                principal_credits = above_fold.get('principalCredits', [])
-                for credit in principal_credits:
-                    if credit.get('category', {}).get('text') == 'Director':
-                        directors = credit.get('credits', [])
-                        if directors:
-                            director = directors[0].get('name', {}).get('nameText', {}).get('text', '')
-                            break
-
-            # Final fallback: directorsPageTitle
-            if not director:
-                directors_page = above_fold.get('directorsPageTitle', [])
-                if directors_page and len(directors_page) > 0:
-                    director = directors_page[0].get('name', {}).get('nameText', {}).get('text', '')
-
-            # Extract cast
-            cast = []
-            cast_data = above_fold.get('castPageTitle', {}).get('edges', [])
-            cast = [edge.get('node', {}).get('name', {}).get('nameText', {}).get('text', '')
-                   for edge in cast_data[:5] if edge.get('node', {}).get('name')]
-
-            # Extract plot
-            plot = None
-            plot_data = above_fold.get('plot', {}).get('plotText', {}).get('plainText')
-            if plot_data:
-                plot = plot_data.strip()
-
-            movie = Movie(
-                title=title,
-                year=year,
-                rating=rating,
-                runtime=runtime,
-                genres=genres,
-                director=director,
-                cast=cast,
-                plot=plot,
-                imdb_id=imdb_id,
-                url=movie_url
-            )
+    def _load_movie_once(self, imdb_id: str, revalidate: bool = False) -> Optional[Movie]:
+        """Load a movie, sharing the work with concurrent loads of the same ID."""
+        movie, _ = self._do_once(("movie", self._flight_scope, imdb_id, revalidate),
+                                 lambda: self._load_movie(imdb_id, revalidate))
+        return movie
 
-            return movie
+    def _do_once(self, key: Tuple, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn through single-flight, passing a failed fetch on to every caller sharing it.
 
-        except Exception as e:
-            logger.error(f"Failed to parse movie details for {imdb_id}: {e}")
+        The fetch failure flag is per thread, and only the leading caller's
+        thread runs fn; its flag travels with the shared result so callers
+        that waited on it can tell a failed fetch from a movie not found.
+
+        Returns:
+            (result, True if it was shared from another caller's call)
+        """
+        def run() -> Tuple[Any, bool]:
+            failed_before = getattr(self._fetch_state, 'failed', False)
+            self._fetch_state.failed = False
+            try:
+                return fn(), self._fetch_state.failed
+            finally:
+                self._fetch_state.failed = failed_before or self._fetch_state.failed
+
+        (result, failed), shared = self.single_flight.do(key, run)
+        if failed:
+            self._fetch_state.failed = True
+        return result, shared
+
+    def _load_movie(self, imdb_id: str, revalidate: bool = False) -> Optional[Movie]:
+        """Build a Movie from the network (or title index) and cache it.
+
+        Args:
+            imdb_id: IMDb title ID
+            revalidate: Revalidate the cached title page even if still fresh
+        """
+        movie = None
+        if self.title_index is not None:
+            movie = self._local_movie_details(imdb_id, revalidate)
+        if movie is None:
+            movie = self._scrape_movie_details(imdb_id, revalidate)
+        if movie and self.movie_cache is not None:
+            self.movie_cache.set(movie)
+        if movie and self.catalog is not None:
+            self.catalog.upsert(movie)
+        if movie:
+            self.fuzzy_index.add(imdb_id, movie.title, movie.year)
+        return movie
+
+    def _load_partial(self, imdb_id: str, fields: Tuple[str, ...]) -> Optional[Movie]:
+        """Build a Movie with only some fields extracted up front."""
+        movie_url = f"{self.title_url}{imdb_id}/"
+        if self.title_index is not None:
+            if not set(fields) & set(LOCAL_SCRAPED_FIELDS):
+                movie = self.title_index.get(imdb_id)
+                if movie is not None:
+                    return replace(movie, url=movie_url)
+            return self._load_movie_once(imdb_id)
+
+        content, not_modified = self._fetch_page(movie_url)
+        if not content:
             return None
+        if not_modified:
+            movie = self._unchanged_movie(imdb_id)
+            if movie is not None:
+                return movie
 
-    def _get_movie_details_html(self, soup: BeautifulSoup, imdb_id: str, movie_url: str) -> Optional[Movie]:
-        """Fallback HTML parsing for movie details."""
+        movie = parse_title_lazy(content, fields, imdb_id, movie_url, self.backend)
+        if movie:
+            self.fuzzy_index.add(imdb_id, movie.title, movie.year)
+        return movie
+
+    def _refresh_in_background(self, imdb_id: str) -> None:
+        """Queue a refresh of a cached movie, unless one is already pending."""
+        with self._refresh_lock:
+            if imdb_id in self._refreshing:
+                return
+            self._refreshing.add(imdb_id)
+            if self._refresher is None:
+                self._refresher = ThreadPoolExecutor(max_workers=1,
+                                                     thread_name_prefix="imdb-revalidate")
+        self._refresher.submit(self._refresh, imdb_id)
+
+    def _refresh(self, imdb_id: str) -> None:
         try:
-            # Extract basic information using old selectors
-            title = self._extract_text_safe(soup, MOVIE_SELECTORS["title"])
-            if not title:
-                return None
+            self.refresh_movie(imdb_id)
+        except Exception as e:
+            logger.error(f"Background refresh failed for {imdb_id}: {e}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing.discard(imdb_id)
+
+    def _unchanged_movie(self, imdb_id: str) -> Optional[Movie]:
+        """Get the cached Movie parsed from a title page the server reported unchanged."""
+        movie = self.movie_cache.get_stale(imdb_id) if self.movie_cache is not None else None
+        if movie is not None:
+            logger.debug(f"Title page not modified, reusing parsed movie: {imdb_id}")
+        return movie
+
+    def _scrape_movie_details(self, imdb_id: str, revalidate: bool = False) -> Optional[Movie]:
+        """Fetch and parse the title page for an IMDb ID."""
+        movie_url = f"{self.title_url}{imdb_id}/"
+        content, not_modified = self._fetch_page(movie_url, revalidate=revalidate)
+        if not content:
+            return None
+        if not_modified:
+            movie = self._unchanged_movie(imdb_id)
+            if movie is not None:
+                return movie
+
+        return parse_title_page(content, imdb_id, movie_url, self.backend)
 
-            # Extract year
-            year = None
-            year_text = self._extract_text_safe(soup, MOVIE_SELECTORS["year"])
-            if year_text:
-                year_match = re.search(r'\b(19|20)\d{2}\b', year_text)
-                if year_match:
-                    year = int(year_match.group())
-
-            # Extract rating
-            rating = None
-            rating_text = self._extract_text_safe(soup, MOVIE_SELECTORS["rating"])
-            if rating_text:
-                try:
-                    rating = float(rating_text.split('/')[0])
-                except (ValueError, IndexError):
-                    pass
-
-            # Extract other details
-            runtime = self._extract_text_safe(soup, MOVIE_SELECTORS["runtime"])
-            genres = self._extract_multiple_text(soup, MOVIE_SELECTORS["genres"])
-            director = self._extract_text_safe(soup, MOVIE_SELECTORS["director"])
-            cast = self._extract_multiple_text(soup, MOVIE_SELECTORS["cast"], limit=5)
-            plot = self._extract_text_safe(soup, MOVIE_SELECTORS["plot"])
-
-            movie = Movie(
-                title=title,
-                year=year,
-                rating=rating,
-                runtime=runtime,
-                genres=genres,
-                director=director,
-                cast=cast,
-                plot=plot,
-                imdb_id=imdb_id,
-                url=movie_url
-            )
+    def _local_movie_details(self, imdb_id: str, revalidate: bool = False) -> Optional[Movie]:
+        """Build a Movie from the title index, scraping only the fields it lacks."""
+        movie = self.title_index.get(imdb_id)
+        if movie is None:
+            return None
 
+        movie_url = f"{self.title_url}{imdb_id}/"
+        content, not_modified = self._fetch_page(movie_url, revalidate=revalidate)
+        if not content:
+            logger.warning(f"Could not scrape {', '.join(LOCAL_SCRAPED_FIELDS)} for {imdb_id}")
             return movie
+        if not_modified:
+            unchanged = self._unchanged_movie(imdb_id)
+            if unchanged is not None:
+                return unchanged
 
-        except Exception as e:
-            logger.error(f"HTML fallback failed for {imdb_id}: {e}")
-            return None
+        fields = parse_title_fields(content, LOCAL_SCRAPED_FIELDS, imdb_id, movie_url, self.backend)
+        return replace(movie, url=movie_url, **{name: value for name, value in fields.items()
+                                                if value is not None})
 
-    def search_and_get_movie(self, query: str) -> Optional[Movie]:
-        """Search for a movie and return the best match with full details."""
+    def search_and_get_movie(self, query: str,
+                             fields: Optional[Iterable[str]] = None) -> Optional[Movie]:
+        """Search for a movie and return the best match with full details.
+
+        Concurrent calls with the same query (ignoring case and spacing), from
+        any scraper in the process, share a single lookup.
+
+        Args:
+            query: Movie title
+            fields: Movie fields the caller needs (see get_movie_details). If
+                they are all among title, year, imdb_id and url, and the search
+                result (or the fuzzy index, for a query resolved locally or
+                before) carries them, the title page is only fetched if other
+                fields of the returned LazyMovie are read.
+        """
+        if fields is not None:
+            fields = movie_fields(fields)
+        movie, shared = self._do_once(("query", self._flight_scope, query_key(query), fields),
+                                      lambda: self._search_and_get_movie(query, fields))
+        if shared:
+            # The leading call recorded its own search; count this one as well
+            self.history.record_search(query, success=movie is not None, store_resolution=False)
+        return movie
+
+    def _search_and_get_movie(self, query: str,
+                              fields: Optional[Tuple[str, ...]] = None) -> Optional[Movie]:
         if self.test_mode:
             # Use test data
             query_lower = query.lower()
             if query_lower in self.test_data:
                 data = self.test_data[query_lower]
                 movie = Movie(**data)
-                self.history.record_search(query, success=True)
+                self.history.record_search(query, success=True, store_resolution=False)
                 return movie
             else:
-                self.history.record_search(query, success=False)
+                self.history.record_search(query, success=False, store_resolution=False)
                 return None
 
-        results = self.search_movies(query, max_results=1)
+        if self.title_index is not None:
+            local = self.title_index.find(query)
+            if local is not None:
+                movie = self.get_movie_details(local.imdb_id, fields)
+                # A failed title fetch is transient: don't store it as a resolution
+                self.history.record_search(query, success=movie is not None, imdb_id=local.imdb_id,
+                                           store_resolution=movie is not None)
+                return movie
+
+        if self.history.is_known_failure(query):
+            logger.info(f"Skipping recently failed query: {query}")
+            self.history.record_search(query, success=False, store_resolution=False)
+            return None
+
+        imdb_id = self.fuzzy_index.resolve(query)
+        if imdb_id:
+            movie = self._indexed_movie(imdb_id, fields) or self.get_movie_details(imdb_id, fields)
+            if movie:
+                logger.debug(f"Fuzzy index match for {query}: {imdb_id}")
+                self.history.record_search(query, success=True, imdb_id=imdb_id)
+                return movie
+
+        imdb_id = self.history.get_resolved_id(query)
+        if imdb_id:
+            movie = self._indexed_movie(imdb_id, fields) or self.get_movie_details(imdb_id, fields)
+            if movie:
+                self.history.record_search(query, success=True, store_resolution=False)
+                return movie
+
+        results = self._search(query, max_results=1) if query.strip() else []
+        if results is None:
+            # Fetch failed (network, throttling): count it but don't cache it as a miss
+            self.history.record_search(query, success=False, store_resolution=False)
+            return None
         if not results:
             self.history.record_search(query, success=False)
             return None
@@ -425,10 +539,140 @@ class IMDbScraper:
             self.history.record_search(query, success=False)
             return None
 
-        movie = self.get_movie_details(best_result.imdb_id)
-        if movie and query.lower() not in movie.title.lower():
+        movie = None
+        if fields is not None and set(fields) <= set(SEARCH_RESULT_FIELDS):
+            movie = self._movie_from_result(best_result)
+        if movie is None:
+            movie = self.get_movie_details(best_result.imdb_id, fields)
+        if movie and title_similarity(query, movie.title, movie.year) < FUZZY_MIN_SCORE:
             # Movie title doesn't match query, treat as not found
             self.history.record_search(query, success=False)
             return None
-        self.history.record_search(query, success=movie is not None)
-        return movie
\ No newline at end of file
+        # A failed title fetch is transient: don't store it as a resolution
+        self.history.record_search(query, success=movie is not None, imdb_id=best_result.imdb_id,
+                                   store_resolution=movie is not None)
+        if movie:
+            self.fuzzy_index.add(movie.imdb_id, query, alias=True)
+        return movie
+
+    def _indexed_movie(self, imdb_id: str,
+                       fields: Optional[Tuple[str, ...]]) -> Optional[Movie]:
+        """Answer from the fuzzy index's title and year when they are all the caller needs."""
+        if fields is None or not set(fields) <= set(SEARCH_RESULT_FIELDS):
+            return None
+        known = self.fuzzy_index.get(imdb_id)
+        if known is None or (known.year is None and "year" in fields):
+            return None  # A year the index lacks may still be on the title page
+        return self._movie_from_result(known)
+
+    def _movie_from_result(self, result: SearchResult) -> Optional[Movie]:
+        """Answer from a search result, deferring the title page fetch until other fields are read."""
+        imdb_id = result.imdb_id
+        movie = movie_from_search_result(result, f"{self.title_url}{imdb_id}/",
+                                         lambda: self.get_movie_details(imdb_id))
+        if movie:
+            self.fuzzy_index.add(imdb_id, movie.title, movie.year)
+        return movie
+
+    def movies_by_director(self, name: str, limit: int = CATALOG_QUERY_LIMIT) -> List[Movie]:
+        """Get catalogued movies by a director, newest first (no requests are made)."""
+        return self.catalog.by_director(name, limit) if self.catalog is not None else []
+
+    def movies_with_cast(self, name: str, limit: int = CATALOG_QUERY_LIMIT) -> List[Movie]:
+        """Get catalogued movies a cast member appears in, newest first (no requests are made)."""
+        return self.catalog.by_cast(name, limit) if self.catalog is not None else []
+
+    def top_rated(self, genre: Optional[str] = None, year_from: Optional[int] = None,
+                  year_to: Optional[int] = None, limit: int = CATALOG_QUERY_LIMIT) -> List[Movie]:
+        """Get the best rated catalogued movies, optionally in a genre and range of years.
+
+        Only movies fetched before (or bulk loaded into the catalog) are
+        considered; no requests are made.
+
+        Args:
+            genre: Only movies in this genre
+            year_from: Earliest release year, inclusive
+            year_to: Latest release year, inclusive
+            limit: Most movies returned
+        """
+        if self.catalog is None:
+            return []
+        return self.catalog.top_rated(genre, year_from, year_to, limit=limit)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get instrumentation and cache statistics.
+
+        Stage latencies and counters are only recorded while metrics are
+        enabled (metrics.enable() or METRICS_ENABLED); cache, rate limiter and
+        coalescing statistics are always available.
+
+        Returns:
+            Dict with "metrics", "response_cache", "movie_cache", "catalog",
+            "rate_limiter" and "single_flight" sections
+        """
+        return {
+            "metrics": metrics.stats(),
+            "response_cache": self.cache.stats() if self.cache is not None else None,
+            "movie_cache": self.movie_cache.stats() if self.movie_cache is not None else None,
+            "catalog": self.catalog.stats() if self.catalog is not None else None,
+            "rate_limiter": self.rate_limiter.stats() if not self.test_mode else None,
+            "single_flight": self.single_flight.stats(),
+        }
+
+    def _lookup(self, item: str,
+                fields: Optional[Iterable[str]] = None) -> Union[Movie, ScraperError]:
+        """Resolve one batch item (query or IMDb ID) to a Movie or an error.
+
+        A lookup that came back empty because a fetch failed (network errors,
+        5xx or throttling past the retries) is a "fetch_failed" error, worth
+        retrying later; otherwise the item is "not_found".
+        """
+        is_id = re.fullmatch(r'tt\d+', item) is not None
+        url = f"{self.title_url}{item}/" if is_id else None
+        self._fetch_state.failed = False
+        try:
+            movie = (self.get_movie_details(item, fields) if is_id
+                     else self.search_and_get_movie(item, fields))
+        except Exception as e:
+            logger.error(f"Batch lookup failed for {item}: {e}")
+            return ScraperError(error_type=type(e).__name__, message=str(e), url=url)
+
+        if movie is None and self._fetch_state.failed:
+            return ScraperError(error_type="fetch_failed", message=f"Could not fetch: {item}", url=url)
+        if movie is None:
+            return ScraperError(error_type="not_found", message=f"No movie found for: {item}", url=url)
+        return movie
+
+    def get_many(self, queries: Iterable[str], max_workers: int = BATCH_MAX_WORKERS,
+                 fields: Optional[Iterable[str]] = None
+                 ) -> Iterator[Tuple[str, Union[Movie, ScraperError]]]:
+        """Look up many queries or IMDb IDs concurrently.
+
+        Items are read lazily and at most 2 * max_workers lookups are pending at
+        a time, so arbitrarily long inputs run in bounded memory. All workers
+        share this scraper's session, caches and rate limiter.
+
+        Args:
+            queries: Movie titles or IMDb IDs (e.g. tt0133093)
+            max_workers: Number of worker threads
+            fields: Movie fields needed from each lookup (see get_movie_details)
+
+        Yields:
+            (item, Movie or ScraperError) tuples in completion order
+        """
+        items = (q.strip() for q in queries if q and q.strip())
+        if fields is not None:
+            fields = movie_fields(fields)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            for item in items:
+                pending[executor.submit(self._lookup, item, fields)] = item
+                if len(pending) >= max_workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield pending.pop(future), future.result()
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield pending.pop(future), future.result()
@@ -0,0 +1,127 @@
+"""Process-wide coalescing of concurrent identical lookups (single-flight)."""
+
+import asyncio
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+def query_key(query: str) -> str:
+    """Normalize a query for coalescing (case and whitespace insensitive)."""
+    return " ".join(query.lower().split())
+
+
+class _Call:
+    """One in-flight call that later arrivals wait on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its outcome.
+
+    Keys are tuples whose first item names the kind of lookup ("query",
+    "movie"), which is how coalesced calls are broken down in stats(). The
+    first caller for a key (the leader) runs the function; callers arriving
+    while it runs block until it finishes and get the same result, or the
+    same exception. Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.executed = 0
+        self.coalesced: Counter = Counter()
+        self._inflight: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[int, Hashable], "asyncio.Future"] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Tuple, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn, or wait for the identical call already in flight.
+
+        Args:
+            key: Identifies the lookup, e.g. ("movie", base_url, imdb_id)
+            fn: Performs the lookup
+
+        Returns:
+            (result, True if it was shared from another caller's call)
+        """
+        with self._lock:
+            self.calls += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+                self.executed += 1
+            else:
+                self.coalesced[key[0]] += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+        return call.result, False
+
+    async def do_async(self, key: Tuple, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await fn(), or the identical call already in flight on this event loop.
+
+        Args:
+            key: Identifies the lookup, e.g. ("movie", base_url, imdb_id)
+            fn: Returns the awaitable performing the lookup
+
+        Returns:
+            (result, True if it was shared from another caller's call)
+        """
+        task_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            self.calls += 1
+            future = self._tasks.get(task_key)
+            shared = future is not None
+            if shared:
+                self.coalesced[key[0]] += 1
+            else:
+                future = self._tasks[task_key] = asyncio.ensure_future(fn())
+                self.executed += 1
+                future.add_done_callback(lambda _: self._forget_task(task_key))
+        # Shielded so one cancelled caller does not cancel the lookup for the others
+        return await asyncio.shield(future), shared
+
+    def _forget_task(self, task_key: Tuple[int, Hashable]) -> None:
+        with self._lock:
+            self._tasks.pop(task_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics.
+
+        Returns:
+            Calls made, calls actually executed, calls coalesced (in total and
+            per kind of lookup), the coalesced ratio and calls in flight
+        """
+        with self._lock:
+            coalesced = sum(self.coalesced.values())
+            return {
+                "calls": self.calls,
+                "executed": self.executed,
+                "coalesced": coalesced,
+                "coalesced_by_kind": dict(self.coalesced),
+                "coalesced_ratio": coalesced / self.calls if self.calls else 0.0,
+                "in_flight": len(self._inflight) + len(self._tasks),
+            }
+
+
+# Process-wide instance so every scraper (and Streamlit session) shares in-flight lookups
+default_flight = SingleFlight()
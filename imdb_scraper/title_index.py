@@ -0,0 +1,275 @@
+"""Local title index built from IMDb's public TSV datasets."""
+
+import gzip
+import logging
+import math
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .config import (
+    TITLE_INDEX_FILE, INGEST_CHUNK_SIZE, INGEST_TITLE_TYPES,
+    IMDB_BASE_URL, MAX_TITLE_LENGTH, VALID_YEAR_RANGE
+)
+from .models import Movie
+
+logger = logging.getLogger(__name__)
+
+# Dataset files in ingestion order; later files only update titles already indexed
+DATASET_FILES = ("title.basics", "title.ratings", "title.crew", "name.basics")
+
+_TITLE_KEY_RE = re.compile(r'[^\w]+')
+_NULL = "\\N"
+
+
+def title_key(title: str) -> str:
+    """Normalize a title or query for exact lookups."""
+    return _TITLE_KEY_RE.sub(' ', title.lower()).strip()
+
+
+def format_runtime(minutes: Optional[int]) -> Optional[str]:
+    """Format minutes the way IMDb title pages display runtime (e.g. "2h 16m")."""
+    if not minutes:
+        return None
+    hours, mins = divmod(minutes, 60)
+    if not hours:
+        return f"{mins}m"
+    return f"{hours}h {mins}m" if mins else f"{hours}h"
+
+
+def _open_tsv(path: Path):
+    """Open a dataset file as text, decompressing .gz files on the fly."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", newline="\n")
+    return open(path, "r", encoding="utf-8", newline="\n")
+
+
+def iter_tsv_chunks(path: Path, columns: Sequence[str],
+                    chunk_size: int = INGEST_CHUNK_SIZE) -> Iterator[List[Tuple[Optional[str], ...]]]:
+    """Stream a dataset file in chunks of rows.
+
+    IMDb TSVs are unquoted, tab-separated and use \\N for missing values, so
+    lines are split directly rather than through the csv module.
+
+    Args:
+        path: title.*.tsv(.gz) or name.basics.tsv(.gz) file
+        columns: Header names to keep, in the order returned
+        chunk_size: Rows per yielded chunk
+
+    Yields:
+        Lists of at most chunk_size row tuples (missing values are None)
+    """
+    with _open_tsv(path) as f:
+        header = f.readline().rstrip("\n").split("\t")
+        positions = [header.index(column) for column in columns]
+        width = len(header)
+        chunk = []
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) != width:
+                continue  # Malformed line
+            chunk.append(tuple(None if fields[i] == _NULL else fields[i] for i in positions))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    try:
+        number = float(value) if value is not None else None
+    except ValueError:
+        return None
+    return number if number is not None and math.isfinite(number) else None
+
+
+class TitleIndex:
+    """SQLite index of basic movie fields ingested from the IMDb TSV datasets."""
+
+    _COLUMNS = "imdb_id, title, year, runtime_minutes, genres, rating, director"
+
+    def __init__(self, index_file: str = TITLE_INDEX_FILE, base_url: str = IMDB_BASE_URL):
+        """Open (or create) the title index.
+
+        Args:
+            index_file: Path to the SQLite file (relative to project root)
+            base_url: IMDb site root used to build Movie URLs
+        """
+        self.index_file = Path(__file__).parent.parent / index_file
+        self.title_url = f"{base_url.rstrip('/')}/title/"
+        # Malformed rows skipped per dataset file by the last ingest
+        self.skipped: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.index_file), check_same_thread=False,
+                                     isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS titles ("
+            "imdb_id TEXT PRIMARY KEY, title TEXT NOT NULL, title_key TEXT NOT NULL, "
+            "year INTEGER, runtime_minutes INTEGER, genres TEXT, rating REAL, votes INTEGER, "
+            "director_id TEXT, director TEXT)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_titles_key ON titles(title_key)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_titles_director ON titles(director_id)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM titles").fetchone()[0]
+
+    def ingest(self, directory: str, chunk_size: int = INGEST_CHUNK_SIZE) -> Dict[str, int]:
+        """Ingest every dataset file found in a directory.
+
+        Files are streamed chunk by chunk, one transaction per chunk, so memory
+        use is bounded by chunk_size regardless of dataset size. Either
+        ``<name>.tsv.gz`` or an uncompressed ``<name>.tsv`` is accepted.
+        Rows with values that don't parse (e.g. a rating that is not a
+        number) are skipped and counted in self.skipped.
+
+        Args:
+            directory: Directory holding title.basics, title.ratings,
+                title.crew and name.basics files
+            chunk_size: Rows per transaction
+
+        Returns:
+            Rows read per dataset file
+        """
+        loaders: Dict[str, Tuple[Sequence[str], Callable[[List[tuple]], int]]] = {
+            "title.basics": (("tconst", "titleType", "primaryTitle", "startYear",
+                              "runtimeMinutes", "genres"), self._load_basics),
+            "title.ratings": (("tconst", "averageRating", "numVotes"), self._load_ratings),
+            "title.crew": (("tconst", "directors"), self._load_crew),
+            "name.basics": (("nconst", "primaryName"), self._load_names),
+        }
+
+        counts = {}
+        self.skipped = {}
+        for name in DATASET_FILES:
+            path = self._find_dataset(Path(directory), name)
+            if path is None:
+                logger.warning(f"Dataset {name} not found in {directory}, skipping")
+                continue
+
+            columns, load = loaders[name]
+            counts[name] = self.skipped[name] = 0
+            for chunk in iter_tsv_chunks(path, columns, chunk_size):
+                with self._lock:
+                    self._conn.execute("BEGIN")
+                    try:
+                        self.skipped[name] += load(chunk)
+                        self._conn.execute("COMMIT")
+                    except Exception:
+                        self._conn.execute("ROLLBACK")
+                        raise
+                counts[name] += len(chunk)
+            logger.info(f"Ingested {counts[name]} rows from {path.name}")
+            if self.skipped[name]:
+                logger.warning(f"Skipped {self.skipped[name]} malformed rows in {path.name}")
+        return counts
+
+    @staticmethod
+    def _find_dataset(directory: Path, name: str) -> Optional[Path]:
+        for suffix in (".tsv.gz", ".tsv"):
+            path = directory / f"{name}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def _load_basics(self, rows: List[tuple]) -> int:
+        movies = [
+            (imdb_id, title, title_key(title), _to_int(year), _to_int(runtime), genres)
+            for imdb_id, title_type, title, year, runtime, genres in rows
+            if title_type in INGEST_TITLE_TYPES and title and len(title) <= MAX_TITLE_LENGTH
+        ]
+        self._conn.executemany(
+            "INSERT INTO titles (imdb_id, title, title_key, year, runtime_minutes, genres) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(imdb_id) DO UPDATE SET "
+            "title = excluded.title, title_key = excluded.title_key, year = excluded.year, "
+            "runtime_minutes = excluded.runtime_minutes, genres = excluded.genres",
+            movies
+        )
+        return 0
+
+    def _load_ratings(self, rows: List[tuple]) -> int:
+        ratings = [(_to_float(rating), _to_int(votes), imdb_id)
+                   for imdb_id, rating, votes in rows if rating is not None]
+        valid = [row for row in ratings if row[0] is not None]
+        self._conn.executemany("UPDATE titles SET rating = ?, votes = ? WHERE imdb_id = ?", valid)
+        return len(ratings) - len(valid)
+
+    def _load_crew(self, rows: List[tuple]) -> int:
+        self._conn.executemany(
+            "UPDATE titles SET director_id = ? WHERE imdb_id = ?",
+            [(directors.split(",")[0], imdb_id) for imdb_id, directors in rows if directors]
+        )
+        return 0
+
+    def _load_names(self, rows: List[tuple]) -> int:
+        self._conn.executemany(
+            "UPDATE titles SET director = ? WHERE director_id = ?",
+            [(name, name_id) for name_id, name in rows if name]
+        )
+        return 0
+
+    def _movie_from_row(self, row: tuple) -> Movie:
+        imdb_id, title, year, runtime, genres, rating, director = row
+        low, high = VALID_YEAR_RANGE
+        return Movie(
+            title=title,
+            year=year if year is not None and low <= year <= high else None,
+            rating=rating,
+            runtime=format_runtime(runtime),
+            genres=genres.split(",") if genres else [],
+            director=director,
+            imdb_id=imdb_id,
+            url=f"{self.title_url}{imdb_id}/",
+        )
+
+    def get(self, imdb_id: str) -> Optional[Movie]:
+        """Get the indexed fields of a title.
+
+        Args:
+            imdb_id: IMDb title ID (e.g. tt0133093)
+
+        Returns:
+            A Movie without plot or cast, or None if the title is not indexed
+        """
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM titles WHERE imdb_id = ?", (imdb_id,)
+            ).fetchone()
+        return self._movie_from_row(row) if row else None
+
+    def find(self, query: str, year: Optional[int] = None) -> Optional[Movie]:
+        """Find the most voted title exactly matching a query.
+
+        Args:
+            query: Movie title (case and punctuation insensitive)
+            year: Release year to restrict the match to
+
+        Returns:
+            The best matching Movie without plot or cast, or None
+        """
+        sql = f"SELECT {self._COLUMNS} FROM titles WHERE title_key = ?"
+        params: List[Any] = [title_key(query)]
+        if year is not None:
+            sql += " AND year = ?"
+            params.append(year)
+        sql += " ORDER BY COALESCE(votes, 0) DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return self._movie_from_row(row) if row else None
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
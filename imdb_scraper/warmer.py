@@ -0,0 +1,146 @@
+"""Background cache warming for popular and recently searched queries."""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from .config import (
+    WARM_INTERVAL, WARM_TOP_N, WARM_RECENT_N, WARM_REQUEST_BUDGET, WARM_REFRESH_AHEAD
+)
+from .history import SearchHistory
+from .metrics import metrics
+from .scraper import IMDbScraper
+
+logger = logging.getLogger(__name__)
+
+
+class CacheWarmer:
+    """Keeps the movies behind popular and trending queries cached before they expire.
+
+    Each cycle takes the most popular and most recent queries from the search
+    history, looks up the IMDb ID each resolved to, and refreshes movies whose
+    cache entry is missing or expires within refresh_ahead seconds. A refresh
+    usually costs one request (a conditional GET when the title page is
+    cached), more when it is retried. Requests actually sent are counted
+    against budget; no refresh starts once a cycle has used it up (one
+    started just before may overrun it by its retries). Each refresh is only
+    started once the rate limiter has a token to spare, so warming never
+    queues ahead of user lookups.
+    """
+
+    def __init__(self, scraper: IMDbScraper, history: Optional[SearchHistory] = None,
+                 interval: float = WARM_INTERVAL, top_n: int = WARM_TOP_N,
+                 recent_n: int = WARM_RECENT_N, budget: int = WARM_REQUEST_BUDGET,
+                 refresh_ahead: float = WARM_REFRESH_AHEAD):
+        """Initialize the warmer; call start() to run it in the background.
+
+        Args:
+            scraper: Scraper whose caches are warmed (and whose limiter is used)
+            history: Search history to pick queries from (defaults to the scraper's)
+            interval: Seconds between cycles
+            top_n: Most popular queries kept warm
+            recent_n: Most recent queries kept warm
+            budget: Requests a cycle may make, retries included
+            refresh_ahead: Seconds before expiry a cached movie is refreshed
+        """
+        self.scraper = scraper
+        self.history = history or scraper.history
+        self.interval = interval
+        self.top_n = top_n
+        self.recent_n = recent_n
+        self.budget = budget
+        self.refresh_ahead = refresh_ahead
+        self.cycles = 0
+        self.last_cycle: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def candidates(self) -> List[str]:
+        """Get the IMDb IDs to keep warm, popular queries first."""
+        entries = (self.history.get_popular_searches(self.top_n)
+                   + self.history.get_recent_searches(self.recent_n))
+        ids: Dict[str, None] = {}
+        for entry in entries:
+            imdb_id = self.history.get_resolved_id(entry["query"])
+            if imdb_id:
+                ids[imdb_id] = None
+        return list(ids)
+
+    def run_once(self) -> Dict[str, int]:
+        """Run one warming cycle.
+
+        Returns:
+            Counts of candidates, movies refreshed, already fresh, failed and
+            deferred to the next cycle (over budget), and requests made
+        """
+        result = {"candidates": 0, "refreshed": 0, "fresh": 0, "failed": 0,
+                  "deferred": 0, "requests": 0}
+        movie_cache = self.scraper.movie_cache
+        if movie_cache is None:
+            return result  # Nothing to warm (test mode or caching disabled)
+
+        ids = self.candidates()
+        result["candidates"] = len(ids)
+        for imdb_id in ids:
+            expires_in = movie_cache.expires_in(imdb_id)
+            if expires_in is not None and expires_in > self.refresh_ahead:
+                result["fresh"] += 1
+                continue
+            if result["requests"] >= self.budget:
+                result["deferred"] += 1
+                continue
+            if not self._wait_for_spare_token():
+                break  # Stopped
+
+            # Counted on this thread only, so concurrent user lookups don't use up the budget
+            requests_before = self.scraper.requests_sent()
+            movie = self.scraper.refresh_movie(imdb_id)
+            result["requests"] += self.scraper.requests_sent() - requests_before
+            result["refreshed" if movie is not None else "failed"] += 1
+
+        self.cycles += 1
+        self.last_cycle = result
+        metrics.inc("warm_refreshes", result["refreshed"])
+        metrics.inc("warm_requests", result["requests"])
+        return result
+
+    def _wait_for_spare_token(self) -> bool:
+        """Wait until the rate limiter has a token nobody is waiting for.
+
+        Returns:
+            False if the warmer was stopped while waiting
+        """
+        limiter = self.scraper.rate_limiter
+        while not self._stop.is_set():
+            if limiter.available() >= 1:
+                return True
+            self._stop.wait(1.0 / limiter.rate)
+        return False
+
+    def start(self) -> "CacheWarmer":
+        """Run cycles every interval seconds on a daemon thread."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="imdb-cache-warmer", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread, waiting up to timeout seconds for it to exit."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                result = self.run_once()
+                logger.info(f"Cache warming: {result}")
+            except Exception as e:
+                logger.error(f"Cache warming cycle failed: {e}")
+            self._stop.wait(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get the number of cycles run and the last cycle's counts."""
+        return {"cycles": self.cycles, "running": self._thread is not None and self._thread.is_alive(),
+                "last_cycle": self.last_cycle}
@@ -2,9 +2,9 @@
 """Streamlit app for IMDb movie scraper."""
 
 import streamlit as st
-from imdb_scraper.scraper import IMDbScraper
 from imdb_scraper.models import Movie
 from imdb_scraper.history import SearchHistory
+from imdb_scraper.app import get_history, get_warmer, search_movie
 
 
 def display_movie(movie: Movie):
@@ -25,6 +25,8 @@ def display_movie(movie: Movie):
             st.write(f"**🎭 Genres:** {', '.join(movie.genres)}")
         if movie.director:
             st.write(f"**🎬 Director:** {movie.director}")
+        if movie.writers:
+            st.write(f"**✍️ Writers:** {', '.join(movie.writers)}")
         if movie.cast:
             st.write(f"**🎭 Cast:** {', '.join(movie.cast)}")
 
@@ -34,6 +36,8 @@ def display_movie(movie: Movie):
                 st.write(movie.plot)
 
     with col2:
+        if movie.poster_url:
+            st.image(movie.poster_url, width=200)
         # IMDb link
         if movie.url:
             st.markdown(f"[🔗 View on IMDb]({movie.url})")
@@ -41,66 +45,8 @@ def display_movie(movie: Movie):
             st.write(f"**IMDb ID:** {movie.imdb_id}")
 
 
-def main():
-    """Main Streamlit app."""
-    st.set_page_config(
-        page_title="IMDb Movie Search",
-        page_icon="🎬",
-        layout="wide"
-    )
-
-    st.title("🎬 IMDb Movie Search")
-    st.markdown("Search for movies and get detailed information from IMDb.")
-
-    # Initialize scraper and history
-    if 'scraper' not in st.session_state:
-        # Check for test mode (can be set via environment or UI)
-        test_mode = st.session_state.get('test_mode', False)
-        st.session_state.scraper = IMDbScraper(test_mode=test_mode)
-    if 'history' not in st.session_state:
-        st.session_state.history = SearchHistory()
-
-    # Sidebar with search history
-    with st.sidebar:
-        # Test mode toggle
-        test_mode = st.checkbox("🧪 Test Mode (use fake data)", value=st.session_state.get('test_mode', False))
-        if test_mode != st.session_state.get('test_mode', False):
-            st.session_state.test_mode = test_mode
-            # Reinitialize scraper with new mode
-            st.session_state.scraper = IMDbScraper(test_mode=test_mode)
-            st.rerun()
-
-        st.header("🔍 Search History")
-
-        # Popular searches
-        popular = [item for item in st.session_state.history.get_popular_searches(5) if item['last_result'] == 'success']
-        if popular:
-            st.subheader("Popular Searches")
-            for item in popular:
-                if st.button(f"📊 {item['query']} ({item['count']}x)",
-                           key=f"popular_{item['query']}",
-                           help=f"Last searched: {item['last_searched'] or 'Never'}"):
-                    st.session_state.search_input = item['query']
-                    st.rerun()
-
-        # Recent searches
-        recent = [item for item in st.session_state.history.get_recent_searches(5) if item['last_result'] == 'success']
-        if recent:
-            st.subheader("Recent Searches")
-            for item in recent:
-                if st.button(f"🕒 {item['query']}",
-                           key=f"recent_{item['query']}",
-                           help=f"Searched {item['count']} times"):
-                    st.session_state.search_input = item['query']
-                    st.rerun()
-
-        # Stats
-        total_searches = st.session_state.history.get_total_searches()
-        unique_queries = st.session_state.history.get_unique_queries()
-        st.markdown("---")
-        st.markdown(f"**Total searches:** {total_searches}")
-        st.markdown(f"**Unique movies:** {unique_queries}")
-
+def search_section(history: SearchHistory, test_mode: bool):
+    """Draw the search box and the result of a search."""
     # Search input
     if 'search_input' not in st.session_state:
         st.session_state.search_input = ""
@@ -121,13 +67,13 @@ def main():
         search_clicked = st.button("🔍 Search Movie", type="primary", use_container_width=True)
     with col2:
         if st.button("🗑️ Clear History", help="Clear all search history"):
-            st.session_state.history.clear_history()
+            history.clear_history()
             st.success("Search history cleared!")
             st.rerun()
 
     if search_clicked and movie_query:
         # Check if this search exists in history
-        search_stats = st.session_state.history.get_search_stats(movie_query)
+        search_stats = history.get_search_stats(movie_query)
 
         if search_stats:
             st.info(f"📊 This movie has been searched {search_stats['count']} times before. "
@@ -135,18 +81,17 @@ def main():
 
         with st.spinner("Searching IMDb..."):
             try:
-                movie = st.session_state.scraper.search_and_get_movie(movie_query)
+                movie = search_movie(movie_query, test_mode)
 
                 if movie:
                     # Show success with search count
-                    search_count = st.session_state.history.get_search_stats(movie_query)
+                    search_count = history.get_search_stats(movie_query)
                     if search_count and search_count['count'] > 1:
                         st.success(f"✅ Found '{movie.title}'! (Searched {search_count['count']} times total)")
                     else:
                         st.success(f"✅ Found '{movie.title}'!")
 
                     display_movie(movie)
-                    st.rerun()  # Refresh to update search history sidebar
                 else:
                     st.error(f"❌ No movie found for '{movie_query}'. Try a different title or check the spelling.")
 
@@ -154,6 +99,62 @@ def main():
                 st.error(f"❌ An error occurred: {str(e)}")
                 st.info("💡 Try again in a few moments. If the problem persists, the movie might not exist in IMDb.")
 
+
+def main():
+    """Main Streamlit app."""
+    st.set_page_config(
+        page_title="IMDb Movie Search",
+        page_icon="🎬",
+        layout="wide"
+    )
+
+    st.title("🎬 IMDb Movie Search")
+    st.markdown("Search for movies and get detailed information from IMDb.")
+
+    # Scraper and history are shared by all sessions (see imdb_scraper.app)
+    history = get_history()
+
+    with st.sidebar:
+        # Test mode toggle, read before any search so no rerun is needed
+        test_mode = st.checkbox("🧪 Test Mode (use fake data)", value=st.session_state.get('test_mode', False))
+        st.session_state.test_mode = test_mode
+    get_warmer(test_mode)
+
+    search_section(history, test_mode)
+
+    # Sidebar with search history, drawn after the search so it includes it
+    with st.sidebar:
+        st.header("🔍 Search History")
+
+        # Popular searches
+        popular = [item for item in history.get_popular_searches(5) if item['last_result'] == 'success']
+        if popular:
+            st.subheader("Popular Searches")
+            for item in popular:
+                if st.button(f"📊 {item['query']} ({item['count']}x)",
+                           key=f"popular_{item['query']}",
+                           help=f"Last searched: {item['last_searched'] or 'Never'}"):
+                    st.session_state.search_input = item['query']
+                    st.rerun()
+
+        # Recent searches
+        recent = [item for item in history.get_recent_searches(5) if item['last_result'] == 'success']
+        if recent:
+            st.subheader("Recent Searches")
+            for item in recent:
+                if st.button(f"🕒 {item['query']}",
+                           key=f"recent_{item['query']}",
+                           help=f"Searched {item['count']} times"):
+                    st.session_state.search_input = item['query']
+                    st.rerun()
+
+        # Stats
+        total_searches = history.get_total_searches()
+        unique_queries = history.get_unique_queries()
+        st.markdown("---")
+        st.markdown(f"**Total searches:** {total_searches}")
+        st.markdown(f"**Unique movies:** {unique_queries}")
+
     # Footer
     st.markdown("---")
     st.markdown("*Built with IMDb data and anti-bot protection*")
@@ -0,0 +1,63 @@
+"""Every installed HTML parser backend extracts the same movies from the recorded corpus."""
+
+from urllib.parse import quote
+
+import pytest
+
+from benchmarks.corpus import CORPUS_ROOT, Corpus
+from benchmarks.stub_server import render_html_search_page, render_html_title_page
+from imdb_scraper.backends import get_backend
+from imdb_scraper.parsing import parse_movie_details_html, parse_search_page, parse_title_page
+
+BACKENDS = ["html.parser", "lxml", "selectolax"]
+# Fields the fallback page layout carries (no writers or poster)
+HTML_FIELDS = ("title", "year", "rating", "runtime", "genres", "director", "cast", "plot",
+               "imdb_id", "url")
+
+
+def fields(movie):
+    return {name: getattr(movie, name) for name in HTML_FIELDS}
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    return Corpus.load(CORPUS_ROOT / "stub-v1")
+
+
+@pytest.fixture(scope="module")
+def reference(corpus):
+    """Movies parsed from the recorded pages' embedded JSON, keyed by IMDb ID."""
+    return {imdb_id: parse_title_page(body, imdb_id, f"https://www.imdb.com/title/{imdb_id}/")
+            for imdb_id, body in corpus.title_pages()}
+
+
+@pytest.fixture(params=BACKENDS)
+def backend(request):
+    try:
+        return get_backend(request.param, fallback=False)
+    except ImportError:
+        pytest.skip(f"{request.param} is not installed")
+
+
+def test_corpus_has_title_pages(reference):
+    assert len(reference) == 20
+    assert all(movie is not None and movie.cast for movie in reference.values())
+
+
+def test_title_pages_parse_identically(backend, reference):
+    # Recorded pages carry embedded JSON, so re-render each movie in the HTML fallback layout
+    for imdb_id, movie in reference.items():
+        page = render_html_title_page(imdb_id, movie.to_dict(), padding_blocks=20)
+        parsed = parse_movie_details_html(backend.parse(page), imdb_id, movie.url, backend)
+        assert fields(parsed) == fields(movie), imdb_id
+
+
+def test_search_pages_parse_identically(backend, corpus, reference):
+    catalog = {imdb_id: movie.to_dict() for imdb_id, movie in reference.items()}
+    for query in corpus.queries:
+        recorded = corpus.body(f"/find/?q={quote(query)}&s=tt&ttype=ft&ref_=fn_ft")
+        expected = parse_search_page(recorded, query)
+        assert expected, query
+
+        page = render_html_search_page(query, catalog, padding_blocks=20)
+        assert parse_search_page(page, query, backend=backend) == expected, query
@@ -0,0 +1,149 @@
+"""Resumable batch export against the local IMDb stub server."""
+
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from benchmarks.stub_server import StubIMDbServer, make_catalog
+from imdb_scraper import cli
+from imdb_scraper.batch import Checkpoint
+from imdb_scraper.config import EXPORT_ROW_GROUP_SIZE, MAX_RETRIES
+from imdb_scraper.export import JSONLWriter
+from imdb_scraper.history import SearchHistory
+from imdb_scraper.ratelimit import TokenBucket
+from imdb_scraper.scraper import IMDbScraper
+
+ITEMS = ["Stub Movie 0001", "Stub Movie 0002", "Stub Movie 0003", "Stub Movie 0004",
+         "tt0000005", "tt0000006", "Zzyzx Qwv Blorf", "Stub Movie 0007"]
+FOUND_IDS = {f"tt{n:07d}" for n in range(1, 8)}
+
+
+class FlakyStubServer(StubIMDbServer):
+    """Stub server failing the title pages of the IMDb IDs in failing.
+
+    Failures answer failure_status after failure_delay seconds.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.failing = set()
+        self.failure_status = 500
+        self.failure_delay = 0.0
+
+    def respond(self, path):
+        if any(path.startswith(f"/title/{imdb_id}") for imdb_id in self.failing):
+            time.sleep(self.failure_delay)
+            return self.failure_status, b"<html><body>Service Unavailable</body></html>"
+        return super().respond(path)
+
+
+@pytest.fixture
+def server():
+    with FlakyStubServer(catalog=make_catalog(20), padding_blocks=10) as stub:
+        yield stub
+
+
+@pytest.fixture
+def scraper(server, tmp_path, monkeypatch):
+    monkeypatch.setattr("imdb_scraper.scraper.backoff_delay", lambda attempt: 0.0)
+    return IMDbScraper(use_cache=False, rate_limiter=TokenBucket(rate=1e9, burst=10 ** 9),
+                       history=SearchHistory(str(tmp_path / "history.json")),
+                       base_url=server.base_url)
+
+
+@pytest.fixture
+def export_args(tmp_path):
+    input_path = tmp_path / "titles.txt"
+    input_path.write_text("\n".join(ITEMS) + "\n", encoding="utf-8")
+    return argparse.Namespace(input=str(input_path), output=str(tmp_path / "movies.jsonl"),
+                              format=None, checkpoint=None, failures=None, fields=None,
+                              row_group_size=EXPORT_ROW_GROUP_SIZE, workers=2)
+
+
+def read_jsonl(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_resume_after_interrupt(scraper, server, export_args, monkeypatch, capsys):
+    real_write = JSONLWriter.write
+
+    def write_then_die(self, movie):
+        if self.rows == 3:
+            raise KeyboardInterrupt
+        real_write(self, movie)
+
+    with monkeypatch.context() as patch:
+        patch.setattr(JSONLWriter, "write", write_then_die)
+        with pytest.raises(KeyboardInterrupt):
+            cli.run_export(scraper, export_args)
+
+    checkpoint_path = f"{export_args.output}.checkpoint"
+    checkpoint = Checkpoint(checkpoint_path)
+    checkpoint.close()
+    written = {movie["imdb_id"] for movie in read_jsonl(export_args.output)}
+    assert len(written) == 3
+    assert len(checkpoint.done) >= 3
+    requests_before = server.requests
+
+    cli.run_export(scraper, export_args)
+
+    assert "Resuming: " in capsys.readouterr().err
+    movies = read_jsonl(export_args.output)
+    assert len(movies) == len(FOUND_IDS)
+    assert {movie["imdb_id"] for movie in movies} == FOUND_IDS
+    # Finished items are not looked up again: at most a search and a title page per remaining item
+    assert server.requests - requests_before <= 2 * (len(ITEMS) - len(checkpoint.done))
+
+    failures = read_jsonl(f"{export_args.output}.failures.jsonl")
+    assert [(f["item"], f["error_type"], f["retryable"]) for f in failures] == [
+        ("Zzyzx Qwv Blorf", "not_found", False)
+    ]
+    assert not Path(checkpoint_path).exists()
+
+
+def test_transient_failures_are_retried(scraper, server, export_args, capsys):
+    server.failing.add("tt0000002")
+    checkpoint_path = f"{export_args.output}.checkpoint"
+
+    cli.run_export(scraper, export_args)
+
+    assert "1 failed transiently, rerun the same command" in capsys.readouterr().err
+    assert {movie["imdb_id"] for movie in read_jsonl(export_args.output)} == FOUND_IDS - {"tt0000002"}
+    failures = {f["item"]: f for f in read_jsonl(f"{export_args.output}.failures.jsonl")}
+    assert failures["Stub Movie 0002"]["error_type"] == "fetch_failed"
+    assert failures["Stub Movie 0002"]["retryable"] is True
+    assert failures["Zzyzx Qwv Blorf"]["retryable"] is False
+
+    checkpoint = Checkpoint(checkpoint_path)
+    checkpoint.close()
+    assert checkpoint.retry == {"Stub Movie 0002"}
+    assert "Stub Movie 0002" not in checkpoint.done
+
+    server.failing.clear()
+    requests_before = server.requests
+    cli.run_export(scraper, export_args)
+
+    assert "1 to retry after transient failures" in capsys.readouterr().err
+    assert server.requests - requests_before <= 2
+    movies = read_jsonl(export_args.output)
+    assert sorted(movie["imdb_id"] for movie in movies) == sorted(FOUND_IDS)
+    assert not checkpoint.path.exists()
+
+
+def test_coalesced_lookups_share_fetch_failures(scraper, server):
+    server.failing.add("tt0000002")
+    server.failure_status = 503
+    server.failure_delay = 0.05  # Keeps the first lookup in flight while the second joins it
+    coalesced_before = scraper.single_flight.stats()["coalesced_by_kind"].get("movie", 0)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        results = list(executor.map(scraper._lookup, ["tt0000002", "tt0000002"]))
+
+    assert [result.error_type for result in results] == ["fetch_failed", "fetch_failed"]
+    assert scraper.single_flight.stats()["coalesced_by_kind"]["movie"] == coalesced_before + 1
+    assert server.requests == MAX_RETRIES  # One lookup's retries, shared by both
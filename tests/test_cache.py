@@ -0,0 +1,191 @@
+"""Response and movie caches, and lookups answered from them or from remembered resolutions."""
+
+import hashlib
+import os
+import sqlite3
+import time
+import zlib
+
+import pytest
+
+from benchmarks.stub_server import StubIMDbServer, make_catalog
+from imdb_scraper.cache import MovieCache, ResponseCache
+from imdb_scraper.fuzzy import FuzzyTitleIndex
+from imdb_scraper.history import SearchHistory
+from imdb_scraper.models import Movie
+from imdb_scraper.ratelimit import TokenBucket
+from imdb_scraper.scraper import IMDbScraper
+
+SEARCH_URL = "https://www.imdb.com/find/?q=heat&s=tt&ttype=ft"
+TITLE_URL = "https://www.imdb.com/title/tt0113277/"
+
+
+def age(conn, table, seconds):
+    conn.execute(f"UPDATE {table} SET stored_at = stored_at - ?", (seconds,))
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return str(tmp_path / "cache.sqlite3")
+
+
+@pytest.fixture
+def response_cache(cache_file):
+    cache = ResponseCache(cache_file, search_ttl=60, title_ttl=600)
+    yield cache
+    cache.close()
+
+
+def test_ttl_per_endpoint(response_cache):
+    response_cache.set(SEARCH_URL, b"search page", etag='"s"')
+    response_cache.set(TITLE_URL, b"title page", last_modified="Wed, 01 May 2024 12:00:00 GMT")
+    assert response_cache.get(SEARCH_URL) == b"search page"
+
+    age(response_cache._conn, "responses", 120)
+
+    assert response_cache.get(SEARCH_URL) is None
+    expired = response_cache.lookup(SEARCH_URL)
+    assert (expired.body, expired.fresh) == (b"search page", False)
+    assert expired.validators() == {"If-None-Match": '"s"'}
+    assert response_cache.get(TITLE_URL) == b"title page"
+    assert response_cache.lookup(TITLE_URL).validators() == {
+        "If-Modified-Since": "Wed, 01 May 2024 12:00:00 GMT"}
+    assert response_cache.get("https://www.imdb.com/title/tt0000000/") is None
+
+    stats = response_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (3, 3, 2)
+
+
+def test_lru_eviction_by_size(cache_file):
+    cache = ResponseCache(cache_file, max_bytes=2500)
+    bodies = {f"https://www.imdb.com/title/tt000000{i}/": os.urandom(1000) for i in range(3)}
+    first, second, third = bodies
+
+    cache.set(first, bodies[first])
+    time.sleep(0.01)
+    cache.set(second, bodies[second])
+    time.sleep(0.01)
+    assert cache.get(first) == bodies[first]  # Now more recently used than the second
+    time.sleep(0.01)
+    cache.set(third, bodies[third])
+
+    assert cache.get(second) is None
+    assert cache.get(first) == bodies[first]
+    assert cache.get(third) == bodies[third]
+    stats = cache.stats()
+    assert (stats["evictions"], stats["entries"]) == (1, 2)
+    assert stats["size_bytes"] <= 2500
+    cache.close()
+
+
+def test_migrates_cache_files_without_validators(cache_file):
+    # The responses table as first released, before validators and completeness were stored
+    conn = sqlite3.connect(cache_file)
+    conn.execute(
+        "CREATE TABLE responses ("
+        "key TEXT PRIMARY KEY, url TEXT NOT NULL, body BLOB NOT NULL, "
+        "size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+    )
+    data = zlib.compress(b"old title page")
+    conn.execute("INSERT INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                 (hashlib.sha256(TITLE_URL.encode()).hexdigest(), TITLE_URL, data, len(data),
+                  time.time(), time.time()))
+    conn.commit()
+    conn.close()
+
+    cache = ResponseCache(cache_file)
+    columns = {row[1] for row in cache._conn.execute("PRAGMA table_info(responses)")}
+    assert {"etag", "last_modified", "complete"} <= columns
+
+    entry = cache.lookup(TITLE_URL)
+    assert (entry.body, entry.etag, entry.last_modified, entry.fresh) == (
+        b"old title page", None, None, True)
+    assert not entry.complete  # May have been cut short by an early exit
+    cache.set(TITLE_URL, b"new title page", etag='"v2"')
+    assert cache.lookup(TITLE_URL)[:2] == (b"new title page", '"v2"')
+    cache.close()
+
+    cache = ResponseCache(cache_file)  # Reopening a migrated file changes nothing
+    assert cache.get(TITLE_URL) == b"new title page"
+    cache.close()
+
+
+def test_movie_cache(cache_file):
+    cache = MovieCache(cache_file, ttl=60)
+    movie = Movie(title="Heat", year=1995, rating=8.3, genres=["Crime"], cast=["Al Pacino"],
+                  imdb_id="tt0113277", url=TITLE_URL)
+
+    cache.set(movie)
+    cache.set(Movie(title="No ID"))  # Ignored
+    assert cache.get("tt0113277") == movie
+    assert list(cache.titles()) == [("tt0113277", "Heat", 1995)]
+
+    age(cache._conn, "movies", 120)
+    assert cache.get("tt0113277") is None
+    assert cache.get_stale("tt0113277") == movie
+    assert cache.expires_in("tt0113277") == pytest.approx(-60, abs=1)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    cache.close()
+
+
+@pytest.fixture
+def server():
+    with StubIMDbServer(catalog=make_catalog(20), padding_blocks=10) as stub:
+        yield stub
+
+
+@pytest.fixture
+def scraper(server, cache_file, tmp_path, monkeypatch):
+    monkeypatch.setattr("imdb_scraper.scraper.backoff_delay", lambda attempt: 0.0)
+    history = SearchHistory(str(tmp_path / "history.json"))
+    scraper = IMDbScraper(use_cache=False, rate_limiter=TokenBucket(rate=1e9, burst=10 ** 9),
+                          history=history, base_url=server.base_url)
+    scraper.cache = ResponseCache(cache_file)
+    scraper.movie_cache = MovieCache(cache_file)
+    yield scraper
+    scraper.cache.close()
+    scraper.movie_cache.close()
+    history.close()
+
+
+def test_remembered_resolution_is_served_from_the_movie_cache(scraper, server):
+    movie = scraper.search_and_get_movie("Stub Movie 0004")
+    assert server.requests == 2
+    assert scraper.history.get_resolved_id("stub movie 0004") == "tt0000004"
+
+    scraper.fuzzy_index = FuzzyTitleIndex(server.base_url)  # Only the memo can answer now
+    scraper.cache.clear()
+
+    assert scraper.search_and_get_movie("  STUB movie 0004") == movie
+    assert server.requests == 2
+    assert scraper.movie_cache.stats()["hits"] == 1
+
+
+def test_transient_failure_keeps_the_resolution(scraper, server, monkeypatch):
+    scraper.search_and_get_movie("Stub Movie 0005")
+    scraper.fuzzy_index = FuzzyTitleIndex(server.base_url)
+    scraper.cache.clear()
+    scraper.movie_cache.clear()
+
+    def unavailable(path):
+        return 503, b"<html><body>Service Unavailable</body></html>"
+
+    with monkeypatch.context() as patch:
+        patch.setattr(server, "respond", unavailable)
+        assert scraper.search_and_get_movie("Stub Movie 0005") is None
+
+    assert scraper.history.get_resolved_id("stub movie 0005") == "tt0000005"
+    assert not scraper.history.is_known_failure("stub movie 0005")
+    requests_before = server.requests
+    assert scraper.search_and_get_movie("Stub Movie 0005").imdb_id == "tt0000005"
+    assert server.requests - requests_before == 1  # The title page, no search
+
+
+def test_not_found_is_negatively_cached(scraper, server):
+    assert scraper.search_and_get_movie("Zzyzx Qwv Blorf") is None
+    requests_before = server.requests
+
+    assert scraper.search_and_get_movie("zzyzx qwv blorf") is None
+    assert server.requests == requests_before
+    assert scraper.history.is_known_failure("Zzyzx Qwv Blorf")
@@ -0,0 +1,90 @@
+"""Round trips through the streaming movie writers."""
+
+import csv
+import json
+from datetime import datetime
+
+import pytest
+
+from imdb_scraper.config import CSV_LIST_SEPARATOR
+from imdb_scraper.export import EXPORT_FIELDS, MovieWriter, open_writer
+from imdb_scraper.models import Movie
+
+# Ratings exactly representable as float32, the Arrow schema's rating type
+MOVIES = [
+    Movie(title="The Matrix", year=1999, rating=8.5, runtime="2h 16m",
+          genres=["Action", "Sci-Fi"], director="Lana Wachowski",
+          cast=["Keanu Reeves", "Laurence Fishburne"], plot="A hacker learns the truth.",
+          imdb_id="tt0133093", url="https://www.imdb.com/title/tt0133093/",
+          writers=["Lilly Wachowski", "Lana Wachowski"], poster_url="https://example.com/m.jpg",
+          scraped_at=datetime(2024, 5, 1, 12, 30, 15, 250000)),
+    Movie(title="Heat", year=1995, rating=7.25, imdb_id="tt0113277",
+          scraped_at=datetime(2024, 5, 2, 8, 0, 0)),
+]
+
+
+def write_all(path, fmt, **kwargs):
+    with open_writer(str(path), fmt, row_group_size=1, **kwargs) as writer:
+        for movie in MOVIES:
+            writer.write(movie)
+    assert writer.rows == len(MOVIES)
+
+
+def test_writer_bases_are_abstract():
+    with pytest.raises(TypeError):
+        MovieWriter()
+
+
+def test_jsonl_round_trip(tmp_path):
+    path = tmp_path / "movies.jsonl"
+    write_all(path, "jsonl")
+
+    with open(path, "r", encoding="utf-8") as f:
+        assert [Movie.from_dict(json.loads(line)) for line in f] == MOVIES
+
+
+def test_csv_round_trip(tmp_path):
+    path = tmp_path / "movies.csv"
+    write_all(path, "csv")
+    write_all(path, "csv", append=True)
+
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.DictReader(f)
+        assert tuple(reader.fieldnames) == EXPORT_FIELDS
+        rows = list(reader)
+    assert len(rows) == 2 * len(MOVIES)  # No second header when appending
+    assert rows[0]["cast"] == CSV_LIST_SEPARATOR.join(MOVIES[0].cast)
+    assert rows[1]["genres"] == ""
+    assert [(row["imdb_id"], row["title"], float(row["rating"])) for row in rows[:2]] == [
+        (movie.imdb_id, movie.title, movie.rating) for movie in MOVIES
+    ]
+
+
+def test_selected_fields_only(tmp_path):
+    path = tmp_path / "movies.jsonl"
+    write_all(path, "jsonl", fields=["imdb_id", "year"])
+
+    with open(path, "r", encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == [
+            {"imdb_id": movie.imdb_id, "year": movie.year} for movie in MOVIES
+        ]
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "arrow"])
+def test_columnar_round_trip(tmp_path, fmt):
+    pa = pytest.importorskip("pyarrow")
+    path = tmp_path / f"movies.{fmt}"
+    write_all(path, fmt)
+
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(str(path))
+        assert parquet_file.num_row_groups == len(MOVIES)
+        table = parquet_file.read()
+    else:
+        table = pa.ipc.open_file(str(path)).read_all()
+
+    assert table.column_names == list(EXPORT_FIELDS)
+    assert table.to_pylist() == [{name: getattr(movie, name) for name in EXPORT_FIELDS}
+                                 for movie in MOVIES]
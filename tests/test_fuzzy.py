@@ -0,0 +1,58 @@
+"""Local resolution of queries through the fuzzy title index."""
+
+import pytest
+
+from imdb_scraper.fuzzy import FuzzyTitleIndex, edit_distance
+
+MOVIES = [
+    ("tt0133093", "The Matrix", 1999),
+    ("tt0234215", "The Matrix Reloaded", 2003),
+    ("tt0372784", "Batman Begins", 2005),
+    ("tt0090605", "Aliens", 1986),
+    ("tt0111161", "The Shawshank Redemption", 1994),
+    ("tt0075148", "Rocky", 1976),
+    ("tt0084602", "Rocky III", 1982),
+]
+
+
+@pytest.fixture
+def index():
+    return FuzzyTitleIndex.build(MOVIES)
+
+
+@pytest.mark.parametrize("query, imdb_id", [
+    ("The Matrix", "tt0133093"),
+    ("matrix 1999", "tt0133093"),
+    ("matrx 1999", "tt0133093"),
+    ("matrx", "tt0133093"),
+    ("teh matrix", "tt0133093"),
+    ("shawshank redemtion", "tt0111161"),
+    ("matrix reloded", "tt0234215"),
+    ("rockey", "tt0075148"),
+])
+def test_resolves_exact_and_typo_queries(index, query, imdb_id):
+    assert index.resolve(query) == imdb_id
+
+
+@pytest.mark.parametrize("query", [
+    "batman",  # Contained in Batman Begins
+    "alien",  # Contained in Aliens
+    "matrix 2003",  # Year of a different movie
+    "matrx 2003",
+    "rocky 3",  # Number the title does not name
+    "bing",  # Too short for a typo
+])
+def test_does_not_resolve_partial_titles(index, query):
+    assert index.resolve(query) is None
+
+
+def test_resolves_aliases(index):
+    index.add("tt0133093", "the one movie", alias=True)
+    assert index.resolve("The One Movie") == "tt0133093"
+
+
+def test_edit_distance_counts_transpositions_once():
+    assert edit_distance("teh", "the", 2) == 1
+    assert edit_distance("matrx", "matrix", 2) == 1
+    assert edit_distance("kitten", "sitting", 5) == 3
+    assert edit_distance("kitten", "sitting", 1) == 2  # Capped at limit + 1
@@ -0,0 +1,89 @@
+"""Search history event log: concurrent writers, compaction and the query indexes."""
+
+import json
+import multiprocessing
+
+import pytest
+
+from imdb_scraper import history as history_module
+from imdb_scraper.history import SearchHistory
+
+WRITERS = 6
+WRITES = 300
+
+
+def write_searches(path, writer):
+    history = SearchHistory(path, compact_every=50)
+    for i in range(WRITES):
+        history.record_search(f"query {i % 10}", success=True, imdb_id=f"tt{writer:07d}")
+    history.close()
+
+
+@pytest.mark.skipif(history_module.fcntl is None, reason="needs flock to serialize processes")
+def test_concurrent_writers_lose_no_updates(tmp_path):
+    path = str(tmp_path / "history.json")
+    processes = [multiprocessing.Process(target=write_searches, args=(path, writer))
+                 for writer in range(WRITERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * WRITERS
+
+    history = SearchHistory(path)
+    assert history.get_total_searches() == WRITERS * WRITES
+    assert history.get_unique_queries() == 10
+    assert {entry["count"] for entry in history.history.values()} == {WRITERS * WRITES // 10}
+    history.close()
+
+
+def read_log(history):
+    with open(history.log_file, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_compaction(tmp_path):
+    history = SearchHistory(str(tmp_path / "history.json"), compact_every=5)
+    for i in range(12):
+        history.record_search(f"query {i % 3}")
+
+    # Ten events folded into the snapshot, the last two still in the log
+    assert [event["q"] for event in read_log(history)] == ["query 1", "query 2"]
+    with open(history.history_file, "r", encoding="utf-8") as f:
+        assert sum(entry["count"] for entry in json.load(f).values()) == 10
+
+    history.compact()
+    assert read_log(history) == []
+    history.close()
+
+    reloaded = SearchHistory(str(tmp_path / "history.json"), compact_every=5)
+    assert reloaded.history == history.history
+    assert reloaded.get_total_searches() == 12
+    reloaded.close()
+
+
+def test_popular_and_recent_indexes(tmp_path):
+    history = SearchHistory(str(tmp_path / "history.json"))
+    for query in ["alien", "heat", "alien", "up", "alien", "up", "heat"]:
+        history.record_search(query)
+
+    def queries(entries):
+        return [entry["query"] for entry in entries]
+
+    # Ties on count go to the most recent search
+    assert queries(history.get_popular_searches()) == ["alien", "heat", "up"]
+    assert [entry["count"] for entry in history.get_popular_searches()] == [3, 2, 2]
+    assert queries(history.get_popular_searches(limit=2)) == ["alien", "heat"]
+    assert queries(history.get_recent_searches()) == ["heat", "up", "alien"]
+    assert history.get_total_searches() == 7
+
+    history.record_search("UP ")  # Normalized to "up"
+    assert queries(history.get_popular_searches()) == ["up", "alien", "heat"]
+    assert queries(history.get_recent_searches(limit=1)) == ["up"]
+    history.close()
+
+    reloaded = SearchHistory(str(tmp_path / "history.json"))
+    assert queries(reloaded.get_popular_searches()) == ["up", "alien", "heat"]
+    assert queries(reloaded.get_recent_searches()) == ["up", "heat", "alien"]
+    assert reloaded.get_total_searches() == 8
+    reloaded.close()
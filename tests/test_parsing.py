@@ -0,0 +1,127 @@
+"""Streamed page reading: early exit after the page data, size cap and cached completeness."""
+
+import pytest
+
+from benchmarks.stub_server import (
+    StubIMDbServer, make_catalog, render_html_title_page, render_page, title_page_props
+)
+from imdb_scraper.cache import ResponseCache
+from imdb_scraper.history import SearchHistory
+from imdb_scraper.parsing import PageReader, parse_title_page
+from imdb_scraper.ratelimit import TokenBucket
+from imdb_scraper.scraper import IMDbScraper
+
+MOVIE = make_catalog(1)["tt0000001"]
+PAGE = render_page(title_page_props("tt0000001", MOVIE), padding_blocks=8)
+SCRIPT_END = PAGE.index(b"</script>") + len(b"</script>")
+
+
+def read(page, chunk_size, **kwargs):
+    """Feed a page in chunks until the reader stops; returns (reader, bytes fed)."""
+    reader = PageReader(**kwargs)
+    fed = 0
+    while fed < len(page):
+        chunk = page[fed:fed + chunk_size]
+        fed += len(chunk)
+        if reader.feed(chunk):
+            break
+    return reader, fed
+
+
+def test_stops_after_page_data():
+    reader, fed = read(PAGE, 256)
+
+    assert reader.exited_early and not reader.too_large
+    assert fed < len(PAGE)
+    assert reader.body == PAGE[:SCRIPT_END]
+    movie = parse_title_page(reader.body, "tt0000001", "https://www.imdb.com/title/tt0000001/")
+    assert (movie.title, movie.plot) == (MOVIE["title"], MOVIE["plot"])
+
+
+@pytest.mark.parametrize("split", [
+    PAGE.index(b"__NEXT_DATA__") + 4,  # Inside the opening tag
+    PAGE.index(b"</script>") + 3,  # Inside the closing tag
+    PAGE.index(b'"pageProps"') + 5,
+])
+def test_tags_split_across_chunks(split):
+    reader = PageReader()
+
+    assert not reader.feed(PAGE[:split])
+    assert reader.feed(PAGE[split:])
+    assert reader.exited_early
+    assert reader.body == PAGE[:SCRIPT_END]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 300, 1 << 20])
+def test_chunk_sizes_agree(chunk_size):
+    reader, _ = read(PAGE, chunk_size)
+
+    assert reader.exited_early
+    assert reader.body == PAGE[:SCRIPT_END]
+
+
+def test_pages_without_page_data_are_read_to_the_end():
+    page = render_html_title_page("tt0000001", MOVIE, padding_blocks=8)
+    reader, fed = read(page, 256)
+    assert not reader.exited_early and reader.body == page
+
+    page = PAGE.replace(b'"pageProps"', b'"otherProps"')
+    reader, fed = read(page, 256)
+    assert not reader.exited_early and reader.body == page
+
+
+def test_early_exit_can_be_disabled():
+    reader, fed = read(PAGE, 256, early_exit=False)
+
+    assert not reader.exited_early
+    assert reader.body == PAGE
+
+
+def test_size_cap():
+    reader, fed = read(PAGE, 256, max_bytes=1000, early_exit=False)
+
+    assert reader.too_large
+    assert fed <= 1000 + 256
+    reader, _ = read(PAGE, 256, max_bytes=len(PAGE), early_exit=False)
+    assert not reader.too_large
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    yield cache
+    cache.close()
+
+
+def test_complete_flag_round_trips_through_the_cache(cache):
+    url = "https://www.imdb.com/title/tt0000001/"
+
+    cache.set(url, PAGE[:SCRIPT_END], etag='"v1"', complete=False)
+    entry = cache.lookup(url)
+    assert (entry.body, entry.etag, entry.complete) == (PAGE[:SCRIPT_END], '"v1"', False)
+
+    cache.set(url, PAGE, etag='"v1"')
+    assert cache.lookup(url).complete
+
+
+def test_incomplete_cached_page_is_refetched_when_complete_is_needed(cache, tmp_path):
+    with StubIMDbServer(catalog=make_catalog(3), padding_blocks=50) as server:
+        history = SearchHistory(str(tmp_path / "history.json"))
+        scraper = IMDbScraper(use_cache=False, rate_limiter=TokenBucket(rate=1e9, burst=10 ** 9),
+                              history=history, base_url=server.base_url)
+        scraper.cache = cache
+        url = f"{server.base_url}/title/tt0000001/"
+
+        partial = scraper._fetch(url)
+        assert partial.endswith(b"</script>")
+        assert not cache.lookup(url).complete
+        assert scraper._fetch(url) == partial  # Good enough for the parsers
+        assert server.requests == 1
+
+        full = scraper._fetch(url, complete=True)
+        assert full.endswith(b"</html>") and full.startswith(partial)
+        assert server.requests == 2
+        assert cache.lookup(url).complete
+        assert scraper._fetch(url, complete=True) == full
+        assert server.requests == 2
+        history.close()
@@ -0,0 +1,112 @@
+"""AIMD rate adaptation and Retry-After handling, on an injected clock."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from imdb_scraper.ratelimit import AdaptiveRateLimiter, TokenBucket, parse_retry_after
+
+NOW = datetime(2024, 5, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+class FakeClock:
+    """Monotonic clock that only moves when advanced."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return AdaptiveRateLimiter(rate=8.0, min_rate=1.0, max_rate=10.0, burst=4, increase_step=0.5,
+                               backoff_factor=0.5, cooldown=5.0, clock=clock)
+
+
+def test_token_bucket_paces_after_burst(clock):
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+    clock.advance(1.0)
+    assert bucket.reserve() == 0.5  # Two tokens earned, both already promised
+
+
+def test_backoff_is_multiplicative_once_per_cooldown(limiter, clock):
+    limiter.on_response(throttled=True)
+    assert limiter.rate == 4.0
+
+    clock.advance(1.0)
+    limiter.on_response(throttled=True)  # Same throttling episode
+    assert limiter.rate == 4.0
+
+    clock.advance(4.0)
+    limiter.on_response(throttled=True)
+    assert limiter.rate == 2.0
+    for _ in range(3):
+        clock.advance(5.0)
+        limiter.on_response(throttled=True)
+    assert limiter.rate == 1.0  # Floored at min_rate
+    assert (limiter.throttled, limiter.backoffs) == (6, 5)
+
+
+def test_throttling_drops_the_saved_burst(limiter):
+    limiter.on_response(throttled=True)
+
+    assert limiter.reserve() == pytest.approx(1 / 4.0)
+
+
+def test_recovery_is_additive_up_to_max_rate(limiter):
+    limiter.on_response(throttled=True)
+    for _ in range(4):
+        limiter.on_response(throttled=False)
+    assert limiter.rate == 6.0
+
+    for _ in range(100):
+        limiter.on_response(throttled=False)
+    assert limiter.rate == 10.0
+
+
+def test_retry_after_pauses_every_caller(limiter, clock):
+    limiter.on_response(throttled=True, retry_after=30.0)
+
+    assert limiter.stats()["paused_for"] == 30.0
+    assert limiter.available() == 0.0
+    assert limiter.reserve() == pytest.approx(30.0 + 1 / 4.0)
+    assert limiter.reserve() == pytest.approx(30.0 + 2 / 4.0)
+
+    clock.advance(30.0)
+    assert limiter.stats()["paused_for"] == 0.0
+    assert limiter.reserve() == pytest.approx(3 / 4.0)  # Queued behind the two reserved
+
+
+def test_retry_after_http_date_pauses(limiter):
+    limiter.on_response(throttled=True,
+                        retry_after=parse_retry_after("Wed, 01 May 2024 12:00:45 GMT", now=NOW))
+
+    assert limiter.stats()["paused_for"] == 45.0
+
+
+@pytest.mark.parametrize("value, seconds", [
+    ("120", 120.0),
+    (" 7 ", 7.0),
+    ("0", 0.0),
+    ("Wed, 01 May 2024 12:01:30 GMT", 90.0),
+    ("Wednesday, 01-May-24 12:00:10 GMT", 10.0),  # Obsolete RFC 850 form
+    ("Wed, 01 May 2024 11:59:00 GMT", 0.0),  # Already passed
+    (None, None),
+    ("", None),
+    ("soon", None),
+    ("-5", None),
+])
+def test_parse_retry_after(value, seconds):
+    assert parse_retry_after(value, now=NOW) == seconds
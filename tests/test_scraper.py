@@ -0,0 +1,135 @@
+"""IMDbScraper lookups against the local IMDb stub server, counted in requests."""
+
+import pytest
+
+from benchmarks.stub_server import StubIMDbServer, make_catalog
+from imdb_scraper.cache import MovieCache, ResponseCache
+from imdb_scraper.fuzzy import FuzzyTitleIndex
+from imdb_scraper.history import SearchHistory
+from imdb_scraper.models import LazyMovie
+from imdb_scraper.ratelimit import TokenBucket
+from imdb_scraper.scraper import IMDbScraper
+
+
+@pytest.fixture
+def server():
+    with StubIMDbServer(catalog=make_catalog(20), padding_blocks=10) as stub:
+        yield stub
+
+
+@pytest.fixture
+def scraper(server, tmp_path):
+    history = SearchHistory(str(tmp_path / "history.json"))
+    scraper = IMDbScraper(use_cache=False, rate_limiter=TokenBucket(rate=1e9, burst=10 ** 9),
+                          history=history, fuzzy_index=FuzzyTitleIndex(server.base_url),
+                          base_url=server.base_url)
+    yield scraper
+    history.close()
+
+
+def test_search_result_fields_skip_the_title_page(scraper, server):
+    movie = scraper.search_and_get_movie("Stub Movie 0003", fields=["title", "year"])
+
+    assert server.requests == 1  # The search only
+    assert isinstance(movie, LazyMovie) and not movie.loaded
+    assert (movie.title, movie.year, movie.imdb_id) == ("Stub Movie 0003", 1953, "tt0000003")
+    assert movie.plot == "The plot of stub movie number 3."
+    assert server.requests == 2
+
+
+def test_fuzzy_match_fields_need_no_requests(scraper, server):
+    scraper.search_and_get_movie("Stub Movie 0001")
+    assert server.requests == 2
+
+    movie = scraper.search_and_get_movie("stub movie 0001 1951", fields=["title", "year", "url"])
+
+    assert server.requests == 2
+    assert (movie.title, movie.year) == ("Stub Movie 0001", 1951)
+    assert movie.url == f"{server.base_url}/title/tt0000001/"
+
+
+def test_remembered_resolution_fields_need_no_requests(scraper, server):
+    scraper.fuzzy_index.add("tt0000002", "Stub Movie 0002", 1952)
+    scraper.history.record_search("the second stub", success=True, imdb_id="tt0000002")
+    assert scraper.fuzzy_index.resolve("the second stub") is None
+
+    movie = scraper.search_and_get_movie("the second stub", fields=["imdb_id", "title"])
+
+    assert server.requests == 0
+    assert (movie.imdb_id, movie.title) == ("tt0000002", "Stub Movie 0002")
+    assert movie.cast  # Other fields still load on access
+    assert server.requests == 1
+
+
+def test_other_fields_fetch_the_title_page(scraper, server):
+    scraper.fuzzy_index.add("tt0000002", "Stub Movie 0002", 1952)
+
+    movie = scraper.search_and_get_movie("Stub Movie 0002", fields=["title", "rating"])
+
+    assert server.requests == 1  # The title page, no search
+    assert (movie.title, movie.rating) == ("Stub Movie 0002", 5.2)
+
+
+@pytest.fixture
+def cached_scraper(scraper, tmp_path):
+    """The scraper with response and movie caches, recording the headers of each request."""
+    scraper.cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    scraper.movie_cache = MovieCache(str(tmp_path / "cache.sqlite3"))
+    scraper.sent_headers = []
+    session_get = scraper.session.get
+
+    def recording_get(url, **kwargs):
+        scraper.sent_headers.append(kwargs.get("headers") or {})
+        return session_get(url, **kwargs)
+
+    scraper.session.get = recording_get
+    yield scraper
+    scraper.cache.close()
+    scraper.movie_cache.close()
+
+
+def age(conn, table, seconds):
+    conn.execute(f"UPDATE {table} SET stored_at = stored_at - ?", (seconds,))
+
+
+def test_expired_page_is_revalidated(cached_scraper, server):
+    cache = cached_scraper.cache
+    url = f"{server.base_url}/title/tt0000001/"
+    body = cached_scraper._fetch(url)
+    etag = cache.lookup(url).etag
+    assert etag and cached_scraper.sent_headers == [{}]
+
+    age(cache._conn, "responses", cache.title_ttl + 1)
+    assert not cache.lookup(url).fresh
+
+    assert cached_scraper._fetch_page(url) == (body, True)
+    assert cached_scraper.sent_headers[-1] == {"If-None-Match": etag}
+    assert (server.requests, server.not_modified) == (2, 1)
+    assert cache.stats()["revalidations"] == 1
+    assert cache.lookup(url).fresh  # Freshness restarts from the 304
+
+    assert cached_scraper._fetch(url) == body
+    assert server.requests == 2
+
+
+def test_refresh_movie_revalidates_the_title_page(cached_scraper, server):
+    movie_cache = cached_scraper.movie_cache
+    movie = cached_scraper.get_movie_details("tt0000001")
+    assert cached_scraper.get_movie_details("tt0000001") == movie
+    assert server.requests == 1
+    etag = cached_scraper.cache.lookup(f"{server.base_url}/title/tt0000001/").etag
+
+    age(movie_cache._conn, "movies", movie_cache.ttl + 1)
+    assert movie_cache.get("tt0000001") is None
+
+    # Revalidated even though the cached title page is still fresh, and not parsed again
+    assert cached_scraper.refresh_movie("tt0000001") == movie
+    assert cached_scraper.sent_headers[-1] == {"If-None-Match": etag}
+    assert (server.requests, server.not_modified) == (2, 1)
+    assert cached_scraper.cache.stats()["revalidations"] == 1
+    assert movie_cache.get("tt0000001") == movie
+
+    server.catalog["tt0000001"]["plot"] = "A rewritten plot."
+    assert cached_scraper.refresh_movie("tt0000001").plot == "A rewritten plot."
+    assert (server.requests, server.not_modified) == (3, 1)
+    assert movie_cache.get("tt0000001").plot == "A rewritten plot."
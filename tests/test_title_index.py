@@ -0,0 +1,111 @@
+"""Ingest of the IMDb TSV datasets and local-first lookups through the title index."""
+
+import gzip
+
+import pytest
+
+from benchmarks.stub_server import StubIMDbServer, make_catalog
+from imdb_scraper.history import SearchHistory
+from imdb_scraper.ratelimit import TokenBucket
+from imdb_scraper.scraper import IMDbScraper
+from imdb_scraper.title_index import TitleIndex
+
+DATASETS = {
+    "title.basics": [
+        ("tconst", "titleType", "primaryTitle", "originalTitle", "isAdult", "startYear",
+         "endYear", "runtimeMinutes", "genres"),
+        ("tt0000001", "movie", "Stub Movie 0001", "Stub Movie 0001", "0", "1951",
+         "\\N", "136", "Action,Sci-Fi"),
+        ("tt0000002", "movie", "Stub Movie 0002", "Stub Movie 0002", "0", "1952",
+         "\\N", "\\N", "\\N"),
+        ("tt0000003", "tvSeries", "Stub Show", "Stub Show", "0", "1990", "1995", "30", "Drama"),
+        ("tt0000009", "movie", "Stub Movie 0001", "Stub Movie 0001", "0", "1990",
+         "\\N", "95", "Drama"),
+    ],
+    "title.ratings": [
+        ("tconst", "averageRating", "numVotes"),
+        ("tt0000001", "8.7", "2000000"),
+        ("tt0000002", "n/a", "10"),  # Malformed, skipped
+        ("tt0000009", "5.1", "120"),
+    ],
+    "title.crew": [
+        ("tconst", "directors", "writers"),
+        ("tt0000001", "nm0000001,nm0000002", "\\N"),
+    ],
+    "name.basics": [
+        ("nconst", "primaryName", "birthYear"),
+        ("nm0000001", "Lana Stub", "1965"),
+    ],
+}
+
+
+@pytest.fixture
+def datasets(tmp_path):
+    directory = tmp_path / "datasets"
+    directory.mkdir()
+    for name, rows in DATASETS.items():
+        with gzip.open(directory / f"{name}.tsv.gz", "wt", encoding="utf-8") as f:
+            f.writelines("\t".join(row) + "\n" for row in rows)
+    return str(directory)
+
+
+@pytest.fixture
+def index(datasets, tmp_path):
+    index = TitleIndex(str(tmp_path / "title_index.sqlite3"))
+    index.ingest(datasets, chunk_size=2)
+    yield index
+    index.close()
+
+
+def test_ingest(datasets, tmp_path):
+    index = TitleIndex(str(tmp_path / "title_index.sqlite3"))
+    assert index.ingest(datasets, chunk_size=2) == {"title.basics": 4, "title.ratings": 3,
+                                                    "title.crew": 1, "name.basics": 1}
+    assert index.skipped == {"title.basics": 0, "title.ratings": 1, "title.crew": 0,
+                             "name.basics": 0}
+    assert len(index) == 3  # The TV series is not a movie
+
+    movie = index.get("tt0000001")
+    assert (movie.title, movie.year, movie.rating, movie.runtime, movie.genres, movie.director) == (
+        "Stub Movie 0001", 1951, 8.7, "2h 16m", ["Action", "Sci-Fi"], "Lana Stub")
+    assert movie.plot is None and movie.cast == []
+    assert index.get("tt0000002").rating is None
+    assert index.get("tt0000003") is None
+    index.close()
+
+
+def test_find(index):
+    assert index.find("stub movie 0001").imdb_id == "tt0000001"  # Most voted of the two
+    assert index.find("STUB MOVIE: 0001", year=1990).imdb_id == "tt0000009"
+    assert index.find("Stub Movie 0001", year=2000) is None
+    assert index.find("Stub Show") is None
+
+
+@pytest.fixture
+def server():
+    with StubIMDbServer(catalog=make_catalog(10), padding_blocks=10) as stub:
+        yield stub
+
+
+@pytest.fixture
+def scraper(index, server, tmp_path):
+    return IMDbScraper(use_cache=False, rate_limiter=TokenBucket(rate=1e9, burst=10 ** 9),
+                       history=SearchHistory(str(tmp_path / "history.json")),
+                       title_index=index, base_url=server.base_url)
+
+
+def test_local_first_lookup(scraper, server):
+    movie = scraper.search_and_get_movie("stub movie 0001")
+
+    # Dataset fields come from the index; only plot and cast are scraped, without a search
+    assert server.requests == 1
+    assert (movie.imdb_id, movie.rating, movie.director) == ("tt0000001", 8.7, "Lana Stub")
+    assert movie.plot == "The plot of stub movie number 1."
+    assert movie.cast[0] == "Actor 1"
+
+
+def test_local_fields_need_no_requests(scraper, server):
+    movie = scraper.get_movie_details("tt0000001", fields=["title", "rating", "genres"])
+
+    assert server.requests == 0
+    assert (movie.title, movie.rating, movie.genres) == ("Stub Movie 0001", 8.7, ["Action", "Sci-Fi"])
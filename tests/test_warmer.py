@@ -0,0 +1,80 @@
+"""Cache warming cycles against the local IMDb stub server, within a request budget."""
+
+import pytest
+
+from benchmarks.stub_server import StubIMDbServer, make_catalog
+from imdb_scraper.cache import MovieCache, ResponseCache
+from imdb_scraper.config import MAX_RETRIES
+from imdb_scraper.history import SearchHistory
+from imdb_scraper.ratelimit import TokenBucket
+from imdb_scraper.scraper import IMDbScraper
+from imdb_scraper.warmer import CacheWarmer
+
+
+class UnavailableStubServer(StubIMDbServer):
+    """Stub server answering 503 for the title pages of the IMDb IDs in failing."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.failing = set()
+
+    def respond(self, path):
+        if any(path.startswith(f"/title/{imdb_id}") for imdb_id in self.failing):
+            return 503, b"<html><body>Service Unavailable</body></html>"
+        return super().respond(path)
+
+
+@pytest.fixture
+def server():
+    with UnavailableStubServer(catalog=make_catalog(10), padding_blocks=10) as stub:
+        yield stub
+
+
+@pytest.fixture
+def scraper(server, tmp_path, monkeypatch):
+    monkeypatch.setattr("imdb_scraper.scraper.backoff_delay", lambda attempt: 0.0)
+    history = SearchHistory(str(tmp_path / "history.json"))
+    # Queries by popularity: stub movie 1 searched four times, 2 three times, 3 and 4 twice
+    for n, count in ((1, 4), (2, 3), (3, 2), (4, 2)):
+        for _ in range(count):
+            history.record_search(f"stub movie {n}", success=True, imdb_id=f"tt{n:07d}")
+    scraper = IMDbScraper(use_cache=False, rate_limiter=TokenBucket(rate=1e9, burst=10 ** 9),
+                          history=history, base_url=server.base_url)
+    scraper.cache = ResponseCache(str(tmp_path / "cache.sqlite3"))
+    scraper.movie_cache = MovieCache(str(tmp_path / "cache.sqlite3"))
+    yield scraper
+    scraper.cache.close()
+    scraper.movie_cache.close()
+    history.close()
+
+
+def test_retries_count_against_the_budget(scraper, server):
+    server.failing.add("tt0000001")
+    warmer = CacheWarmer(scraper, top_n=10, recent_n=0, budget=MAX_RETRIES + 1)
+
+    result = warmer.run_once()
+
+    # The failing refresh used every retry, leaving budget for one more refresh
+    assert result == {"candidates": 4, "refreshed": 1, "fresh": 0, "failed": 1,
+                      "deferred": 2, "requests": MAX_RETRIES + 1}
+    assert server.requests == MAX_RETRIES + 1
+    assert scraper.requests_sent() == MAX_RETRIES + 1
+
+    server.failing.clear()
+    result = warmer.run_once()
+
+    assert result == {"candidates": 4, "refreshed": 3, "fresh": 1, "failed": 0,
+                      "deferred": 0, "requests": 3}
+    assert server.requests == MAX_RETRIES + 4
+    assert warmer.stats()["cycles"] == 2
+
+
+def test_cached_movies_are_fresh(scraper, server):
+    for imdb_id in ("tt0000001", "tt0000002", "tt0000003", "tt0000004"):
+        scraper.get_movie_details(imdb_id)
+    requests_before = server.requests
+
+    result = CacheWarmer(scraper, top_n=10, recent_n=0).run_once()
+
+    assert (result["fresh"], result["requests"]) == (4, 0)
+    assert server.requests == requests_before